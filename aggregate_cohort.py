@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+"""
+Build the per-trial analysis dataset for a whole cohort.
+
+Reads every participant's JSON event log (streamed, never loaded whole) and
+responses CSV from logs/, one participant per worker process, and derives per
+trial:
+
+- stage durations from the stage transition events (`*_event_time_seconds`)
+- textarea interaction times
+- survey answers, submitted and edited questions
+- the suggested question metrics, flattened to `suggested_question_*`
+- the participant's pretest survey answers (`pretest_*`)
+
+Rows from the responses CSV take precedence over values reconstructed from the
+event log; practice trials (not in the CSV) come from the event log only.
+
+Per-participant results are cached by file mtime and size, so a re-run only
+processes new or changed sessions.
+
+Usage:
+    python aggregate_cohort.py [logs_dir] [-o cohort_trials.csv] [--workers 4]
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+EVENT_LOG_PATTERN = re.compile(r"^participant_(?P<participant_id>.+)_(?P<timestamp>\d{8}_\d{6})\.json$")
+EVENT_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+CACHE_VERSION = 1
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """Yield the elements of a top-level JSON array without loading the file"""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        started = False
+        eof = False
+
+        while True:
+            # Skip whitespace and separators
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if not started and position < len(buffer):
+                if buffer[position] != "[":
+                    raise ValueError(f"{path} does not contain a JSON array")
+                started = True
+                position += 1
+                continue
+            if started and position < len(buffer) and buffer[position] == "]":
+                return
+
+            if position < len(buffer):
+                try:
+                    element, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield element
+                    position = end
+                    continue
+
+            if eof:
+                if started:
+                    raise ValueError(f"{path} ended before the JSON array was closed")
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def _parse_time(value):
+    try:
+        return datetime.strptime(value, EVENT_TIMESTAMP_FORMAT).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _coerce(value):
+    """CSV cells and survey answers are strings; restore numbers and booleans"""
+    if not isinstance(value, str):
+        return value
+    if value in ("True", "False"):
+        return value == "True"
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _flatten_metrics(metrics):
+    """question_metrics keys -> the suggested_question_* CSV column names"""
+    flattened = {}
+    for key, value in (metrics or {}).items():
+        name = key[len("question_"):] if key.startswith("question_") else key
+        flattened[f"suggested_question_{name}"] = value
+    return flattened
+
+
+def _context(entry):
+    """Batched events carry no context field, but their data has practice_mode"""
+    data = entry.get("data") or {}
+    if "context" in entry:
+        return entry["context"]
+    return "practice" if data.get("practice_mode") else "main"
+
+
+def trials_from_events(event_log_path):
+    """Reconstruct per-trial rows and the pretest answers from an event log"""
+    trials = {}
+    pretest = {}
+    stage_entered = {}
+
+    def trial_for(entry):
+        key = (_context(entry), entry.get("iteration", 0))
+        if key not in trials:
+            trials[key] = {"context": key[0], "iteration": key[1]}
+        return trials[key]
+
+    def enter(entry, stage, timestamp):
+        stage_entered[(_context(entry), entry.get("iteration", 0), stage)] = timestamp
+
+    def leave(entry, stage, timestamp):
+        start = stage_entered.pop((_context(entry), entry.get("iteration", 0), stage), None)
+        if start is not None and timestamp is not None:
+            trial_for(entry)[f"{stage}_event_time_seconds"] = timestamp - start
+
+    for entry in iter_json_array(event_log_path):
+        event = entry.get("event", "")
+        data = entry.get("data") or {}
+        timestamp = _parse_time(entry.get("timestamp"))
+
+        if event == "Pretest survey completed":
+            pretest = {f"pretest_{key}": value for key, value in data.items()}
+        elif event in ("Iteration started", "Practice iteration started"):
+            enter(entry, "show_paragraph", timestamp)
+        elif event.startswith("Stage transition: "):
+            previous_stage, next_stage = event[len("Stage transition: "):].split(" -> ")
+            leave(entry, previous_stage, timestamp)
+            enter(entry, next_stage, timestamp)
+        elif event == "Question submitted":
+            trial = trial_for(entry)
+            trial["original_question"] = data.get("question")
+            trial["paragraph_index"] = data.get("paragraph_index")
+            trial["paragraph_genre"] = data.get("paragraph_genre")
+            trial["question_input_interaction_time_seconds"] = data.get("question_input_interaction_time")
+        elif event == "AI feedback generated":
+            trial = trial_for(entry)
+            if "question_metrics" in data:
+                trial.update(_flatten_metrics(data.get("question_metrics")))
+                trial["bloom_level"] = data.get("bloom_level")
+                trial["suggested_question"] = data.get("suggested_question")
+            if "feedback_type" in data:
+                trial["feedback_type"] = data["feedback_type"]
+        elif event == "Survey submitted":
+            trial = trial_for(entry)
+            for key in ("curiosity", "relatedness", "accept_feedback"):
+                trial[key] = _coerce(data.get(key))
+        elif event == "Textarea focus: edit_question":
+            trial_for(entry)["_edit_focus_time"] = data.get("focus_time")
+        elif event == "Edited question submitted":
+            trial = trial_for(entry)
+            trial["edited_question"] = data.get("edited_question")
+            leave(entry, "edit_question", timestamp)
+            focus_time = trial.pop("_edit_focus_time", None)
+            if focus_time is not None and timestamp is not None:
+                trial["edit_textarea_interaction_time_seconds"] = timestamp - focus_time
+
+    rows = []
+    for trial in trials.values():
+        trial.pop("_edit_focus_time", None)
+        # Only keep iterations that actually reached the question stage
+        if "original_question" in trial:
+            rows.append(trial)
+    return rows, pretest
+
+
+def _read_responses(responses_path):
+    if not responses_path or not os.path.exists(responses_path):
+        return []
+    with open(responses_path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def aggregate_session(participant_id, session_timestamp, event_log_path, responses_path):
+    """Merge one session's event log and responses CSV into trial rows"""
+    event_rows, pretest = trials_from_events(event_log_path)
+    merged = {(row["context"], int(row["iteration"])): row for row in event_rows}
+
+    for response in _read_responses(responses_path):
+        response.pop("paragraph", None)  # Paragraph text is identified by paragraph_index
+        key = ("main", int(response["iteration"]))
+        row = merged.setdefault(key, {"context": "main"})
+        row.update({k: _coerce(v) for k, v in response.items() if v != ""})
+        row["iteration"] = key[1]
+
+    rows = []
+    for key in sorted(merged):
+        row = {"participant_id": participant_id, "session": session_timestamp}
+        row.update(merged[key])
+        row.update(pretest)
+        rows.append(row)
+    return rows
+
+
+def aggregate_participant(task):
+    """Worker entry point: all sessions of one participant"""
+    participant_id, sessions = task
+    rows = []
+    for session_timestamp, event_log_path, responses_path in sessions:
+        rows.extend(aggregate_session(participant_id, session_timestamp, event_log_path, responses_path))
+    return participant_id, rows
+
+
+def discover_sessions(logs_dir):
+    """Group participant_*.json / responses_*.csv pairs by participant"""
+    participants = {}
+    for event_log_path in sorted(glob.glob(os.path.join(logs_dir, "participant_*.json"))):
+        match = EVENT_LOG_PATTERN.match(os.path.basename(event_log_path))
+        if not match:
+            continue
+        participant_id = match.group("participant_id")
+        session_timestamp = match.group("timestamp")
+        responses_path = os.path.join(logs_dir, f"responses_{participant_id}_{session_timestamp}.csv")
+        participants.setdefault(participant_id, []).append(
+            (session_timestamp, event_log_path, responses_path if os.path.exists(responses_path) else None)
+        )
+    return participants
+
+
+def _cache_key(sessions):
+    """File identity for the cache: path, mtime and size of every input file"""
+    key = [CACHE_VERSION]
+    for session in sessions:
+        for path in session[1:]:
+            if path:
+                stat = os.stat(path)
+                key.append((path, stat.st_mtime_ns, stat.st_size))
+    return key
+
+
+def _cache_path(cache_dir, participant_id):
+    digest = hashlib.sha1(participant_id.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pkl")
+
+
+def _load_cached(cache_dir, participant_id, key):
+    path = _cache_path(cache_dir, participant_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    return cached["rows"] if cached.get("key") == key else None
+
+
+def _store_cached(cache_dir, participant_id, key, rows):
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    with open(_cache_path(cache_dir, participant_id), "wb") as f:
+        pickle.dump({"key": key, "rows": rows}, f)
+
+
+def aggregate_cohort(logs_dir="logs", workers=None, cache_dir=None):
+    """Return the merged per-trial rows for every participant in logs_dir"""
+    participants = discover_sessions(logs_dir)
+
+    rows_by_participant = {}
+    pending = []
+    keys = {}
+    for participant_id, sessions in participants.items():
+        keys[participant_id] = _cache_key(sessions)
+        cached = _load_cached(cache_dir, participant_id, keys[participant_id]) if cache_dir else None
+        if cached is not None:
+            rows_by_participant[participant_id] = cached
+        else:
+            pending.append((participant_id, sessions))
+
+    print(f"{len(participants)} participant(s): {len(participants) - len(pending)} cached, {len(pending)} to process")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for participant_id, rows in executor.map(aggregate_participant, pending):
+                rows_by_participant[participant_id] = rows
+                if cache_dir:
+                    _store_cached(cache_dir, participant_id, keys[participant_id], rows)
+
+    all_rows = []
+    for participant_id in sorted(rows_by_participant):
+        all_rows.extend(rows_by_participant[participant_id])
+    return all_rows
+
+
+def write_rows(rows, output_path):
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    if output_path.endswith(".parquet"):
+        df.to_parquet(output_path, index=False)
+    else:
+        df.to_csv(output_path, index=False)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate all participants' logs into one per-trial table")
+    parser.add_argument('logs_dir', nargs='?', default="logs",
+                        help='Directory with participant_*.json and responses_*.csv (default: logs)')
+    parser.add_argument('-o', '--output', default="cohort_trials.csv",
+                        help='Output file, .csv or .parquet (default: cohort_trials.csv)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: number of CPUs)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='Per-participant result cache (default: <logs_dir>/.cohort_cache)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore and do not update the cache')
+    args = parser.parse_args(argv)
+
+    cache_dir = None if args.no_cache else (args.cache_dir or os.path.join(args.logs_dir, ".cohort_cache"))
+    rows = aggregate_cohort(args.logs_dir, workers=args.workers, cache_dir=cache_dir)
+    if not rows:
+        print("No trials found")
+        return 1
+
+    df = write_rows(rows, args.output)
+    print(f"✓ Wrote {len(df)} trial(s) x {len(df.columns)} column(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
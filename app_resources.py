@@ -0,0 +1,185 @@
+"""
+Process-wide resources of app17.py, created once per server process.
+
+Marker sinks, the session database, the LLM cassette, the chat models, their
+pooled connection and the feedback backend are shared by all browser sessions (st.cache_resource).
+Living in an imported module, these definitions are not re-executed on every
+Streamlit rerun of the app script.
+
+The feedback chains (LangChain and the OpenAI client, about a second of
+imports) are not imported with this module: they load in a background
+thread when the feedback backend is first requested, so the first page does
+not wait for them and they are ready long before the first question.
+"""
+
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from bloom_study.config import (
+    FEEDBACK_BACKEND, KEEPALIVE_HOLD_SECONDS, KEEPALIVE_PING_SECONDS, LLM_CASSETTE, LLM_CASSETTE_MODE,
+    LLM_CASSETTE_TIMING, MARKER_RING_PATH, MOCK_FEEDBACK_LATENCY, OPENAI_BASE_URL, SESSION_DB_PATH,
+    USE_PARALLEL_PORT
+)
+from bloom_study.assignment import get_experiment_paragraphs, get_practice_paragraphs
+from bloom_study.engine import MARKERS
+from bloom_study.feedback import StaticFeedbackBackend
+from llm_cassette import Cassette, wrap_chat_model
+from marker_sinks import ConsoleSink, MarkerDispatcher, MmapRingSink, ParallelPortSink, open_parallel_port
+from session_store import SessionStore
+
+@st.cache_resource
+def get_marker_dispatcher():
+    """Build the marker sinks once per server process"""
+    dispatcher = MarkerDispatcher()
+    if MARKER_RING_PATH:
+        try:
+            dispatcher.add_sink(MmapRingSink(MARKER_RING_PATH))
+            print(f"Marker ring opened at {MARKER_RING_PATH}")
+        except Exception as e:
+            print(f"Marker ring initialization failed: {e}")
+    port = open_parallel_port() if USE_PARALLEL_PORT else None
+    if port is not None:
+        dispatcher.add_sink(ParallelPortSink(port))
+    elif USE_PARALLEL_PORT:
+        # If we tried to use parallel port but it failed
+        dispatcher.add_sink(ConsoleSink(MARKERS, "Cannot send marker '{name}': Parallel port not available"))
+    else:
+        # If parallel port is intentionally disabled for testing
+        print("Parallel port disabled for testing")
+        dispatcher.add_sink(ConsoleSink(MARKERS))
+    return dispatcher
+
+@st.cache_resource
+def get_session_store():
+    """Open the session database once per server process"""
+    if not SESSION_DB_PATH:
+        return None
+    try:
+        return SessionStore(SESSION_DB_PATH, marker_codes=MARKERS)
+    except Exception as e:
+        print(f"Session store initialization failed: {e}")
+        return None
+
+@st.cache_resource
+def get_llm_cassette():
+    """Open the LLM cassette once per process (None when LLM_CASSETTE_MODE is off)"""
+    if LLM_CASSETTE_MODE == "off":
+        return None
+    path = LLM_CASSETTE
+    if not path:
+        if LLM_CASSETTE_MODE == "replay":
+            raise ValueError("LLM_CASSETTE_MODE=replay needs LLM_CASSETTE=<cassette.jsonl>")
+        path = os.path.join("cassettes", f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl")
+    cassette = Cassette(path, LLM_CASSETTE_MODE, timing=LLM_CASSETTE_TIMING)
+    print(f"LLM cassette: {LLM_CASSETTE_MODE} {path}")
+    # Report served/unmatched/unused requests when the server stops
+    atexit.register(lambda: print(f"LLM cassette {path}: {cassette.report()}"))
+    return cassette
+
+# Function to get the API key for the chat models
+def get_api_key():
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key and OPENAI_BASE_URL:
+        # A local mock server does not check the key
+        api_key = "mock"
+    return api_key
+
+@st.cache_resource
+def get_connection_warmer():
+    """The connection pool of the chat models, kept warm during trials (None without API calls)"""
+    api_key = get_api_key()
+    if FEEDBACK_BACKEND == "mock" or not api_key or LLM_CASSETTE_MODE == "replay":
+        return None
+    from bloom_study.connections import ConnectionWarmer
+    return ConnectionWarmer(OPENAI_BASE_URL, api_key, ping_interval=KEEPALIVE_PING_SECONDS,
+                            hold_limit=KEEPALIVE_HOLD_SECONDS)
+
+@st.cache_resource(show_spinner=False)
+def initialize_llm_models():
+    """Cache LLM model initialization to avoid repeated API setup"""
+    api_key = get_api_key()
+    cassette = get_llm_cassette()
+    if not api_key and not (cassette and cassette.mode == "replay"):
+        return None, None
+
+    classification_llm = generation_llm = None
+    if api_key:
+        from bloom_study.chains import create_llm_models
+        warmer = get_connection_warmer()
+        classification_llm, generation_llm = create_llm_models(
+            api_key, OPENAI_BASE_URL, http_client=warmer.client if warmer else None
+        )
+    if cassette:
+        # Replay without an API key serves recordings only (misses use the fallbacks)
+        classification_llm = wrap_chat_model(classification_llm, cassette, "bloom_classification", temperature=0.1)
+        generation_llm = wrap_chat_model(generation_llm, cassette, "question_generation", temperature=0.7)
+    return classification_llm, generation_llm
+
+@st.cache_resource(show_spinner=False)
+def get_langchain_backend():
+    """Import and build the chains once (first use or background preload); every request reuses them"""
+    from bloom_study.chains import LangChainFeedbackBackend
+    return LangChainFeedbackBackend(*initialize_llm_models())
+
+# Feedback backend used by the engine: LangChain chains on OpenAI models
+def langchain_feedback_backend(question, paragraph_content, feedback_type):
+    return get_langchain_backend()(question, paragraph_content, feedback_type)
+
+@st.cache_resource
+def get_feedback_backend():
+    """Select the feedback backend once per server process"""
+    if FEEDBACK_BACKEND == "mock":
+        print(f"Using mock feedback backend ({MOCK_FEEDBACK_LATENCY}s latency)")
+        return StaticFeedbackBackend(latency=MOCK_FEEDBACK_LATENCY)
+    # Preload while the participant works through the pretest
+    threading.Thread(target=get_langchain_backend, name="preload-feedback-chains", daemon=True).start()
+    return langchain_feedback_backend
+
+def warm_up(probe=False):
+    """Build every process-wide resource before the first participant (run_experiment.py --warm)
+
+    With probe=True each chat model also answers a one-token request, which
+    opens the API connection (DNS, TLS) the first feedback request reuses.
+    Returns the seconds spent per step (None for a step that failed).
+    """
+    from bloom_study.metrics import get_common_words
+
+    steps = [
+        ("marker sinks", get_marker_dispatcher),
+        ("session store", get_session_store),
+        ("feedback backend", get_feedback_backend),
+        ("stimulus index and metrics", lambda: (get_experiment_paragraphs(), get_practice_paragraphs(), get_common_words())),
+    ]
+    if FEEDBACK_BACKEND != "mock":
+        steps.append(("chains and models", get_langchain_backend))
+        if probe:
+            steps.append(("probe completion", probe_models))
+
+    timings = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            timings[name] = None
+            print(f"Warm-up: {name} failed: {e}")
+            continue
+        timings[name] = time.perf_counter() - start
+        print(f"Warm-up: {name} ready in {timings[name] * 1000:.0f}ms")
+    return timings
+
+# Function to send a one-token request through each chat model
+def probe_models():
+    if get_llm_cassette():
+        # A probe would be recorded into (or missing from) the cassette
+        print("Warm-up: probe skipped while an LLM cassette is active")
+        return
+    backend = get_langchain_backend()
+    for llm in (backend.classification_llm, backend.generation_llm):
+        if llm is not None:
+            llm.bind(max_tokens=1).invoke("ping")
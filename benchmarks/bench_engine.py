@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark for the headless experiment engine.
+
+Drives complete simulated sessions (pretest, baseline, 2 practice trials and
+the full main experiment) through ExperimentEngine on a VirtualClock, with
+the static feedback backend and no marker sink, and reports trials per second
+and the time per engine call. Each action is preceded by --think seconds of
+simulated time, so a session covers its real length (the 30 s baseline,
+feedback latency and think times) in milliseconds, and the recorded stage
+durations are checked against the simulated ones.
+
+Usage: python benchmarks/bench_engine.py [--sessions 200] [--think 5] [--save-logs DIR]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bloom_study.clock import VirtualClock
+from bloom_study.engine import ExperimentEngine, PRACTICE_ITERATIONS
+from bloom_study.feedback import StaticFeedbackBackend
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def run_trial(engine, call_times, think):
+    """One trial from paragraph to final submission; records each call's duration"""
+    for call, args in ((engine.paragraph_viewed, ()),
+                       (engine.record_textarea_focus, ("question_input",)),
+                       (engine.submit_question, (f"질문 {engine.state.iteration}은 무엇인가?",)),
+                       (engine.feedback_viewed, ()),
+                       (engine.submit_survey, ("3", "4", "예")),
+                       (engine.submit_edited_question, (f"수정된 질문 {engine.state.iteration}은 무엇인가?",))):
+        engine.clock.advance(think)
+        start = time.perf_counter_ns()
+        call(*args)
+        call_times.append(time.perf_counter_ns() - start)
+
+
+def run_session(number, call_times, think=0.0, logs_dir=None):
+    clock = VirtualClock()
+    engine = ExperimentEngine(clock=clock, feedback_backend=StaticFeedbackBackend(latency=1.0, clock=clock))
+    session_start = clock.time()
+    engine.start_experiment(f"bench{number}")
+    engine.complete_pretest({"age": "25"})
+    engine.prepare_baseline()
+    engine.start_baseline()
+    engine.run_baseline_screen()
+    engine.show_bloom_explanation()
+    engine.finish_bloom_explanation()
+
+    engine.start_practice()
+    while engine.state.stage == "show_paragraph":
+        run_trial(engine, call_times, think)
+
+    engine.start_main_experiment()
+    while engine.state.stage == "show_paragraph":
+        run_trial(engine, call_times, think)
+
+    assert engine.state.stage == "completed", engine.state.stage
+    check_durations(engine.response_rows(practice=True) + engine.response_rows(), think)
+    if logs_dir:
+        engine.save_logs(logs_dir)
+    return (len(engine.state.practice_responses) + len(engine.state.responses), len(engine.state.event_log),
+            clock.time() - session_start)
+
+
+def check_durations(trials, think):
+    """On the virtual clock every recorded duration is exactly the simulated one"""
+    expected = {
+        # Trial start -> think -> paragraph_viewed
+        "show_paragraph_time_seconds": think,
+        # Focus after think -> submit after think -> 1 s feedback latency
+        "ask_question_time_seconds": 2 * think + 1.0,
+        "show_feedback_time_seconds": think,
+        "survey_time_seconds": think,
+        "edit_question_time_seconds": think
+    }
+    for trial in trials[PRACTICE_ITERATIONS:]:
+        for column, seconds in expected.items():
+            assert abs(trial[column] - seconds) < 1e-6, (column, trial[column], seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the headless experiment engine")
+    parser.add_argument('--sessions', type=int, default=200, help='Simulated sessions (default: 200)')
+    parser.add_argument('--think', type=float, default=5.0,
+                        help='Simulated seconds before each participant action (default: 5)')
+    parser.add_argument('--save-logs', default=None, help='Also write each session\'s logs to this directory')
+    args = parser.parse_args(argv)
+
+    call_times = []
+    trials = 0
+    events = 0
+    simulated = 0.0
+    start = time.perf_counter()
+    for number in range(args.sessions):
+        session_trials, session_events, session_seconds = run_session(number, call_times, args.think, args.save_logs)
+        trials += session_trials
+        events += session_events
+        simulated += session_seconds
+    elapsed = time.perf_counter() - start
+
+    call_us = [t / 1000.0 for t in call_times]
+    print(f"{args.sessions} sessions, {trials} trials, {events} events in {elapsed:.2f}s")
+    print(f"simulated: {simulated / args.sessions / 60:.1f} min per session, "
+          f"{simulated / elapsed:.0f}x faster than real time (recorded durations verified)")
+    print(f"throughput: {trials / elapsed:.0f} trials/s, {args.sessions / elapsed:.1f} sessions/s")
+    print(f"engine call: n={len(call_us)} mean={statistics.fmean(call_us):.1f}us "
+          f"p50={percentile(call_us, 50):.1f}us p95={percentile(call_us, 95):.1f}us "
+          f"p99={percentile(call_us, 99):.1f}us max={max(call_us):.1f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Cold import time of the app and the launcher, with a budget.
+
+Each target runs in a fresh interpreter with -X importtime: importing
+app17.py as a new Streamlit server does on its first session, and the
+launcher's startup (run_experiment.py up to its dependency check). The
+-X importtime report on stderr is parsed:
+
+    import time: self [us] | cumulative | imported package
+    import time:       412 |       1837 |   streamlit.runtime.caching
+
+- import: total time of the imports the target made, i.e. everything after
+  interpreter startup (best of --repeat)
+- wall: the whole process, including interpreter startup
+- heaviest packages: self time summed per top-level package
+
+Exits with status 1 if a target's import time exceeds its budget, so it can
+run as a check before a study session or in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget app=900 --budget launcher=100 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Target name -> (module, statement run from the repository root)
+TARGETS = {
+    "app": ("app17", "import app17"),
+    "launcher": ("run_experiment", "import run_experiment; run_experiment.check_dependencies()"),
+}
+
+# Cold import budget per target in milliseconds (measured: app ~350-450ms, launcher ~20ms;
+# eager LangChain/OpenAI/pandas imports put them at ~2100ms and ~1300ms)
+DEFAULT_BUDGETS_MS = {
+    "app": 800,
+    "launcher": 60,
+}
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr):
+    """-X importtime lines -> list of (self_us, cumulative_us, depth, module)"""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, module))
+    return entries
+
+
+def run_importtime(statement):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), wall
+
+
+def measure(statement, startup_count):
+    """One cold run in a fresh interpreter: (import ms, wall ms, entries after startup)"""
+    entries, wall = run_importtime(statement)
+    # The first entries are the interpreter's own startup imports (site, encodings, ...)
+    entries = entries[startup_count:]
+    return sum(cumulative for _, cumulative, depth, _ in entries if depth == 0) / 1000, wall, entries
+
+
+def heaviest_packages(entries, module, top):
+    """Self time per top-level package among everything the target pulled in"""
+    totals = {}
+    for self_us, _, _, name in entries:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    totals.pop(module, None)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def parse_budget(spec):
+    name, _, value = spec.partition("=")
+    if name not in TARGETS or not value:
+        raise argparse.ArgumentTypeError(f"expected <target>=<ms> with target in {', '.join(TARGETS)}")
+    return name, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import time of the app and launcher against a budget")
+    parser.add_argument('--target', choices=list(TARGETS), action='append',
+                        help='Target to measure (repeatable, default: all)')
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[],
+                        help='Override a budget, e.g. app=900 (milliseconds)')
+    parser.add_argument('--repeat', type=int, default=3, help='Cold imports per target; the best counts (default: 3)')
+    parser.add_argument('--top', type=int, default=10, help='Heaviest packages to list (default: 10)')
+    args = parser.parse_args(argv)
+
+    budgets = dict(DEFAULT_BUDGETS_MS, **dict(args.budget))
+    startup_count = len(run_importtime("pass")[0])
+    over_budget = []
+    for name in args.target or list(TARGETS):
+        module, statement = TARGETS[name]
+        runs = [measure(statement, startup_count) for _ in range(args.repeat)]
+        import_ms, wall_ms, entries = min(runs, key=lambda run: run[0])
+        budget = budgets[name]
+        status = "ok" if import_ms <= budget else "OVER BUDGET"
+        print(f"{name} ({statement}): {import_ms:.0f}ms import, {wall_ms:.0f}ms wall, "
+              f"{len(entries)} modules, budget {budget:.0f}ms: {status}")
+        for package, self_us in heaviest_packages(entries, module, args.top):
+            print(f"  {package:<28}{self_us / 1000:8.1f}ms")
+        if import_ms > budget:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"Import time over budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Throughput and latency benchmark for the marker sinks.
+
+- send latency: time spent inside MarkerDispatcher.dispatch() per marker
+- throughput: markers per second written to the ring in a tight loop
+- delivery latency: perf_counter_ns at write vs. when a RingReader in a
+  separate process sees the record (same host, monotonic clock)
+
+Usage: python benchmarks/bench_marker_sinks.py [--count 100000] [--ring markers_bench.ring]
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marker_sinks import MarkerDispatcher, MmapRingSink, RingReader
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def report(title, values_ns):
+    values_us = [v / 1000.0 for v in values_ns]
+    print(f"{title}: n={len(values_us)} mean={statistics.fmean(values_us):.2f}us "
+          f"p50={percentile(values_us, 50):.2f}us p95={percentile(values_us, 95):.2f}us "
+          f"p99={percentile(values_us, 99):.2f}us max={max(values_us):.2f}us")
+
+
+def bench_throughput(path, count):
+    dispatcher = MarkerDispatcher([MmapRingSink(path, capacity=max(count, 4096))])
+    start = time.perf_counter()
+    for i in range(count):
+        dispatcher.dispatch(1 + i % 13, i, "show_paragraph")
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+    print(f"Throughput: {count / elapsed:,.0f} markers/s ({elapsed * 1e9 / count:.0f} ns per marker)")
+
+
+def bench_send_latency(path, count):
+    dispatcher = MarkerDispatcher([MmapRingSink(path)])
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter_ns()
+        dispatcher.dispatch(7, i, "ask_question")
+        latencies.append(time.perf_counter_ns() - start)
+    dispatcher.close()
+    report("Send latency", latencies)
+
+
+def _reader_process(path, count, ready, results):
+    reader = RingReader(path)
+    ready.set()
+    latencies = []
+    for record in reader.tail(poll_interval=0):
+        latencies.append(time.perf_counter_ns() - record.perf_counter_ns)
+        if len(latencies) >= count:
+            break
+    results.put((latencies, reader.lost))
+    reader.close()
+
+
+def bench_delivery_latency(path, count, interval):
+    sink = MmapRingSink(path)
+    dispatcher = MarkerDispatcher([sink])
+
+    ready = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    reader = multiprocessing.Process(target=_reader_process, args=(path, count, ready, results))
+    reader.start()
+    ready.wait()
+
+    for i in range(count):
+        dispatcher.dispatch(9, i, "survey")
+        time.sleep(interval)
+
+    latencies, lost = results.get(timeout=60)
+    reader.join()
+    dispatcher.close()
+    report("Writer-to-reader latency", latencies)
+    print(f"Records lost by reader: {lost}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mmap marker ring sink")
+    parser.add_argument('--count', type=int, default=100000,
+                        help='Markers to write in the throughput test (default: 100000)')
+    parser.add_argument('--latency-count', type=int, default=2000,
+                        help='Markers for the latency tests (default: 2000)')
+    parser.add_argument('--interval', type=float, default=0.001,
+                        help='Seconds between markers in the delivery test (default: 0.001)')
+    parser.add_argument('--ring', default=None,
+                        help='Ring file to use (default: a temporary file)')
+    args = parser.parse_args()
+
+    path = args.ring or os.path.join(tempfile.mkdtemp(), "markers_bench.ring")
+    print(f"Ring file: {path}")
+
+    bench_throughput(path, args.count)
+    bench_send_latency(path, args.latency_count)
+    bench_delivery_latency(path, args.latency_count, args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
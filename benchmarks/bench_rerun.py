@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Per-rerun script time of the Streamlit app.
+
+Streamlit executes the whole app script on every interaction. This drives
+one AppTest session of the app (offline: mock feedback, scratch log
+directory) and times repeated reruns of the start screen and of a trial's
+question screen:
+
+- script: the app's own run_stats time of the rerun, from the end of its
+  imports (SCRIPT_START) through main(), so module-level setup is included
+- AppTest.run: wall time of the whole rerun as seen by AppTest, which adds
+  its own (much larger) element tree and session overhead
+
+Compare two versions of the app with --app.
+
+Usage: python benchmarks/bench_rerun.py [--reruns 50] [--app app17.py]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def script_seconds(at):
+    if "run_stats" not in at.session_state:
+        return 0.0
+    return sum(entry["seconds"] for entry in at.session_state["run_stats"].values())
+
+
+def click(at, label):
+    for button in at.button:
+        if button.label == label:
+            button.click().run()
+            return
+    raise RuntimeError(f"button '{label}' not shown")
+
+
+def time_reruns(at, reruns):
+    script, wall = [], []
+    for _ in range(reruns):
+        before = script_seconds(at)
+        start = time.perf_counter()
+        at.run()
+        wall.append(time.perf_counter() - start)
+        script.append(script_seconds(at) - before)
+    return script, wall
+
+
+def report(title, script, wall):
+    print(f"{title} (n={len(script)})")
+    for name, values in (("script", script), ("AppTest.run", wall)):
+        values_ms = [v * 1000 for v in values]
+        print(f"  {name:<14} mean={statistics.fmean(values_ms):7.2f}ms p50={percentile(values_ms, 50):7.2f}ms "
+              f"p95={percentile(values_ms, 95):7.2f}ms")
+
+
+def run(app_path, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    print(f"first run: {(time.perf_counter() - start) * 1000:.1f}ms")
+    report("start screen", *time_reruns(at, reruns))
+
+    # Through to the first practice trial's question screen
+    engine = at.session_state.engine
+    at.text_input[0].input("bench_rerun")
+    click(at, "실험 시작")
+    engine.complete_pretest({})
+    at.run()
+    click(at, "베이스라인 측정으로 이동")
+    click(at, "베이스라인 시작")
+    while engine.state.stage == "baseline_screen":
+        time.sleep(0.05)
+        at.run()
+    for label in ("다음 단계로 이동", "연습 세션 시작", "연습 시작", "읽기 완료"):
+        click(at, label)
+    report(f"{engine.state.stage} screen", *time_reruns(at, reruns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time reruns of the Streamlit app script")
+    parser.add_argument('--reruns', type=int, default=50, help='Reruns per screen (default: 50)')
+    parser.add_argument('--app', default=os.path.join(ROOT, "app17.py"), help='App script (default: app17.py)')
+    args = parser.parse_args(argv)
+
+    app_path = os.path.abspath(args.app)
+    os.environ["FEEDBACK_BACKEND"] = "mock"
+    os.environ["BASELINE_SECONDS"] = "0.1"
+    workdir = tempfile.mkdtemp(prefix="bench_rerun_")
+    os.environ["SESSION_DB_PATH"] = os.path.join(workdir, "sessions.db")
+    os.chdir(workdir)
+    run(app_path, args.reruns)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
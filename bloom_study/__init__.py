@@ -0,0 +1,18 @@
+"""
+Core of the question feedback experiment, independent of the Streamlit UI.
+
+- stimuli: the stimulus set from stimuli.json (precomputed, hot-reloaded)
+- assignment: paragraph sets and balanced condition assignment
+- metrics: suggested question metrics
+- feedback: feedback text, API error handling and feedback backends
+- clock: the real clock and a fast-forwardable virtual clock for simulations
+- config: environment configuration, read once per process
+- prompts: output schemas, few-shot examples and prompt templates
+- chains: the LangChain feedback chains and their feedback backend
+- connections: the pooled LLM connection, kept warm during trials
+- engine: the stage machine (ExperimentEngine) and its SessionState
+"""
+
+from bloom_study.engine import ExperimentEngine, SessionState, SubmissionError
+
+__all__ = ["ExperimentEngine", "SessionState", "SubmissionError"]
@@ -0,0 +1,225 @@
+"""
+Stimulus selection and counterbalanced condition assignment.
+
+Paragraphs come from the current stimulus set (bloom_study.stimuli).
+
+Each participant gets one row of a counterbalancing schedule: a paragraph
+order from a balanced Latin square, a related/unrelated split within each
+genre (complemented between the two participants of a pair) and the
+practice conditions. make_schedule.py precomputes the rows for a study
+into SCHEDULE_FILE; the session then looks its row up. Participants not
+listed in the file are given the least used row through the session store.
+All randomness comes from generators seeded by sha256 digests
+(session_rng), never from the global random module or the per-process
+salted hash(), so a row's contents are the same in every process.
+"""
+
+import hashlib
+import json
+import os
+import random
+from functools import lru_cache
+
+from bloom_study.stimuli import get_stimulus_set
+
+# Paragraph roles (experiment, practice, excluded) and genres are set per paragraph in stimuli.json
+
+# Counterbalancing schedule written by make_schedule.py (default: schedule.json in the repository root)
+SCHEDULE_FILE = os.getenv("SCHEDULE_FILE") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schedule.json"
+)
+
+# Seed of the condition splits of computed schedule rows (make_schedule.py --seed for files)
+SCHEDULE_SEED = int(os.getenv("SCHEDULE_SEED", "0"))
+
+PRACTICE_COUNT = 2
+
+FLIPPED = {"related": "unrelated", "unrelated": "related"}
+
+def get_experiment_paragraph_indices():
+    """Get indices for the main experiment, excluding specified indices"""
+    return list(get_stimulus_set().experiment_indices)
+
+@lru_cache(maxsize=8)
+def _paragraph_dicts(stimulus_set, role):
+    """Paragraph dicts of one role in one version of the stimulus set"""
+    return tuple(s.as_dict() for s in stimulus_set.stimuli if s.role == role)
+
+def get_experiment_paragraphs(stimulus_set=None):
+    """Get paragraphs for the main experiment (of the current stimulus set by default)
+
+    A new list (the engine shuffles it) of paragraph dicts shared by all
+    sessions; the dicts are read-only by convention.
+    """
+    return list(_paragraph_dicts(stimulus_set or get_stimulus_set(), "experiment"))
+
+def get_practice_paragraphs(stimulus_set=None):
+    """Get paragraphs for practice session, in file order"""
+    return list(_paragraph_dicts(stimulus_set or get_stimulus_set(), "practice"))
+
+def get_genre_for_index(index):
+    """Return the genre for a given paragraph index"""
+    stimuli = get_stimulus_set().stimuli
+    return stimuli[index].genre if 0 <= index < len(stimuli) else "unknown"
+
+def stable_seed(*parts):
+    """Seed from a sha256 digest of the parts: the same in every process and on every machine"""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def session_rng(*parts):
+    """An isolated random generator for one session or schedule row (never the global one)"""
+    return random.Random(stable_seed(*parts))
+
+def balanced_condition_split(experiment_paragraphs, rng):
+    """
+    Create balanced condition assignment ensuring:
+    1. Equal distribution within each genre
+    2. Equal total distribution across conditions
+    3. Randomized assignment (drawn from rng)
+    """
+    # Group paragraphs by genre
+    genre_paragraphs = {}
+    for para in experiment_paragraphs:
+        genre = para['genre']
+        if genre not in genre_paragraphs:
+            genre_paragraphs[genre] = []
+        genre_paragraphs[genre].append(para)
+    
+    condition_mapping = {}
+    
+    # For each genre, assign conditions with balanced distribution
+    for genre, paragraphs in genre_paragraphs.items():
+        indices = [p['index'] for p in paragraphs]
+        
+        # Create balanced assignment within genre
+        # If odd number, the extra one goes to a random condition
+        half = len(indices) // 2
+        
+        # Shuffle indices for this genre
+        rng.shuffle(indices)
+        
+        # Assign first half to 'related', second half to 'unrelated'
+        for i, idx in enumerate(indices):
+            if i < half:
+                condition_mapping[idx] = "related"
+            elif i < 2 * half:
+                condition_mapping[idx] = "unrelated"
+            else:
+                # Handle odd numbers by randomly assigning the extra
+                condition_mapping[idx] = rng.choice(["related", "unrelated"])
+    
+    return condition_mapping
+
+def williams_order(n, row):
+    """Row of a balanced Latin square (Williams design) over n items
+
+    Across n rows (2n for odd n) every item appears once at every position
+    and directly follows every other item equally often.
+    """
+    first = [0] + [(j + 1) // 2 if j % 2 else n - j // 2 for j in range(1, n)]
+    order = [(item + row) % n for item in first]
+    if n % 2 and (row // n) % 2:
+        order.reverse()
+    return order
+
+def schedule_row(row, experiment_paragraphs, practice_count=PRACTICE_COUNT, seed=0):
+    """Paragraph order and conditions of one schedule row
+
+    Rows 2m and 2m+1 share one balanced condition split drawn for pair m and
+    see it the other way round, so every pair of participants sees each
+    paragraph under both conditions. Practice conditions alternate by row.
+    """
+    conditions = balanced_condition_split(experiment_paragraphs, session_rng("conditions", seed, row // 2))
+    if row % 2:
+        conditions = {idx: FLIPPED[condition] for idx, condition in conditions.items()}
+    order = williams_order(len(experiment_paragraphs), row)
+    return {
+        "row": row,
+        "order": [experiment_paragraphs[i]['index'] for i in order],
+        "conditions": conditions,
+        "practice_conditions": {i: ("related", "unrelated")[(i + row) % 2] for i in range(practice_count)},
+    }
+
+def build_schedule(rows, stimulus_set=None, participant_ids=(), seed=0):
+    """The whole schedule table (make_schedule.py writes it to SCHEDULE_FILE)"""
+    stimulus_set = stimulus_set or get_stimulus_set()
+    paragraphs = get_experiment_paragraphs(stimulus_set)
+    practice_count = len(stimulus_set.practice_indices)
+    return {
+        "stimulus_version": stimulus_set.content_hash,
+        "seed": seed,
+        "participants": {participant_id: i % rows for i, participant_id in enumerate(participant_ids)},
+        "rows": [schedule_row(row, paragraphs, practice_count, seed) for row in range(rows)],
+    }
+
+@lru_cache(maxsize=2)
+def _read_schedule(path, mtime_ns):
+    with open(path, encoding="utf-8") as f:
+        schedule = json.load(f)
+    # JSON object keys are strings; the engine looks conditions up by int index/iteration
+    for row in schedule["rows"]:
+        row["conditions"] = {int(k): v for k, v in row["conditions"].items()}
+        row["practice_conditions"] = {int(k): v for k, v in row["practice_conditions"].items()}
+    return schedule
+
+def load_schedule(path=None):
+    """The schedule file (re-read only when it changes), or None if there is none"""
+    path = path or SCHEDULE_FILE
+    try:
+        return _read_schedule(path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+def get_schedule_row(participant_id, stimulus_set=None, session_store=None):
+    """Paragraph order, conditions and practice conditions of a participant
+
+    From the schedule file when there is one for the current stimuli,
+    otherwise from rows computed the same way. Participants listed in the
+    file get their row ("listed"). Any other ID gets the least used row,
+    recorded in the session store so it keeps that row ("assigned"); only
+    without a store does its stable digest pick the row ("hashed"), which
+    is not balanced. "schedule" identifies the file or computed rows the
+    row belongs to.
+    """
+    stimulus_set = stimulus_set or get_stimulus_set()
+    schedule = load_schedule()
+    if schedule is not None and schedule["stimulus_version"] == stimulus_set.content_hash:
+        rows = len(schedule["rows"])
+        key = f"{schedule['stimulus_version']}:{schedule['seed']}:{rows}:file"
+        row = schedule["participants"].get(participant_id)
+        if row is not None:
+            return dict(schedule["rows"][row], source="listed", schedule=key)
+        row, source = _unlisted_row(participant_id, key, rows, schedule["participants"].values(), session_store)
+        return dict(schedule["rows"][row], source=source, schedule=key)
+
+    if schedule is not None:
+        _warn_stale_schedule(schedule["stimulus_version"], stimulus_set.content_hash)
+    paragraphs = get_experiment_paragraphs(stimulus_set)
+    # One full Williams cycle of rows (two for an odd count)
+    rows = max(len(paragraphs) * (1 if len(paragraphs) % 2 == 0 else 2), 2)
+    key = f"{stimulus_set.content_hash}:{SCHEDULE_SEED}:{rows}:computed"
+    row, source = _unlisted_row(participant_id, key, rows, (), session_store)
+    return dict(schedule_row(row, paragraphs, len(stimulus_set.practice_indices), SCHEDULE_SEED),
+                source=source, schedule=key)
+
+def _unlisted_row(participant_id, schedule_key, rows, reserved, session_store):
+    """(row, source) of a participant the schedule file does not list"""
+    if session_store is not None:
+        try:
+            return session_store.assign_schedule_row(schedule_key, participant_id, rows, reserved), "assigned"
+        except Exception as e:
+            print(f"Could not assign a schedule row in the session store: {e}")
+    return stable_seed("row", participant_id) % rows, "hashed"
+
+@lru_cache(maxsize=8)
+def _warn_stale_schedule(schedule_version, stimulus_version):
+    print(f"Schedule {SCHEDULE_FILE} was made for stimuli {schedule_version}, not {stimulus_version}; "
+          f"computing rows instead")
+
+def create_practice_condition_assignment(participant_id, session_store=None):
+    """
+    Create balanced condition assignment for practice session.
+    Ensures one related and one unrelated feedback.
+    """
+    return dict(get_schedule_row(participant_id, session_store=session_store)["practice_conditions"])
@@ -0,0 +1,175 @@
+"""
+LangChain feedback chains: Bloom's taxonomy classification and question suggestion.
+
+LangChainFeedbackBackend is the production feedback backend (see
+bloom_study.feedback): it classifies the participant's question and
+suggests a related or unrelated 'creation' level question, falling back to
+fixed questions when the model output cannot be used. The prompts come from
+bloom_study.prompts.
+
+Importing this module loads LangChain and the OpenAI client; the app does
+so on first use rather than at startup (see app_resources.py).
+"""
+
+from langchain.chains import LLMChain
+from langchain_openai import ChatOpenAI
+
+from bloom_study.assignment import session_rng
+from bloom_study.feedback import FeedbackUnavailable
+from bloom_study.prompts import bloom_classification_prompt, related_question_prompt, unrelated_question_prompt
+
+def create_llm_models(api_key, base_url=None, http_client=None):
+    """The classification (temperature 0.1) and generation (temperature 0.7) chat models
+
+    Pass an httpx.Client (bloom_study.connections) to share one connection pool.
+    """
+    classification_llm = ChatOpenAI(
+        model="gpt-4-0613",
+        temperature=0.1,
+        openai_api_key=api_key,
+        openai_api_base=base_url or None,
+        http_client=http_client,
+        max_retries=2
+    )
+    generation_llm = ChatOpenAI(
+        model="gpt-4-0613",
+        temperature=0.7,
+        openai_api_key=api_key,
+        openai_api_base=base_url or None,
+        http_client=http_client,
+        max_retries=2
+    )
+    return classification_llm, generation_llm
+
+def create_bloom_classification_chain(llm):
+    """Create a chain for classifying questions according to Bloom's taxonomy with structured output."""
+    prompt, parser = bloom_classification_prompt()
+    return LLMChain(
+        llm=llm,
+        prompt=prompt,
+        output_key="bloom_classification",
+        output_parser=parser
+    )
+
+def create_related_question_generation_chain(llm):
+    """Create a chain for generating related questions using structured output."""
+    prompt, parser = related_question_prompt()
+    return LLMChain(
+        llm=llm,
+        prompt=prompt,
+        output_key="question_suggestion",
+        output_parser=parser
+    )
+
+def create_unrelated_question_generation_chain(llm):
+    """Create a chain for generating unrelated questions using structured output."""
+    prompt, parser = unrelated_question_prompt()
+    return LLMChain(
+        llm=llm,
+        prompt=prompt,
+        output_key="question_suggestion",
+        output_parser=parser
+    )
+
+def get_fallback_question(feedback_type, original_question):
+    """Generate appropriate fallback questions when validation fails."""
+    if feedback_type == "related":
+        # Extract a key concept from original question for fallback
+        words = original_question.replace('?', '').split()
+        content_words = [w for w in words if len(w) > 2 and w not in ['어떤', '어떻게', '무엇', '왜']]
+        if content_words:
+            key_concept = content_words[0]
+            return f"{key_concept}을 바탕으로 새로운 연구 방향을 제안해볼 수 있을까?"
+        else:
+            return "이 개념을 바탕으로 새로운 연구 방향을 제안해볼 수 있을까?"
+    else:  # unrelated
+        # Paragraph-grounded fallback questions that stay within the text scope
+        fallback_questions = [
+            "이 주제의 다른 측면을 새롭게 탐구할 수 있는 방법은 무엇일까?",
+            "텍스트에서 다루지 않은 관련 요소를 발전시킬 수 있을까?",
+            "이 개념을 다른 방향으로 확장해볼 수 있는 방안은 무엇일까?",
+            "텍스트 내 다른 관점에서 새로운 접근법을 제안할 수 있을까?"
+        ]
+        # Drawn from a generator seeded by the question, not the shared global one
+        return session_rng("fallback", original_question).choice(fallback_questions)
+
+def get_bloom_classification_with_fallback(classification_chain, paragraph, question, max_retries=2):
+    """Get Bloom classification with optimized retry logic"""
+    for attempt in range(max_retries):
+        try:
+            result = classification_chain.run({"paragraph": paragraph, "question": question})
+            
+            # Extract bloom level
+            if hasattr(result, 'bloom_level'):
+                return result.bloom_level
+            elif isinstance(result, dict) and 'bloom_level' in result:
+                return result['bloom_level']
+            else:
+                bloom_level = str(result).strip()
+                if bloom_level:
+                    return bloom_level
+                    
+        except Exception as e:
+            if attempt == max_retries - 1:  # Last attempt
+                print(f"Classification failed after {max_retries} attempts: {e}")
+            continue
+    
+    return "기억"  # Default fallback
+
+def generate_question_without_validation(chain, paragraph, question, feedback_type, max_retries=3):
+    """Generate question without validation but with metrics collection"""
+    for attempt in range(max_retries):
+        try:
+            result = chain.run({"paragraph": paragraph, "question": question})
+            
+            # Extract question
+            if hasattr(result, 'suggested_question'):
+                suggested_question = result.suggested_question
+            elif isinstance(result, dict) and 'suggested_question' in result:
+                suggested_question = result['suggested_question']
+            else:
+                suggested_question = str(result).strip()
+            
+            # Basic format validation (just ensure it's not empty and has question mark)
+            if suggested_question and len(suggested_question.strip()) > 0:
+                if not suggested_question.endswith('?'):
+                    suggested_question += '?'
+                return suggested_question
+                
+        except Exception as e:
+            print(f"Attempt {attempt + 1} failed: {e}")
+            continue
+    
+    # Fallback if all attempts failed
+    return get_fallback_question(feedback_type, question)
+
+class LangChainFeedbackBackend:
+    """Feedback backend running the chains on the given chat models
+
+    The three chains are built once here and reused for every request.
+    """
+
+    def __init__(self, classification_llm, generation_llm):
+        self.classification_llm = classification_llm
+        self.generation_llm = generation_llm
+        self.chains = {}
+        if classification_llm:
+            self.chains = {
+                "classification": create_bloom_classification_chain(classification_llm),
+                "related": create_related_question_generation_chain(generation_llm),
+                "unrelated": create_unrelated_question_generation_chain(generation_llm)
+            }
+
+    def __call__(self, question, paragraph_content, feedback_type):
+        if not self.classification_llm:
+            raise FeedbackUnavailable("Error: OpenAI API key not found.")
+
+        # STEP 1: Classification (always needed)
+        bloom_level = get_bloom_classification_with_fallback(self.chains["classification"], paragraph_content, question)
+
+        # STEP 2: Generate suggestion
+        suggested_question = generate_question_without_validation(
+            self.chains["related" if feedback_type == "related" else "unrelated"],
+            paragraph_content, question, feedback_type
+        )
+        return bloom_level, suggested_question
@@ -0,0 +1,52 @@
+"""
+Clocks for the stage machine and everything it drives.
+
+Every wall-clock read, delay and timestamp of a session goes through one
+clock object (engine.clock): stage timers, the baseline fixation, marker
+pulses, mock feedback latency and logged timestamps. RealClock is used in
+production. VirtualClock never sleeps: a delay moves its time forward
+instantly, so simulations run a full session in seconds while every recorded
+duration stays what it would have been.
+"""
+
+import time
+from datetime import datetime
+
+
+class RealClock:
+    """Wall clock used in production"""
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def now(self):
+        return datetime.now()
+
+
+class VirtualClock:
+    """Fast-forwardable clock: sleep() advances the time instead of waiting"""
+
+    def __init__(self, start=None):
+        self.current = time.time() if start is None else start
+
+    def time(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def now(self):
+        return datetime.fromtimestamp(self.current)
+
+    def advance(self, seconds):
+        """Let simulated time pass, e.g. a participant's reading or think time"""
+        if seconds < 0:
+            raise ValueError("A clock cannot go back in time")
+        self.current += seconds
+
+    def advance_to(self, timestamp):
+        """Jump forward to a given time (no-op if it has already passed)"""
+        self.current = max(self.current, timestamp)
@@ -0,0 +1,69 @@
+"""
+Configuration of the app, read once per process.
+
+Loads the .env file, reports whether an OpenAI API key is available and
+reads the environment variables below. Streamlit reruns the app script on
+every interaction, but this module is imported (and its banner printed)
+only once per server process.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from bloom_study.engine import BASELINE_DURATION
+
+# Load environment variables (for OpenAI API key)
+load_dotenv()
+
+# Check if OpenAI API key is available
+if not os.getenv("OPENAI_API_KEY"):
+    print("Warning: No OpenAI API key found in environment variables.")
+    print("Please set OPENAI_API_KEY in your .env file or environment variables.")
+else:
+    print("OpenAI API key loaded successfully.")
+
+# Set this to False to disable parallel port for initial testing
+USE_PARALLEL_PORT = False  # Change to True when you're ready to test with actual hardware
+
+# Log file format written by save_logs: "json", "columnar" (Parquet/Arrow) or "both"
+LOG_EXPORT_FORMAT = os.getenv("LOG_EXPORT_FORMAT", "json")
+
+# SQLite database that indexes all sessions (empty = disabled)
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", os.path.join("logs", "sessions.db"))
+
+# Directory the event log and trial records of running sessions are spilled to after every trial (empty = keep in memory)
+TRIAL_SPILL_DIR = os.getenv("TRIAL_SPILL_DIR", os.path.join("logs", "spill"))
+
+# A participant ID entered again continues its unfinished session if that was checkpointed (in the
+# session store) within this many hours, e.g. after a browser refresh or server restart (0 = always start anew)
+RESUME_WINDOW_HOURS = float(os.getenv("RESUME_WINDOW_HOURS", "12"))
+
+# Path of the shared-memory marker ring read by the acquisition host (empty = disabled)
+MARKER_RING_PATH = os.getenv("MARKER_RING_PATH", "")
+
+# OpenAI-compatible endpoint for the feedback chains (empty = api.openai.com),
+# e.g. http://127.0.0.1:8011/v1 for mock_llm_server.py
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")
+
+# Keep-alive of the pooled LLM connection while a participant reads and writes a question:
+# ping the endpoint when the pool has been idle this many seconds (0 = no pre-warming; keep it
+# below the server's idle timeout) and stop holding it for a session after KEEPALIVE_HOLD_SECONDS
+KEEPALIVE_PING_SECONDS = float(os.getenv("KEEPALIVE_PING_SECONDS", "20"))
+KEEPALIVE_HOLD_SECONDS = float(os.getenv("KEEPALIVE_HOLD_SECONDS", "300"))
+
+# Feedback backend: "openai" (LangChain chains) or "mock" (offline, fixed suggestions after MOCK_FEEDBACK_LATENCY seconds)
+FEEDBACK_BACKEND = os.getenv("FEEDBACK_BACKEND", "openai")
+MOCK_FEEDBACK_LATENCY = float(os.getenv("MOCK_FEEDBACK_LATENCY", "0"))
+
+# LLM cassette: "off", "record" (save every LLM request/response) or "replay" (answer from LLM_CASSETTE);
+# LLM_CASSETTE_TIMING is "instant" or "original" (sleep for the recorded latency) when replaying
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off")
+LLM_CASSETTE = os.getenv("LLM_CASSETTE", "")
+LLM_CASSETTE_TIMING = os.getenv("LLM_CASSETTE_TIMING", "instant")
+
+# Length of the baseline fixation cross in seconds (shortened only for load tests)
+BASELINE_SECONDS = float(os.getenv("BASELINE_SECONDS", BASELINE_DURATION))
+
+# How often the baseline screen checks its timer; the final check waits for the exact end
+BASELINE_POLL_SECONDS = 0.5
@@ -0,0 +1,154 @@
+"""
+Pooled, pre-warmed HTTP connection to the LLM endpoint.
+
+Both chat models send their requests through ConnectionWarmer.client, one
+httpx connection pool per server process. The first request on a cold
+connection pays for DNS, TCP and TLS setup, and an idle connection is
+closed by the server (or the pool) after a while, e.g. during the baseline
+or a long reading stage. The engine therefore holds the connection warm
+while a participant is in show_paragraph/ask_question:
+
+- hold(key) pre-opens the connection with a lightweight ping (GET /models,
+  no tokens) if nothing used it within the ping interval
+- while any session holds it, a background thread pings whenever the pool
+  has been idle for ping_interval seconds
+- release(key) ends the hold when the question is submitted; a hold also
+  ends on its own after hold_limit seconds (an abandoned session)
+
+track() records, per feedback call, whether its requests reused an open
+connection or had to connect first. The pool speaks HTTP/1.1 (httpx needs
+the optional h2 package for HTTP/2).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+class ConnectionWarmer:
+    """Process-wide httpx pool for the chat models, kept warm for sessions in a trial"""
+
+    def __init__(self, base_url=None, api_key=None, ping_interval=20.0, hold_limit=300.0):
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.api_key = api_key
+        self.ping_interval = ping_interval
+        self.hold_limit = hold_limit
+        self.pings = 0
+        self.ping_failures = 0
+        self._client = None
+        self._holds = {}
+        self._last_activity = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._local = threading.local()
+        self._thread = None
+
+    @property
+    def client(self):
+        """The shared httpx.Client (created on first use, so httpx loads with the chains)"""
+        with self._lock:
+            if self._client is None:
+                import httpx
+                self._client = httpx.Client(
+                    # Keep idle connections in the pool longer than the pings are apart
+                    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=max(60.0, self.ping_interval * 3)),
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                    event_hooks={"request": [self._on_request], "response": [self._on_response]}
+                )
+            return self._client
+
+    def _on_request(self, request):
+        call = getattr(self._local, "call", None)
+        if call is None:
+            return
+        call["requests"] += 1
+
+        def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                call["new_connections"] += 1
+
+        request.extensions["trace"] = trace
+
+    def _on_response(self, response):
+        self._last_activity = time.monotonic()
+
+    def idle_seconds(self):
+        """Seconds since the pool last got a response (None if it never did)"""
+        if self._last_activity is None:
+            return None
+        return time.monotonic() - self._last_activity
+
+    def is_warm(self):
+        idle = self.idle_seconds()
+        return idle is not None and idle < self.ping_interval
+
+    # Holds
+
+    def hold(self, key):
+        """Keep the connection warm for a session (pre-opens it now if it is cold)"""
+        if not self.ping_interval:
+            return
+        with self._lock:
+            self._holds[key] = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._keep_alive, name="llm-keep-alive", daemon=True)
+                self._thread.start()
+        if not self.is_warm():
+            self._wake.set()
+
+    def release(self, key):
+        with self._lock:
+            self._holds.pop(key, None)
+
+    def held(self):
+        with self._lock:
+            return len(self._holds)
+
+    def _expire_holds(self):
+        now = time.monotonic()
+        with self._lock:
+            for key, since in list(self._holds.items()):
+                if now - since > self.hold_limit:
+                    del self._holds[key]
+            return bool(self._holds)
+
+    def _keep_alive(self):
+        while True:
+            self._wake.wait(timeout=min(1.0, self.ping_interval))
+            self._wake.clear()
+            if self._expire_holds() and not self.is_warm() and time.monotonic() >= self._retry_at:
+                self.ping()
+
+    def ping(self):
+        """One lightweight request that opens (or keeps open) a pooled connection"""
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        try:
+            self.client.get(f"{self.base_url}/models", headers=headers, timeout=10.0)
+            self.pings += 1
+        except Exception as e:
+            self.ping_failures += 1
+            # Do not retry before the next interval
+            self._retry_at = time.monotonic() + self.ping_interval
+            print(f"Keep-alive ping failed: {e}")
+
+    # Per-call connection reuse
+
+    @contextmanager
+    def track(self):
+        """Record the requests made by this thread inside the block
+
+        Yields a dict filled in on exit: requests, new_connections, idle_seconds
+        (pool idle time before the call) and reused (every request went over
+        an already open connection).
+        """
+        idle = self.idle_seconds()
+        call = {"requests": 0, "new_connections": 0,
+                "idle_seconds": round(idle, 3) if idle is not None else None}
+        self._local.call = call
+        try:
+            yield call
+        finally:
+            self._local.call = None
+            call["reused"] = call["requests"] > 0 and call["new_connections"] == 0
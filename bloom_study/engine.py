@@ -0,0 +1,1000 @@
+"""
+Headless stage machine for the experiment.
+
+ExperimentEngine owns one participant's SessionState and implements every
+stage transition (start, pretest, baseline, practice, main trials). It has no
+Streamlit dependency: the clock, the feedback backend, the marker sink, the
+session store and the LLM connection warmer are injected, so the same engine runs behind the Streamlit UI
+in app17.py or in a tight loop for simulations and benchmarks
+(benchmarks/bench_engine.py).
+
+Finished trials are kept as compact TrialRecords that refer to paragraphs by
+index (bloom_study.trials). Given a spill_dir, the event log and the trial
+records are moved to JSON lines files at the end of every trial, so the
+state of a session stays the same size from trial to trial.
+
+With a session store, checkpoint() saves a snapshot of the state whenever
+the stage, iteration or context has changed, and resume() continues a
+participant's unfinished session from its latest checkpoint (see resume()
+for how the interruption is accounted for).
+"""
+
+import json
+import os
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+from bloom_study.assignment import (
+    create_practice_condition_assignment,
+    get_experiment_paragraphs,
+    get_practice_paragraphs,
+    get_schedule_row,
+)
+from bloom_study.clock import RealClock
+from bloom_study.feedback import FeedbackUnavailable, format_feedback, handle_api_error
+from bloom_study.metrics import calculate_question_metrics
+from bloom_study.stimuli import content_hash, get_stimulus_set, precomputed_content_words
+from bloom_study.trials import SpillLog, TrialLog, TrialRecord, spill_prefix
+
+# Event marker values (adjust as needed)
+MARKERS = {
+    "baseline_start": 20,
+    "baseline_end": 21,
+    "paragraph_start": 1,
+    "paragraph_end": 2,
+    "question_input_start": 5,
+    "question_input_end": 6,
+    "feedback_start": 7,
+    "feedback_end": 8,
+    "survey_start": 9,
+    "survey_end": 10,
+    "edit_start": 11,
+    "edit_end": 12,
+    "edit_textarea_focus": 13,  # Add this for edit textarea focus tracking
+    "session_resumed": 30  # Session continued from a checkpoint after a disconnect or restart
+}
+
+BASELINE_DURATION = 30  # seconds of fixation cross
+PRACTICE_ITERATIONS = 2
+
+# Stages of one trial, in order
+TRIAL_STAGES = ['show_paragraph', 'ask_question', 'show_feedback', 'survey', 'edit_question']
+
+class SubmissionError(ValueError):
+    """A participant submission failed validation; the message is shown to them"""
+
+# SessionState fields a checkpoint stores as they are
+CHECKPOINT_FIELDS = (
+    "participant_id", "session_id", "started", "stage", "iteration", "baseline_mode", "baseline_completed",
+    "baseline_start_time", "practice_mode", "practice_completed", "stage_timers", "current_iteration_data",
+    "stored_event_count", "pretest_data", "question_input_focus_time", "edit_textarea_focus_time"
+)
+
+def paragraphs_hash(paragraphs):
+    """Digest of the texts of a session's paragraphs, to notice changed stimuli on resume"""
+    return content_hash("\x1f".join(p['content'] for p in paragraphs))
+
+@dataclass
+class SessionState:
+    """Everything the stage machine knows about one participant's session"""
+    participant_id: str = None
+    session_id: str = None
+    started: bool = False
+    stage: str = "start"
+    iteration: int = 0
+    baseline_mode: bool = False
+    baseline_completed: bool = False
+    baseline_start_time: float = None
+    practice_mode: bool = False
+    practice_completed: bool = False
+    stage_timers: dict = field(default_factory=dict)
+    responses: TrialLog = field(default_factory=TrialLog)
+    practice_responses: TrialLog = field(default_factory=TrialLog)
+    current_iteration_data: dict = field(default_factory=dict)
+    event_log: SpillLog = field(default_factory=SpillLog)
+    pending_events: list = field(default_factory=list)
+    stored_event_count: int = 0
+    pretest_data: dict = None
+    practice_paragraphs: list = None
+    experiment_paragraphs: list = None
+    condition_mapping: dict = None
+    practice_condition_mapping: dict = None
+    question_input_focus_time: float = None
+    edit_textarea_focus_time: float = None
+
+    @property
+    def context(self):
+        return "baseline" if self.baseline_mode else ("practice" if self.practice_mode else "main")
+
+    def snapshot(self):
+        """Checkpoint of the session as JSON-ready data: paragraphs by index, logs by spill file"""
+        snapshot = {name: getattr(self, name) for name in CHECKPOINT_FIELDS}
+        paragraphs = []
+        for name in ("practice_paragraphs", "experiment_paragraphs"):
+            snapshot[name] = None if getattr(self, name) is None else [p['index'] for p in getattr(self, name)]
+            paragraphs += getattr(self, name) or []
+        snapshot["paragraphs_hash"] = paragraphs_hash(paragraphs)
+        snapshot["condition_mapping"] = self.condition_mapping
+        snapshot["practice_condition_mapping"] = self.practice_condition_mapping
+        for name in ("event_log", "practice_responses", "responses"):
+            snapshot[name] = getattr(self, name).snapshot()
+        return snapshot
+
+    @classmethod
+    def from_snapshot(cls, snapshot, paragraph_by_index):
+        """The session as it was at a checkpoint, with the paragraph dicts of the current stimulus set"""
+        state = cls(**{name: snapshot[name] for name in CHECKPOINT_FIELDS})
+        for name in ("practice_paragraphs", "experiment_paragraphs"):
+            if snapshot[name] is not None:
+                setattr(state, name, [paragraph_by_index[index] for index in snapshot[name]])
+        # JSON object keys are strings; conditions are looked up by int index/iteration
+        for name in ("condition_mapping", "practice_condition_mapping"):
+            if snapshot[name] is not None:
+                setattr(state, name, {int(k): v for k, v in snapshot[name].items()})
+        state.event_log = SpillLog.from_snapshot(snapshot["event_log"])
+        state.practice_responses = TrialLog.from_snapshot(snapshot["practice_responses"])
+        state.responses = TrialLog.from_snapshot(snapshot["responses"])
+        return state
+
+class ExperimentEngine:
+    """Pure-Python stage machine for one participant"""
+
+    batch_size = 5  # Smaller batch for experiment context
+
+    def __init__(self, state=None, clock=None, feedback_backend=None, marker_sink=None,
+                 session_store=None, error_handler=None, connection_warmer=None, spill_dir=None):
+        self.state = state or SessionState()
+        self.clock = clock or RealClock()
+        self.feedback_backend = feedback_backend
+        self.marker_sink = marker_sink
+        self.session_store = session_store
+        self.error_handler = error_handler or print
+        self.connection_warmer = connection_warmer
+        self.spill_dir = spill_dir
+        self._checkpoint_position = None
+
+    # Logging
+
+    def _timestamp(self):
+        return self.clock.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    def log_event(self, event_description, data=None):
+        state = self.state
+        log_entry = {
+            "timestamp": self._timestamp(),
+            "iteration": state.iteration,
+            "stage": state.stage,
+            "event": event_description,
+            "context": state.context
+        }
+
+        if data:
+            log_entry["data"] = data
+
+        state.event_log.append(log_entry)
+
+    def log_event_batched(self, event_description, data=None):
+        """Optimized logging with batching for non-critical events"""
+        state = self.state
+        log_entry = {
+            "timestamp": self._timestamp(),
+            "iteration": state.iteration,
+            "stage": state.stage,
+            "event": event_description,
+            "context": state.context
+        }
+
+        if data:
+            log_entry["data"] = data
+
+        state.pending_events.append(log_entry)
+
+        # Flush if batch is full or for critical events
+        if (len(state.pending_events) >= self.batch_size or
+            "completed" in event_description.lower() or
+            "error" in event_description.lower()):
+            self.flush_events()
+
+    def flush_events(self):
+        """Write all pending events to the event log"""
+        self.state.event_log.extend(self.state.pending_events)
+        self.state.pending_events.clear()
+
+    # Markers
+
+    def send_marker(self, marker_type):
+        """Send a marker to the configured sink and log it"""
+        if self.marker_sink is not None:
+            errors = self.marker_sink.dispatch(MARKERS[marker_type], self.state.iteration, self.state.stage)
+            for sink_name, e in errors:
+                self.error_handler(f"Error sending marker to {sink_name}: {e}")
+
+        # Log the marker event regardless of sink availability
+        self.log_event(f"MARKER: {marker_type}")
+
+    # Stage timers
+
+    def start_stage_timer(self, stage_name):
+        self.state.stage_timers[f"{stage_name}_start"] = self.clock.time()
+
+    def end_stage_timer(self, stage_name):
+        timers = self.state.stage_timers
+        start_key = f"{stage_name}_start"
+        duration_key = f"{stage_name}_duration"
+
+        if start_key in timers:
+            end_time = self.clock.time()
+            duration = end_time - timers[start_key]
+            timers[f"{stage_name}_end"] = end_time
+            timers[duration_key] = duration
+            return duration
+        return 0
+
+    def record_client_render(self, stage_name, paint_onset, visible_onset, offset_ms, rtt_ms, was_hidden=False):
+        """Store the browser-measured onset of a stage (once per stage)"""
+        timers = self.state.stage_timers
+        if f"{stage_name}_client_onset" in timers:
+            return
+
+        timers[f"{stage_name}_client_onset"] = paint_onset
+        timers[f"{stage_name}_client_visible_onset"] = visible_onset
+        timers[f"{stage_name}_clock_offset_ms"] = offset_ms
+        timers[f"{stage_name}_rtt_ms"] = rtt_ms
+
+        self.log_event("Client render timing", {
+            "render_stage": stage_name,
+            "server_start": timers.get(f"{stage_name}_start"),
+            "client_onset": paint_onset,
+            "client_visible_onset": visible_onset,
+            "was_hidden": was_hidden,
+            "clock_offset_ms": round(offset_ms, 3),
+            "rtt_ms": round(rtt_ms, 3)
+        })
+
+    def client_stage_timing(self, stage_name):
+        """
+        Return the client onset and duration columns for a finished stage.
+        The duration runs from the browser paint to the server-observed end of the
+        stage, minus half the estimated round trip for the click to arrive.
+        """
+        timers = self.state.stage_timers
+        onset = timers.get(f"{stage_name}_client_onset")
+        if onset is None:
+            return {}
+
+        timing = {f"{stage_name}_client_onset": onset}
+        end_time = timers.get(f"{stage_name}_end")
+        if end_time is not None:
+            one_way = timers.get(f"{stage_name}_rtt_ms", 0.0) / 2000.0
+            timing[f"{stage_name}_client_time_seconds"] = max(end_time - one_way - onset, 0.0)
+        return timing
+
+    def next_stage(self, next_stage_name):
+        """Advance to the next stage (the UI re-renders in the rerun of the click)"""
+        state = self.state
+        # End timer for current stage
+        self.end_stage_timer(state.stage)
+
+        # Log the stage transition
+        self.log_event(f"Stage transition: {state.stage} -> {next_stage_name}")
+        state.stage = next_stage_name
+
+        # Start timer for next stage
+        self.start_stage_timer(next_stage_name)
+
+    # Session setup
+
+    def start_experiment(self, participant_id):
+        """Participant entered their ID on the welcome screen"""
+        state = self.state
+        state.participant_id = participant_id
+        state.session_id = f"{participant_id}_{self.clock.now().strftime('%Y%m%d_%H%M%S')}"
+        state.started = True
+        state.stage = "pretest_survey"
+
+        if self.spill_dir:
+            prefix = spill_prefix(self.spill_dir, state.session_id)
+            state.event_log.path = f"{prefix}_events.jsonl"
+            state.practice_responses.path = f"{prefix}_practice_trials.jsonl"
+            state.responses.path = f"{prefix}_main_trials.jsonl"
+
+        if self.session_store is not None:
+            try:
+                self.session_store.start_session(state.session_id, participant_id,
+                                                 started_at=self.clock.now().strftime("%Y-%m-%d %H:%M:%S"))
+            except Exception as e:
+                print(f"Could not start session in session store: {e}")
+
+        self.log_event("Experiment started", {
+            "participant_id": participant_id,
+            "starting_with_pretest": True
+        })
+
+    def complete_pretest(self, pretest_data):
+        self.state.pretest_data = pretest_data
+
+        # Log the completion
+        self.log_event("Pretest survey completed", pretest_data)
+
+        # Move to pretest completion stage
+        self.state.stage = "pretest_completed"
+
+    def prepare_baseline(self):
+        state = self.state
+        state.baseline_mode = True
+        state.iteration = 0
+        state.stage = "baseline_ready"
+
+    def start_baseline(self):
+        """Participant pressed start; the fixation period begins when the cross is shown"""
+        state = self.state
+        state.stage = "baseline_screen"
+        state.baseline_start_time = None
+
+    def baseline_onset(self):
+        """The fixation cross is on screen: mark the onset and start the baseline timer"""
+        state = self.state
+        self.start_stage_timer("baseline_screen")
+        state.baseline_start_time = state.stage_timers["baseline_screen_start"]
+        self.send_marker("baseline_start")
+        self.log_event("Baseline session started")
+
+    def baseline_remaining(self, duration=BASELINE_DURATION):
+        """Seconds of fixation left (the full duration before the onset)"""
+        start = self.state.baseline_start_time
+        if start is None:
+            return duration
+        return max(duration - (self.clock.time() - start), 0.0)
+
+    def poll_baseline(self, duration=BASELINE_DURATION, poll_interval=0.0):
+        """
+        Complete the baseline once the duration has elapsed since the onset.
+        If it ends within poll_interval, wait for the exact end instead of the
+        next poll. Returns True when the baseline was completed.
+        """
+        if self.state.baseline_start_time is None:
+            return False
+        remaining = self.baseline_remaining(duration)
+        if remaining > poll_interval:
+            return False
+        if remaining > 0:
+            self.clock.sleep(remaining)
+        self.baseline_completed(duration)
+        return True
+
+    def run_baseline_screen(self, duration=BASELINE_DURATION):
+        """Hold the fixation cross for the baseline duration, then complete the baseline"""
+        self.baseline_onset()
+        self.clock.sleep(duration)
+        self.baseline_completed(duration)
+
+    def baseline_completed(self, planned_duration=BASELINE_DURATION):
+        state = self.state
+        self.send_marker("baseline_end")
+        self.end_stage_timer("baseline_screen")
+
+        # Log baseline completion with the measured onset-to-offset duration
+        timers = state.stage_timers
+        self.log_event("Baseline session completed", {
+            "baseline_duration": timers.get("baseline_screen_duration", 0),
+            "planned_duration": planned_duration,
+            "onset": timers.get("baseline_screen_start"),
+            "offset": timers.get("baseline_screen_end"),
+            "client_onset": timers.get("baseline_screen_client_onset")
+        })
+
+        # Switch to baseline completion stage
+        state.baseline_mode = False
+        state.baseline_completed = True
+        state.stage = "baseline_complete"
+        state.stage_timers = {}
+        state.current_iteration_data = {}
+
+        self.log_event("Moving to baseline completion stage")
+
+        # Create practice condition assignment
+        state.practice_condition_mapping = create_practice_condition_assignment(state.participant_id, self.session_store)
+
+        self.log_event("Practice session prepared", {
+            "practice_condition_mapping": state.practice_condition_mapping
+        })
+
+    def show_bloom_explanation(self):
+        # Move to Bloom explanation stage
+        self.state.stage = "bloom_explanation"
+        self.log_event("Moving to Bloom explanation stage")
+
+    def finish_bloom_explanation(self):
+        self.state.stage = "practice_ready"
+        self.log_event("Bloom explanation completed")
+
+    def start_practice(self):
+        state = self.state
+        # Initialize practice session
+        state.practice_mode = True
+        state.iteration = 0
+        state.stage_timers = {}
+        state.current_iteration_data = {}
+
+        # Initialize practice paragraphs and balanced condition assignment
+        stimulus_set = get_stimulus_set()
+        state.practice_paragraphs = get_practice_paragraphs(stimulus_set)
+        state.practice_condition_mapping = create_practice_condition_assignment(state.participant_id, self.session_store)
+
+        self.log_event("Practice session starting", {
+            "practice_condition_mapping": state.practice_condition_mapping,
+            "stimulus_version": stimulus_set.content_hash
+        })
+
+        self.start_iteration()
+
+    def start_main_experiment(self):
+        state = self.state
+        # Switch to main experiment mode
+        state.practice_mode = False
+        state.practice_completed = True
+        state.iteration = 0
+        state.stage_timers = {}
+        state.current_iteration_data = {}
+
+        # Initialize main experiment paragraphs and conditions from the participant's schedule row
+        stimulus_set = get_stimulus_set()
+        schedule = get_schedule_row(state.participant_id, stimulus_set, self.session_store)
+        by_index = {p['index']: p for p in get_experiment_paragraphs(stimulus_set)}
+        experiment_paragraphs = [by_index[idx] for idx in schedule["order"]]
+
+        # Store paragraphs
+        state.experiment_paragraphs = experiment_paragraphs
+
+        # Balanced condition assignment
+        state.condition_mapping = dict(schedule["conditions"])
+
+        # Log experiment details
+        self.log_event("Main experiment started", {
+            "participant_id": state.participant_id,
+            "total_paragraphs": len(experiment_paragraphs),
+            "condition_mapping": state.condition_mapping,
+            "genre_distribution": {genre: sum(1 for p in experiment_paragraphs if p['genre'] == genre)
+                                 for genre in stimulus_set.genre_ranges.keys()},
+            "stimulus_version": stimulus_set.content_hash,
+            "schedule_row": schedule["row"],
+            "schedule_source": schedule["source"],
+            "schedule": schedule["schedule"]
+        })
+
+        self.start_iteration()
+
+    # Trials
+
+    def start_iteration(self):
+        state = self.state
+        if state.baseline_mode:
+            # In baseline mode - only one iteration
+            state.stage = "baseline_screen"
+            self.baseline_onset()
+        elif state.practice_mode:
+            # In practice mode
+            if state.iteration >= PRACTICE_ITERATIONS:
+                state.stage = "practice_completed"
+                self.log_event("Practice session completed")
+            else:
+                state.stage = "show_paragraph"
+                self.start_stage_timer("show_paragraph")
+                self.send_marker("paragraph_start")
+                self.hold_connection()
+                self.log_event("Practice iteration started", {"iteration_number": state.iteration})
+        else:
+            # In main experiment - check if experiment_paragraphs exists
+            if state.experiment_paragraphs is not None:
+                if state.iteration >= len(state.experiment_paragraphs):
+                    state.stage = "completed"
+                    self.log_event("Experiment completed")
+                else:
+                    state.stage = "show_paragraph"
+                    self.start_stage_timer("show_paragraph")
+                    self.send_marker("paragraph_start")
+                    self.hold_connection()
+                    self.log_event("Iteration started", {"iteration_number": state.iteration})
+            else:
+                # If experiment_paragraphs doesn't exist yet, stay in current stage
+                # This happens during baseline completion before main experiment starts
+                self.log_event("Experiment paragraphs not yet initialized")
+
+    def current_paragraph(self):
+        """Paragraph dict ('index', 'content', 'genre') of the current iteration"""
+        state = self.state
+        if state.practice_mode:
+            return state.practice_paragraphs[state.iteration]
+        return state.experiment_paragraphs[state.iteration]
+
+    def total_iterations(self):
+        if self.state.practice_mode:
+            return PRACTICE_ITERATIONS
+        return len(self.state.experiment_paragraphs or [])
+
+    def paragraph_viewed(self):
+        self.send_marker("paragraph_end")
+        self.send_marker("question_input_start")
+        self.next_stage("ask_question")
+
+    def record_textarea_focus(self, textarea_type):
+        """Log when a textarea is focused/clicked"""
+        state = self.state
+        timestamp = self._timestamp()
+
+        if textarea_type == "edit_question":
+            # Store the focus time for edit question specifically
+            state.edit_textarea_focus_time = self.clock.time()
+            self.send_marker("edit_textarea_focus")
+        elif textarea_type == "question_input":
+            # Store the focus time for question input specifically
+            state.question_input_focus_time = self.clock.time()
+
+        self.log_event(f"Textarea focus: {textarea_type}", {
+            "focus_timestamp": timestamp,
+            "focus_time": self.clock.time()
+        })
+
+    def hold_connection(self):
+        """Keep the LLM connection warm while the participant reads and writes the question"""
+        if self.connection_warmer is not None:
+            self.connection_warmer.hold(id(self))
+
+    def release_connection(self):
+        if self.connection_warmer is not None:
+            self.connection_warmer.release(id(self))
+
+    def get_ai_feedback(self, question, paragraph_data):
+        """
+        AI feedback generation without validation but with metrics collection
+        paragraph_data should be a dict with 'index', 'content', 'genre' keys
+        """
+        state = self.state
+        if state.baseline_mode:
+            # No feedback for baseline mode
+            return "Baseline mode - no feedback"
+
+        paragraph_index = paragraph_data['index']
+        paragraph_content = paragraph_data['content']
+
+        if state.practice_mode:
+            # For practice mode, use balanced feedback assignment
+            feedback_type = state.practice_condition_mapping.get(state.iteration, "related")
+        else:
+            feedback_type = state.condition_mapping.get(paragraph_index, "related")
+
+        try:
+            if self.feedback_backend is None:
+                raise FeedbackUnavailable("Error: no feedback backend configured.")
+
+            # Record whether the backend's requests went over an already open connection
+            warmer = self.connection_warmer
+            with (warmer.track() if warmer is not None else nullcontext()) as connection:
+                bloom_level, suggested_question = self.feedback_backend(question, paragraph_content, feedback_type)
+            if connection is not None:
+                state.current_iteration_data['feedback_connection_reused'] = connection['reused']
+
+            # Calculate metrics for storage (but don't use for validation)
+            question_metrics = calculate_question_metrics(
+                question, suggested_question, paragraph_content,
+                paragraph_words=precomputed_content_words(paragraph_index, paragraph_content)
+            )
+
+            final_response = format_feedback(bloom_level, suggested_question)
+
+            # Store metrics for later CSV inclusion
+            if question_metrics:
+                state.current_iteration_data.update({
+                    'suggested_question_metrics': question_metrics,
+                    'feedback_type': feedback_type
+                })
+
+            # Log execution details
+            self.log_event("AI feedback generated", {
+                "bloom_level": bloom_level,
+                "suggested_question": suggested_question,
+                "feedback_type": feedback_type,
+                "paragraph_index": paragraph_index,
+                "paragraph_genre": paragraph_data.get('genre', 'unknown'),
+                "question_metrics": question_metrics,
+                "connection": connection,
+                "practice_mode": state.practice_mode,
+                "baseline_mode": state.baseline_mode
+            })
+
+            return final_response
+
+        except FeedbackUnavailable as e:
+            return str(e)
+        except Exception as e:
+            return handle_api_error(e, feedback_type)
+
+    def submit_question(self, question):
+        state = self.state
+        question = question or ''
+
+        # Enhanced validation
+        if not question.strip():
+            raise SubmissionError("질문을 입력해주세요.")
+
+        # Check if the question is only a question mark (with optional whitespace)
+        if question.strip() == '?':
+            raise SubmissionError("질문을 입력해주세요.")
+
+        # Calculate question input interaction time (from first focus to submission)
+        question_input_interaction_time = None
+        if state.question_input_focus_time is not None:
+            question_input_interaction_time = self.clock.time() - state.question_input_focus_time
+
+        # Store the question in current iteration data for persistence
+        state.current_iteration_data['user_question'] = question
+        state.current_iteration_data['question_input_interaction_time'] = question_input_interaction_time
+
+        self.send_marker("question_input_end")
+
+        # Get paragraph information
+        current_paragraph_data = self.current_paragraph()
+
+        # Log the submitted question with paragraph information
+        self.log_event_batched("Question submitted", {
+            "question": question,
+            "question_input_interaction_time": question_input_interaction_time,
+            "iteration": state.iteration,
+            "paragraph_index": current_paragraph_data['index'],
+            "paragraph_genre": current_paragraph_data['genre'],
+            "practice_mode": state.practice_mode,
+            "baseline_mode": state.baseline_mode
+        })
+
+        # Get AI feedback (the call itself keeps the connection in use from here on)
+        self.release_connection()
+        self.send_marker("feedback_start")
+        feedback = self.get_ai_feedback(question, current_paragraph_data)
+        self.send_marker("feedback_end")
+
+        # Store the feedback
+        state.current_iteration_data['feedback'] = feedback
+
+        # Log the feedback; the text is only logged when it is not format_feedback() of the
+        # bloom level and suggestion logged just before (an error or the baseline)
+        feedback_type = state.current_iteration_data.get('feedback_type', 'unknown')
+        feedback_data = {
+            "feedback_type": feedback_type,
+            "paragraph_index": current_paragraph_data['index'],
+            "paragraph_genre": current_paragraph_data['genre'],
+            "practice_mode": state.practice_mode,
+            "baseline_mode": state.baseline_mode
+        }
+        if 'suggested_question_metrics' not in state.current_iteration_data:
+            feedback_data = {"feedback": feedback, **feedback_data}
+        self.log_event("AI feedback generated", feedback_data)
+
+        self.next_stage("show_feedback")
+
+    def feedback_viewed(self):
+        self.send_marker("survey_start")
+        self.next_stage("survey")
+
+    def submit_survey(self, curiosity, relatedness, accept_feedback):
+        state = self.state
+        self.send_marker("survey_end")
+
+        # Validate that required fields are filled
+        if curiosity is None:
+            raise SubmissionError("Please rate your curiosity level before proceeding.")
+        if accept_feedback is None:
+            raise SubmissionError("Please indicate whether you accept the feedback before proceeding.")
+        if relatedness is None:
+            raise SubmissionError("Please rate the relatedness before proceeding.")
+
+        # Store in current iteration data
+        state.current_iteration_data['curiosity'] = curiosity
+        state.current_iteration_data['relatedness'] = relatedness
+        state.current_iteration_data['accept_feedback'] = accept_feedback
+
+        # Get paragraph information
+        current_paragraph_data = self.current_paragraph()
+
+        # Log the survey responses
+        survey_data = {
+            "curiosity": curiosity,
+            "relatedness": relatedness,
+            "accept_feedback": accept_feedback,
+            "iteration": state.iteration,
+            "paragraph_index": current_paragraph_data['index'],
+            "paragraph_genre": current_paragraph_data['genre'],
+            "feedback_type": state.current_iteration_data.get('feedback_type', 'unknown'),
+            "practice_mode": state.practice_mode,
+            "baseline_mode": state.baseline_mode
+        }
+        self.log_event_batched("Survey submitted", survey_data)
+
+        # Go to edit question stage
+        self.send_marker("edit_start")
+        self.next_stage("edit_question")
+
+    def submit_edited_question(self, edited_question):
+        state = self.state
+        self.send_marker("edit_end")
+
+        edited_question = edited_question or ''
+        if not edited_question.strip():
+            raise SubmissionError("Please enter a question before proceeding.")
+
+        # Store in current iteration data
+        state.current_iteration_data['edited_question'] = edited_question
+
+        # Log the edited question
+        self.log_event("Edited question submitted", {
+            "edited_question": edited_question,
+            "practice_mode": state.practice_mode,
+            "baseline_mode": state.baseline_mode
+        })
+
+        # Get the current paragraph data
+        current_paragraph_data = self.current_paragraph()
+
+        # End the current stage timer BEFORE calculating durations
+        self.end_stage_timer(state.stage)
+
+        # Calculate stage durations
+        stage_durations = {}
+        for stage in TRIAL_STAGES:
+            duration_key = f"{stage}_duration"
+            if duration_key in state.stage_timers:
+                stage_durations[f"{stage}_time_seconds"] = state.stage_timers[duration_key]
+            stage_durations.update(self.client_stage_timing(stage))
+            # Stages a resume restarted (not included in their durations)
+            if f"{stage}_interruption_seconds" in state.stage_timers:
+                stage_durations[f"{stage}_interruption_seconds"] = state.stage_timers[f"{stage}_interruption_seconds"]
+
+        # Calculate edit textarea interaction time
+        edit_textarea_interaction_time = None
+        if state.edit_textarea_focus_time is not None:
+            edit_textarea_interaction_time = self.clock.time() - state.edit_textarea_focus_time
+
+        # Get metrics if they exist
+        metrics = state.current_iteration_data.get('suggested_question_metrics', {})
+
+        # Store all the data for this iteration (the paragraph by index; its text is joined back into rows)
+        record = TrialRecord(
+            iteration=state.iteration,
+            paragraph_index=current_paragraph_data['index'],
+            paragraph_genre=current_paragraph_data['genre'],
+            feedback_type=state.current_iteration_data.get('feedback_type', 'unknown'),
+            original_question=state.current_iteration_data.get('user_question', ''),
+            question_input_interaction_time_seconds=state.current_iteration_data.get('question_input_interaction_time'),
+            feedback=state.current_iteration_data.get('feedback', ''),
+            feedback_connection_reused=state.current_iteration_data.get('feedback_connection_reused'),
+            curiosity=state.current_iteration_data.get('curiosity'),
+            relatedness=state.current_iteration_data.get('relatedness'),
+            accept_feedback=state.current_iteration_data.get('accept_feedback'),
+            edited_question=edited_question,
+            edit_textarea_interaction_time_seconds=edit_textarea_interaction_time,
+            timestamp=self.clock.now().strftime("%Y-%m-%d %H:%M:%S"),
+            # Add question metrics to CSV
+            suggested_question_relatedness_score=metrics.get('relatedness_score'),
+            suggested_question_paragraph_relevance=metrics.get('paragraph_relevance'),
+            suggested_question_length=metrics.get('question_length'),
+            suggested_question_word_count=metrics.get('question_word_count'),
+            suggested_question_ends_with_question_mark=metrics.get('ends_with_question_mark'),
+            suggested_question_is_empty=metrics.get('is_empty'),
+            stage_durations=stage_durations
+        )
+        iteration_data = record.as_row(current_paragraph_data['content'])
+
+        if state.practice_mode:
+            state.practice_responses.append(record)
+        else:
+            state.responses.append(record)
+
+        # Index the finished trial across sessions
+        self.store_completed_trial(iteration_data)
+
+        # Clear current iteration data and stage timers for next iteration
+        state.current_iteration_data = {}
+        state.stage_timers = {}
+
+        # Clear textarea focus times
+        state.edit_textarea_focus_time = None
+        state.question_input_focus_time = None
+
+        # Move to next iteration
+        self.flush_events()
+        self.spill_finished_trials()
+        state.iteration += 1
+        self.start_iteration()
+
+        return iteration_data
+
+    def response_rows(self, practice=False):
+        """Finished trials of the main experiment (or practice) as responses CSV rows"""
+        state = self.state
+        paragraphs = (state.practice_paragraphs or []) + (state.experiment_paragraphs or [])
+        paragraph_text = {p['index']: p['content'] for p in paragraphs}
+        return (state.practice_responses if practice else state.responses).rows(paragraph_text)
+
+    # Persistence
+
+    def spill_finished_trials(self):
+        """Move the events and trial records so far to the spill files (if there are any)"""
+        state = self.state
+        state.event_log.spill()
+        state.practice_responses.spill()
+        state.responses.spill()
+
+    def remove_spill_files(self):
+        """Bring the spilled events and trial records back into memory and delete their files"""
+        state = self.state
+        state.event_log.unspill()
+        state.practice_responses.unspill()
+        state.responses.unspill()
+
+    def _store_pending_events(self):
+        """Write events logged since the last call to the session store"""
+        state = self.state
+        self.flush_events()
+        if len(state.event_log) > state.stored_event_count:
+            self.session_store.record_events(state.session_id, state.participant_id,
+                                             state.event_log[state.stored_event_count:])
+            state.stored_event_count = len(state.event_log)
+
+    def store_completed_trial(self, iteration_data):
+        state = self.state
+        if self.session_store is None or state.session_id is None:
+            return
+        try:
+            context = "practice" if state.practice_mode else "main"
+            self.session_store.record_trial(state.session_id, state.participant_id, context, iteration_data)
+            self._store_pending_events()
+        except Exception as e:
+            print(f"Could not write trial to session store: {e}")
+
+    def checkpoint(self):
+        """Save a snapshot of the session to the session store if its stage, iteration or context changed"""
+        state = self.state
+        if self.session_store is None or state.session_id is None:
+            return
+        position = (state.stage, state.iteration, state.context)
+        if position == self._checkpoint_position:
+            return
+        self.flush_events()
+        try:
+            self.session_store.save_checkpoint(state.session_id, state.participant_id, self.clock.time(),
+                                               state.stage, state.iteration, state.context,
+                                               json.dumps(state.snapshot(), ensure_ascii=False))
+            self._checkpoint_position = position
+        except Exception as e:
+            print(f"Could not save session checkpoint: {e}")
+
+    def resume(self, participant_id, max_age=None):
+        """
+        Continue the participant's latest unfinished session (checkpointed
+        within max_age seconds) in one step; returns False if there is none.
+
+        The session comes back at the checkpointed stage and iteration, with
+        its answers, conditions and logs. The stage the participant was in is
+        restarted: its timers begin again now and the time since the
+        checkpoint is stored as <stage>_interruption_seconds (a trial column).
+        An interrupted baseline is measured again from the start. The resume
+        is logged with the gap and sends the session_resumed marker; stage
+        start markers are not repeated, so every trial keeps one onset.
+        """
+        if self.session_store is None:
+            return False
+        now = self.clock.time()
+        try:
+            checkpoint = self.session_store.latest_checkpoint(
+                participant_id, saved_after=now - max_age if max_age else None
+            )
+            if checkpoint is None:
+                return False
+            snapshot = json.loads(checkpoint["state"])
+            stimulus_set = get_stimulus_set()
+            paragraph_by_index = {p['index']: p for p in
+                                  get_practice_paragraphs(stimulus_set) + get_experiment_paragraphs(stimulus_set)}
+            state = SessionState.from_snapshot(snapshot, paragraph_by_index)
+        except Exception as e:
+            print(f"Could not resume the session of {participant_id}: {e}")
+            return False
+
+        self.state = state
+        self._checkpoint_position = None
+        gap = max(now - checkpoint["saved_at"], 0.0)
+        interrupted_stage = state.stage
+        self.restart_interrupted_stage(gap)
+
+        self.log_event("Session resumed", {
+            "participant_id": participant_id,
+            "session_id": state.session_id,
+            "interrupted_stage": interrupted_stage,
+            "checkpoint_time": checkpoint["saved_at"],
+            "gap_seconds": round(gap, 3),
+            "stimuli_changed": snapshot["paragraphs_hash"] != paragraphs_hash(
+                (state.practice_paragraphs or []) + (state.experiment_paragraphs or [])
+            )
+        })
+        self.send_marker("session_resumed")
+        if state.stage in ("show_paragraph", "ask_question"):
+            self.hold_connection()
+        self.checkpoint()
+        return True
+
+    def restart_interrupted_stage(self, gap):
+        """Begin the current stage again after an interruption of gap seconds (see resume())"""
+        state = self.state
+        interrupted_stage = state.stage
+        if interrupted_stage == "baseline_screen":
+            # A fixation period with a gap in it is no baseline
+            state.stage = "baseline_ready"
+            state.baseline_start_time = None
+
+        timers = state.stage_timers
+        interruption_key = f"{interrupted_stage}_interruption_seconds"
+        interruption = timers.get(interruption_key, 0.0) + gap
+        for key in [key for key in timers if key.startswith(f"{interrupted_stage}_")]:
+            del timers[key]
+        timers[interruption_key] = interruption
+        if state.stage in TRIAL_STAGES:
+            self.start_stage_timer(state.stage)
+        state.question_input_focus_time = None
+        state.edit_textarea_focus_time = None
+
+    def store_completed_session(self, log_files):
+        """Record the saved session in the session store; False if that failed"""
+        state = self.state
+        if self.session_store is None or state.session_id is None:
+            return True
+        try:
+            self._store_pending_events()
+            self.session_store.complete_session(state.session_id, log_files[0], log_files[1],
+                                                completed_at=self.clock.now().strftime("%Y-%m-%d %H:%M:%S"))
+        except Exception as e:
+            print(f"Could not complete session in session store: {e}")
+            return False
+        return True
+
+    def save_logs(self, logs_dir="logs", export_format="json"):
+        """
+        Save the event log and responses. export_format selects the files:
+        'json' (JSON events + CSV responses), 'columnar' (typed Parquet/Arrow)
+        or 'both'.
+        """
+        state = self.state
+        self.flush_events()
+        if not state.event_log:
+            return None, None
+
+        # Create directory if it doesn't exist
+        if not os.path.exists(logs_dir):
+            os.makedirs(logs_dir)
+
+        participant_id = state.participant_id or "unknown"
+        timestamp = self.clock.now().strftime("%Y%m%d_%H%M%S")
+        filename = None
+        responses_filename = None
+
+        if export_format in ("json", "both"):
+            filename = os.path.join(logs_dir, f"participant_{participant_id}_{timestamp}.json")
+            with open(filename, 'w') as f:
+                json.dump(list(state.event_log), f, indent=2)
+
+            # Also save responses data for easy analysis
+            responses_filename = os.path.join(logs_dir, f"responses_{participant_id}_{timestamp}.csv")
+            if state.responses:
+                import pandas as pd
+                df = pd.DataFrame(self.response_rows())
+                df.to_csv(responses_filename, index=False)
+
+        if export_format in ("columnar", "both"):
+            from columnar_export import export_session
+            events_path, responses_path = export_session(
+                list(state.event_log), self.response_rows(), participant_id, timestamp, logs_dir
+            )
+            filename = filename or events_path
+            responses_filename = responses_filename or responses_path
+
+        if self.store_completed_session((filename, responses_filename)) and state.stage == "completed":
+            # Everything is in the log files and the store now; the spill files are no longer needed
+            self.remove_spill_files()
+        return filename, responses_filename
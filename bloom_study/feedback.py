@@ -0,0 +1,47 @@
+"""
+AI feedback text, error handling and feedback backends.
+
+A feedback backend is a callable
+    backend(question, paragraph_content, feedback_type) -> (bloom_level, suggested_question)
+bloom_study.chains provides the LangChain/OpenAI backend; StaticFeedbackBackend answers
+without any API calls (optionally after a fixed delay standing in for the
+LLM latency) so the engine can run offline for simulations, benchmarks and
+load tests.
+"""
+
+from bloom_study.clock import RealClock
+
+class FeedbackUnavailable(Exception):
+    """Raised by a backend that cannot produce feedback; the message is shown instead"""
+
+def format_feedback(bloom_level, suggested_question):
+    """The feedback text shown to participants"""
+    return f"'{bloom_level}' 수준의 질문을 작성하셨군요.\n'{suggested_question}'와 같은 질문으로 수정하는 것은 어떨까요?"
+
+def handle_api_error(error, feedback_type):
+    """Centralized API error handling"""
+    error_msg = str(error)
+    if "insufficient_quota" in error_msg or "quota" in error_msg.lower():
+        return "OpenAI API quota exceeded. Using mock response: '기억' 수준의 질문을 작성하셨군요.\n'이 내용을 바탕으로 새로운 아이디어를 제안해보세요?'와 같은 질문으로 수정하는 것은 어떨까요?"
+    else:
+        return f"Error generating AI feedback: {error_msg}"
+
+class StaticFeedbackBackend:
+    """Deterministic backend without any LLM calls"""
+
+    def __init__(self, bloom_level="이해", latency=0.0, clock=None):
+        self.bloom_level = bloom_level
+        self.latency = latency
+        self.clock = clock or RealClock()
+        self.calls = 0
+
+    def __call__(self, question, paragraph_content, feedback_type):
+        self.calls += 1
+        if self.latency:
+            self.clock.sleep(self.latency)
+        if feedback_type == "related":
+            key_concept = question.replace('?', '').split()[0] if question.split() else "이 개념"
+            suggested_question = f"{key_concept}을 바탕으로 새로운 연구 방향을 제안해볼 수 있을까?"
+        else:
+            suggested_question = "이 주제의 다른 측면을 새롭게 탐구할 수 있는 방법은 무엇일까?"
+        return self.bloom_level, suggested_question
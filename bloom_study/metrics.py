@@ -0,0 +1,72 @@
+"""
+Metrics computed for each suggested question (stored, not used for validation).
+"""
+
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def get_common_words():
+    """Precompute common word sets for validation"""
+    return {
+        '이', '그', '저', '것', '수', '있', '없', '는', '을', '를', '이', '가', '에', '의', '로', '으로', 
+        '와', '과', '어떤', '어떻게', '왜', '무엇', '언제', '어디서', '어떠한', '그런', '이런', '저런',
+        '하는', '되는', '있는', '없는', '같은', '다른', '새로운', '기존', '현재', '미래', '과거',
+        '대한', '위한', '통해', '따라', '관련', '문제', '방법', '방식', '경우', '상황', '조건',
+        '결과', '영향', '효과', '중요', '필요', '가능', '연구', '분석', '탐구', '제안', '개발',
+        '창조', '혁신', '아이디어', '해결', '답', '질문', '생각', '고려', '검토', '평가'
+    }
+
+@lru_cache(maxsize=1000)
+def get_content_words(text):
+    """Cache content word extraction"""
+    common_words = get_common_words()
+    words = set(text.replace('?', '').replace('.', '').replace(',', '').lower().split())
+    return words - common_words
+
+def calculate_question_metrics(original_question, suggested_question, paragraph, paragraph_words=None):
+    """Calculate relatedness and other metrics for storage without validation
+
+    paragraph_words: the paragraph's precomputed content words (Stimulus.content_words)
+    """
+    
+    # Calculate relatedness score
+    original_content = get_content_words(original_question)
+    suggested_content = get_content_words(suggested_question)
+    
+    if not original_content:
+        relatedness_score = 0.0
+    else:
+        # Calculate overlap ratios
+        overlap = len(original_content & suggested_content)
+        overlap_ratio = overlap / len(original_content)
+        
+        # Concept overlap check
+        concept_overlap = sum(1 for word in original_content if len(word) > 2 and word in suggested_question.lower())
+        concept_ratio = concept_overlap / len(original_content)
+        
+        relatedness_score = max(overlap_ratio, concept_ratio)
+    
+    # Calculate paragraph relevance
+    paragraph_content = paragraph_words if paragraph_words is not None else get_content_words(paragraph)
+    question_content = get_content_words(suggested_question)
+    
+    if not question_content:
+        paragraph_relevance = 0.0
+    else:
+        overlap = len(paragraph_content & question_content)
+        paragraph_relevance = overlap / len(question_content)
+    
+    # Calculate length
+    question_length = len(suggested_question)
+    
+    # Calculate word count
+    question_word_count = len(suggested_question.split())
+    
+    return {
+        'relatedness_score': round(relatedness_score, 3),
+        'paragraph_relevance': round(paragraph_relevance, 3),
+        'question_length': question_length,
+        'question_word_count': question_word_count,
+        'ends_with_question_mark': suggested_question.endswith('?'),
+        'is_empty': len(suggested_question.strip()) == 0
+    }
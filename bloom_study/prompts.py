@@ -0,0 +1,305 @@
+"""
+Prompts of the feedback chains: output schemas, few-shot examples and prompt templates.
+
+The templates are built once per process (lru_cache) and shared by every
+chain call; bloom_study.chains pairs them with a chat model.
+"""
+
+from functools import lru_cache
+
+from langchain.output_parsers import PydanticOutputParser
+from langchain.prompts import FewShotPromptTemplate, PromptTemplate
+from langchain.prompts.example_selector import LengthBasedExampleSelector
+from pydantic import BaseModel, Field
+
+# Pydantic models for structured output
+class BloomClassification(BaseModel):
+    bloom_level: str = Field(description="The Bloom's taxonomy level: 기억, 이해, 적용, 분석, 평가, or 창조")
+
+class QuestionSuggestion(BaseModel):
+    suggested_question: str = Field(description="A single suggested question in Korean ending with a question mark")
+
+# Few-shot examples for Bloom's taxonomy classification
+BLOOM_CLASSIFICATION_EXAMPLES = [
+    {
+        "paragraph": "8세기 후반 바그다드에는 '지혜의 집(Bayt al-Hikma)'이라는 지식 집약 기관이 설립되어, 고대 그리스의 철학과 자연과학 문헌을 아랍어로 번역하는 대규모 작업이 이루어졌다. 이 번역은 단순히 언어를 바꾸는 것이 아니라, 플라톤, 아리스토텔레스, 히포크라테스 등의 사상을 해석하고 보완하며 새로운 학문 체계를 세우는 과정이었다.",
+        "question": "지혜의 집은 언제 설립되었을까?",
+        "bloom_level": "기억"
+    },
+    {
+        "paragraph": "현대 도시계획에서 녹지 공간의 중요성이 대두되고 있다. 녹지는 대기 정화, 온도 조절, 시민의 정신 건강 향상 등 다양한 기능을 수행한다. 특히 팬데믹 이후 야외 활동 공간에 대한 수요가 급증하면서, 도시 내 공원과 정원의 역할이 재조명받고 있다.",
+        "question": "녹지 공간이 시민들에게 제공하는 주요 혜택들은 무엇일까?",
+        "bloom_level": "이해"
+    },
+    {
+        "paragraph": "예측 처리 이론(predictive processing theory)은 인간의 뇌가 외부 자극을 받아들이기만 하는 수동적 기관이 아니라, 끊임없이 미래의 감각 정보를 예측하고 그 예측이 실제 감각 정보와 얼마나 일치하는지를 비교하면서 작동한다고 설명한다. 즉, 뇌는 예상과 다른 정보가 들어올 때 그 오류를 수정해나가는 방식으로 작동한다. 예측이 잘 맞으면 뇌의 에너지 사용은 줄어들고, 오류가 있으면 더 많은 자원이 동원되어 환경에 대한 새로운 모델을 학습하게 된다. 이 이론은 '정보가 입력되고 처리된다'는 고전적 인지 이론과 달리, 뇌가 능동적으로 세계를 구성한다는 관점의 전환을 보여준다. 또한, 주의, 정서, 자아감 형성과 같은 복잡한 심리 현상까지 설명할 수 있는 인지 모델을 제공한다.",
+        "question": "뇌가 예측을 통해 감각 정보를 처리한다는 주장을 시각 경험을 예로 들면 어떻게 설명할 수 있을까?",
+        "bloom_level": "적용"
+    },
+    {
+        "paragraph": "최근 연구에 따르면, 나뭇잎소리, 새소리, 물소리와 같은 자연의 소리를 듣는 것만으로도 스트레스 수치가 낮아지고 집중력이 향상될 수 있다고 한다. 실험 참가자들이 인공적인 도시 소음과 자연의 소리를 각각 들었을 때, 자연의 소리를 들은 그룹은 심박수와 코르티솔 수치가 낮아졌고, 주의 전환 속도와 기억력에서 더 높은 성과를 보였다. 연구자들은 자연의 소리가 뇌의 주의 회복 시스템을 자극해, 과도한 정보 처리에서 벗어나게 돕는다고 설명한다. 이는 단순히 조용한 환경이 주는 효과가 아니라, 자연 특유의 리듬과 패턴이 신경계에 긍정적 영향을 주기 때문으로 보인다. 이러한 연구 결과는 일상생활에서 자연 소리를 의도적으로 접하는 것이 정신 건강 증진에 실질적인 도움이 될 수 있음을 시사한다.",
+        "question": "자연의 소리와 인공적인 소음 간에 존재하는 차이 중 어떤 요소가 스트레스 수치 또는 집중력 등과 관련이 있는 것일까?",
+        "bloom_level": "분석"
+    },
+    {
+        "paragraph": "텍스트 외 존재론(Ontology Outside of Text)은 해체주의 이후의 철학과 문학이론에서 등장한 개념으로, 언어 바깥의 세계와 경험을 이해하려는 시도를 말한다. 기존의 문학 이론은 주로 언어, 기호, 담론을 통해 인간의 현실을 해석했지만, 이 이론은 그것만으로는 설명되지 않는 실제 삶의 층위를 강조한다. 데리다의 해체론이 모든 의미는 언어 안에서 차이와 지연으로 구성된다고 본 반면, 텍스트 외 존재론은 언어로 포착되지 않는 감각, 몸, 침묵 같은 요소들에도 주목한다. 이 관점은 예술이나 문학에서 말로 설명되지 않는 감정이나 경험을 이해하는 데 도움을 준다. 결국 텍스트 외 존재론은 언어 중심의 사고에서 벗어나 인간 존재에 대한 보다 폭넓은 이해를 추구한다.",
+        "question": "언어 중심의 해석 방법과 비교할 때 이론적으로 어떤 한계가 있을까?",
+        "bloom_level": "평가"
+    },
+    {
+        "paragraph": "기억의 장소(sites of memory)는 공동체의 역사적 경험이나 정체성이 구체적인 지리적 공간에 응축되어 저장된 장소를 의미하며, 예술은 이를 서사적으로 재구성하는 중요한 매체로 작동한다. 특히 역사적 트라우마와 같은 복잡한 주제들을 다루는 예술 작품은 과거의 사건을 현재의 감각과 윤리 속으로 불러오는 적극적인 재구성 작업을 수행한다. 예술적 재현은 공식 기록으로 남지 않은 기억의 공백을 채우고, 소외된 기억들을 복원함으로써 개인의 기억과 집단적 기억 사이의 경계를 흐리게 만든다. 이러한 작업은 관람자가 기억의 참여자이자 해석자로 전환되도록 유도한다. 이처럼 예술은 단순한 표현 수단을 넘어, 기억의 정치성과 윤리성, 사회적 기억의 구성 방식을 비판적으로 탐구하는 도구로 기능한다.",
+        "question": "기억의 예술적 재현은 역사적 사실 검증과 어떤 측면에서 긴장 관계를 맺을 수 있을까?",
+        "bloom_level": "창조"
+    },
+    {
+        "paragraph": "코그니타리아트는 후기 자본주의 체제에서 인지, 정동, 창의성을 중심 자산으로 동원당하는 신(新)노동계급을 지칭하는 개념이다. 이들은 비물질적 노동의 수행 주체로서, 디지털 네트워크에 매개된 작업 환경 속에서 자기표현과 성과 창출의 무한한 자기책임성을 강요받는다. '자유로운 창조자'라는 표상 이면에는 플랫폼 자본주의가 조장한 노동의 유연화와 생계의 불확실성이 구조적으로 깊게 내재되어 있다. 이로써 코그니타리아트는 근대적 프롤레타리아트와 달리, 신자유주의적 자아 기술을 통해 자기 착취에 스스로를 능동적으로 동원하게 되는 존재로 전락한다. 이 개념은 노동의 본질이 물질에서 정보로 이행함에 따라, 권력과 저항의 지형 또한 근본적으로 재편되고 있음을 날카롭게 시사한다.",
+        "question": "코그니타리아트가 겪는 자기 착취 문제를 줄이기 위한 새로운 노동 구조나 제도는 어떻게 설계할 수 있을까?",
+        "bloom_level": "창조"
+    }
+]
+
+# Few-shot examples for related question generation
+RELATED_QUESTION_EXAMPLES = [
+    {
+        "paragraph": "'미토포에시스(Mythopoeia)'는 단순히 기존 신화를 분석하는 데 그치지 않고, 작가가 자신만의 신화 체계를 창조하는 창작 행위를 의미한다. 이 개념은 특히 C.S. 루이스의 『나니아 연대기』에서 잘 드러나며, 그는 고유한 존재들, 종교적 상징, 윤리적 질서를 나니아라는 유기적 세계로 구성하였다.. 그의 작업은 단순한 판타지를 넘어서, 선과 악의 대립 같은 신화적 주제를 통해 인간 존재의 의미를 탐구하려는 시도였다. 이러한 미토포에시스는 고대 문명처럼 상징과 서사를 통해 세계를 설명하려는 인간의 본능과도 관련이 깊다. 현대의 문학 작품, 판타지 게임, 영화 시나리오에서도 미토포에시스는 중요한 내러티브 기법으로 활용되며, 이는 신화가 여전히 살아 있는 사유 방식임을 보여준다.",
+        "user_question": "루이스는 왜 자신만의 신화를 창조하고자 했을까?",
+        "suggested_question": "루이스의 신화 창작 방식에서 영감을 받아, 오늘날 우리 사회를 반영한 새로운 신화 체계를 구상하려면 어떤 세계관과 주제를 탐색해볼 수 있을까?"
+    },
+    {
+        "paragraph": "리퀴드 모더니티(liquid modernity)는 지그문트 바우만이 제시한 개념으로, 현대 사회의 유동성과 불확실성을 설명한다. 고체적 근대가 견고한 제도와 안정된 정체성을 기반으로 했다면, 리퀴드 모더니티는 관계, 노동, 소비 방식 모두가 유동적이며 일시적인 특성을 띤다. 리퀴드 모더니티를 보이는 사회는 개인에게 유연성과 선택의 자유를 제공하지만, 동시에 지속적인 자기 재구성과 정체성의 불안을 초래한다. 이 개념은 글로벌화, 디지털화, 개인화가 지배적인 시대에서 사회적 연대와 소속감의 해체를 분석하는 데 효과적으로 활용될 수 있다. 따라서 리퀴드 모더니티는 현대인의 삶의 조건을 해석하고 사회 정책의 방향을 모색하는 데 중요한 이론적 틀을 제공한다.",
+        "user_question": "고체 근대와 리퀴드 모더니티의 차이는 무엇일까?",
+        "suggested_question": "고체 근대와 리퀴드 모더니티의 정체성 형성 방식 차이를 바탕으로, 디지털 플랫폼에서의 자기 표현은 어떤 새로운 윤리적 쟁점을 낳을 수 있을까?"
+    },
+    {
+        "paragraph": "예측 처리 이론(predictive processing theory)은 인간의 뇌가 외부 자극을 받아들이기만 하는 수동적 기관이 아니라, 끊임없이 미래의 감각 정보를 예측하고 그 예측이 실제 감각 정보와 얼마나 일치하는지를 비교하면서 작동한다고 설명한다. 즉, 뇌는 예상과 다른 정보가 들어올 때 그 오류를 수정해나가는 방식으로 작동한다. 예측이 잘 맞으면 뇌의 에너지 사용은 줄어들고, 오류가 있으면 더 많은 자원이 동원되어 환경에 대한 새로운 모델을 학습하게 된다. 이 이론은 '정보가 입력되고 처리된다'는 고전적 인지 이론과 달리, 뇌가 능동적으로 세계를 구성한다는 관점의 전환을 보여준다. 또한, 주의, 정서, 자아감 형성과 같은 복잡한 심리 현상까지 설명할 수 있는 인지 모델을 제공한다.",
+        "user_question": "뇌가 예측을 통해 감각 정보를 처리한다는 주장을 시각 경험을 예로 들면 어떻게 설명할 수 있을까?",
+        "suggested_question": "시각 경험을 예로 들 때, 정서 상태가 뇌의 예측에 어떤 영향을 주는지를 알아보는 실험을 기획한다면 어떤 요소를 포함해야 할까?"
+    },
+    {
+        "paragraph": "유전자 가위 기술, 예를 들어 CRISPR-Cas9 시스템은 특정 DNA 염기서열을 정밀하게 절단하고 편집할 수 있게 하여 생명과학 연구에 혁신을 가져왔다. 이 기술은 바이러스에 대항하는 박테리아의 면역 체계에서 유래되었으며, 연구자들은 이를 활용해 유전병 치료, 작물 개량, 생물 다양성 보존 등 다양한 분야에 적용하고 있다. 유전자 가위 기술은 기존의 유전자 조작 기술보다 훨씬 간편하고 저렴하며, 편집의 정밀도가 높아 다양한 생물학적 연구에 핵심 도구로 자리잡고 있다. 하지만 생식세포 유전자 편집과 관련된 윤리적 논쟁, 생태계에 미치는 영향 등에 대해서는 여전히 활발한 논의가 진행 중이다. CRISPR는 생명과 기술, 윤리가 얽힌 복합적 문제들을 우리에게 제기한다.",
+        "user_question": "생태계의 균형을 고려하여 CRISPR 기술의 응용을 조절할 수 있는 정책 방안을 고안해본다면 어떤 요소를 고려해야 할까?",
+        "suggested_question": "유전자 편집 기술이 생태계에 미치는 영향을 사전에 평가하기 위한 과학적 기준이나 윤리적 기준은 어떤 방식으로 마련될 수 있을까?"
+    },
+    {
+        "paragraph": "자기치유 콘크리트(self-healing concrete)는 콘크리트 구조물에 균열이 발생하더라도 내부의 복원 메커니즘이 작동하여 스스로 파손 부위를 복구할 수 있도록 설계된 지능형 건축 자재다. 이 기술은 박테리아가 석회석을 생성하거나, 고분자 캡슐이 외부 자극에 반응해 복합 물질을 분출하는 등의 원리를 활용하여, 수분과 공기 침투를 막고 구조적 안정성을 연장시키는 방식으로 작동한다. 자기치유 콘크리트는 유지보수 주기를 줄이고 인프라의 전체 수명을 늘리는 데 기여하지만, 초기 제조 비용 증가, 성능의 일관성 확보 문제 등의 한계 역시 존재한다. 특히 극한 온도와 습도, 반복 진동 등 특수한 조건에서도 일관된 치유 성능을 발휘할 때, 지속가능한 도시 인프라를 구현하는 데 기여할 수 있다.",
+        "user_question": "자기치유 기술을 다리나 터널 등에 적용하려면 어떤 조건을 고려해야 할까?",
+        "suggested_question": "지진, 중차량 통행, 습기 변화가 잦은 지역의 다리에 적용할 자기치유 구조 시스템을 창안해본다면 어떤 방식으로 치유 메커니즘을 조정해야 할까?"
+    },
+    {
+        "paragraph": "기억의 장소(sites of memory)는 공동체의 역사적 경험이나 정체성이 구체적인 지리적 공간에 응축되어 저장된 장소를 의미하며, 예술은 이를 서사적으로 재구성하는 중요한 매체로 작동한다. 특히 역사적 트라우마와 같은 복잡한 주제들을 다루는 예술 작품은 과거의 사건을 현재의 감각과 윤리 속으로 불러오는 적극적인 재구성 작업을 수행한다. 예술적 재현은 공식 기록으로 남지 않은 기억의 공백을 채우고, 소외된 기억들을 복원함으로써 개인의 기억과 집단적 기억 사이의 경계를 흐리게 만든다. 이러한 작업은 관람자가 기억의 참여자이자 해석자로 전환되도록 유도한다. 이처럼 예술은 단순한 표현 수단을 넘어, 기억의 정치성과 윤리성, 사회적 기억의 구성 방식을 비판적으로 탐구하는 도구로 기능한다.",
+        "user_question": "기억의 예술적 재현은 역사적 사실 검증과 어떤 측면에서 긴장 관계를 맺을 수 있을까?",
+        "suggested_question": "공식 역사와 충돌하는 사적인 기억을 바탕으로 다큐멘터리 연극이나 설치 작품을 구성할 때, 사실성과 허구성을 어떻게 조화시킬 수 있을까?"
+    }
+]
+
+# Few-shot examples for unrelated question generation
+UNRELATED_QUESTION_EXAMPLES = [
+    {
+        "paragraph": "'미토포에시스(Mythopoeia)'는 단순히 기존 신화를 분석하는 데 그치지 않고, 작가가 자신만의 신화 체계를 창조하는 창작 행위를 의미한다. 이 개념은 특히 C.S. 루이스의 『나니아 연대기』에서 잘 드러나며, 그는 고유한 존재들, 종교적 상징, 윤리적 질서를 나니아라는 유기적 세계로 구성하였다.. 그의 작업은 단순한 판타지를 넘어서, 선과 악의 대립 같은 신화적 주제를 통해 인간 존재의 의미를 탐구하려는 시도였다. 이러한 미토포에시스는 고대 문명처럼 상징과 서사를 통해 세계를 설명하려는 인간의 본능과도 관련이 깊다. 현대의 문학 작품, 판타지 게임, 영화 시나리오에서도 미토포에시스는 중요한 내러티브 기법으로 활용되며, 이는 신화가 여전히 살아 있는 사유 방식임을 보여준다.",
+        "user_question": "루이스는 왜 자신만의 신화를 창조하고자 했을까?",
+        "suggested_question": "고대 문명이 신화를 통해 세계를 설명했던 방식은 현대 사회의 어떤 문제들을 새로운 서사로 다시 말하는 데 어떻게 활용될 수 있을까?"
+    },
+    {
+        "paragraph": "리퀴드 모더니티(liquid modernity)는 지그문트 바우만이 제시한 개념으로, 현대 사회의 유동성과 불확실성을 설명한다. 고체적 근대가 견고한 제도와 안정된 정체성을 기반으로 했다면, 리퀴드 모더니티는 관계, 노동, 소비 방식 모두가 유동적이며 일시적인 특성을 띤다. 리퀴드 모더니티를 보이는 사회는 개인에게 유연성과 선택의 자유를 제공하지만, 동시에 지속적인 자기 재구성과 정체성의 불안을 초래한다. 이 개념은 글로벌화, 디지털화, 개인화가 지배적인 시대에서 사회적 연대와 소속감의 해체를 분석하는 데 효과적으로 활용될 수 있다. 따라서 리퀴드 모더니티는 현대인의 삶의 조건을 해석하고 사회 정책의 방향을 모색하는 데 중요한 이론적 틀을 제공한다.",
+        "user_question": "고체 근대와 리퀴드 모더니티의 차이는 무엇일까?",
+        "suggested_question": "리퀴드 모더니티가 지배하는 사회에서 '소속감'의 개념을 새롭게 정의하고 이를 측정하는 방법을 고안한다면 어떤 기준이 필요할까?"
+    },
+    {
+        "paragraph": "예측 처리 이론(predictive processing theory)은 인간의 뇌가 외부 자극을 받아들이기만 하는 수동적 기관이 아니라, 끊임없이 미래의 감각 정보를 예측하고 그 예측이 실제 감각 정보와 얼마나 일치하는지를 비교하면서 작동한다고 설명한다. 즉, 뇌는 예상과 다른 정보가 들어올 때 그 오류를 수정해나가는 방식으로 작동한다. 예측이 잘 맞으면 뇌의 에너지 사용은 줄어들고, 오류가 있으면 더 많은 자원이 동원되어 환경에 대한 새로운 모델을 학습하게 된다. 이 이론은 '정보가 입력되고 처리된다'는 고전적 인지 이론과 달리, 뇌가 능동적으로 세계를 구성한다는 관점의 전환을 보여준다. 또한, 주의, 정서, 자아감 형성과 같은 복잡한 심리 현상까지 설명할 수 있는 인지 모델을 제공한다.",
+        "user_question": "뇌가 예측을 통해 감각 정보를 처리한다는 주장을 시각 경험을 예로 들면 어떻게 설명할 수 있을까?",
+        "suggested_question": "뇌가 반복적으로 예측에 실패할 때, 외부 세계에 대한 인식은 어떻게 변할 수 있는지 시뮬레이션 실험을 설계해볼 수 있을까?"
+    },
+    {
+        "paragraph": "유전자 가위 기술, 예를 들어 CRISPR-Cas9 시스템은 특정 DNA 염기서열을 정밀하게 절단하고 편집할 수 있게 하여 생명과학 연구에 혁신을 가져왔다. 이 기술은 바이러스에 대항하는 박테리아의 면역 체계에서 유래되었으며, 연구자들은 이를 활용해 유전병 치료, 작물 개량, 생물 다양성 보존 등 다양한 분야에 적용하고 있다. 유전자 가위 기술은 기존의 유전자 조작 기술보다 훨씬 간편하고 저렴하며, 편집의 정밀도가 높아 다양한 생물학적 연구에 핵심 도구로 자리잡고 있다. 하지만 생식세포 유전자 편집과 관련된 윤리적 논쟁, 생태계에 미치는 영향 등에 대해서는 여전히 활발한 논의가 진행 중이다. CRISPR는 생명과 기술, 윤리가 얽힌 복합적 문제들을 우리에게 제기한다.",
+        "user_question": "생태계의 균형을 고려하여 CRISPR 기술의 응용을 조절할 수 있는 정책 방안을 고안해본다면 어떤 요소를 고려해야 할까?",
+        "suggested_question": "다양한 유전자 가위 기술 중에서 특정 목적(예: 작물 개량 vs. 유전병 치료)에 더 적합한 기술은 어떤 기준으로 선택할 수 있을까?"
+    },
+    {
+        "paragraph": "자기치유 콘크리트(self-healing concrete)는 콘크리트 구조물에 균열이 발생하더라도 내부의 복원 메커니즘이 작동하여 스스로 파손 부위를 복구할 수 있도록 설계된 지능형 건축 자재다. 이 기술은 박테리아가 석회석을 생성하거나, 고분자 캡슐이 외부 자극에 반응해 복합 물질을 분출하는 등의 원리를 활용하여, 수분과 공기 침투를 막고 구조적 안정성을 연장시키는 방식으로 작동한다. 자기치유 콘크리트는 유지보수 주기를 줄이고 인프라의 전체 수명을 늘리는 데 기여하지만, 초기 제조 비용 증가, 성능의 일관성 확보 문제 등의 한계 역시 존재한다. 특히 극한 온도와 습도, 반복 진동 등 특수한 조건에서도 일관된 치유 성능을 발휘할 때, 지속가능한 도시 인프라를 구현하는 데 기여할 수 있다.",
+        "user_question": "자기치유 기술을 다리나 터널 등에 적용하려면 어떤 조건을 고려해야 할까?",
+        "suggested_question": "수분과 공기의 침투를 최소화할 수 있는 새로운 형태의 자기치유 콘크리트를 설계한다면, 어떤 복합 재료와 메커니즘을 조합할 수 있을까?"
+    },
+    {
+        "paragraph": "기억의 장소(sites of memory)는 공동체의 역사적 경험이나 정체성이 구체적인 지리적 공간에 응축되어 저장된 장소를 의미하며, 예술은 이를 서사적으로 재구성하는 중요한 매체로 작동한다. 특히 역사적 트라우마와 같은 복잡한 주제들을 다루는 예술 작품은 과거의 사건을 현재의 감각과 윤리 속으로 불러오는 적극적인 재구성 작업을 수행한다. 예술적 재현은 공식 기록으로 남지 않은 기억의 공백을 채우고, 소외된 기억들을 복원함으로써 개인의 기억과 집단적 기억 사이의 경계를 흐리게 만든다. 이러한 작업은 관람자가 기억의 참여자이자 해석자로 전환되도록 유도한다. 이처럼 예술은 단순한 표현 수단을 넘어, 기억의 정치성과 윤리성, 사회적 기억의 구성 방식을 비판적으로 탐구하는 도구로 기능한다.",
+        "user_question": "기억의 예술적 재현은 역사적 사실 검증과 어떤 측면에서 긴장 관계를 맺을 수 있을까?",
+        "suggested_question": "'기억의 장소' 개념을 물리적 장소가 아닌 '심리적 상태'로 해석한다면, 예술 작품은 어떤 식으로 트라우마를 재구성할 수 있을까?"
+    }
+]
+
+@lru_cache(maxsize=None)
+def bloom_classification_prompt():
+    """Few-shot prompt and output parser for the Bloom's taxonomy classification"""
+    
+    # Create output parser
+    parser = PydanticOutputParser(pydantic_object=BloomClassification)
+    
+    # Create example selector for few-shot prompting
+    example_selector = LengthBasedExampleSelector(
+        examples=BLOOM_CLASSIFICATION_EXAMPLES,
+        example_prompt=PromptTemplate(
+            input_variables=["paragraph", "question", "bloom_level"],
+            template="Paragraph: {paragraph}\nQuestion: {question}\nBloom Level: {bloom_level}"
+        ),
+        max_length=2000,
+    )
+    
+    # Create few-shot prompt template
+    few_shot_prompt = FewShotPromptTemplate(
+        example_selector=example_selector,
+        example_prompt=PromptTemplate(
+            input_variables=["paragraph", "question", "bloom_level"],
+            template="Paragraph: {paragraph}\nQuestion: {question}\nBloom Level: {bloom_level}"
+        ),
+        prefix="""다음은 Bloom's Taxonomy를 사용하여 질문을 분류하는 예시들입니다:
+
+Bloom's Taxonomy 6단계:
+1. 기억: 텍스트 내용을 기억하기 위한 질문 
+2. 이해: 텍스트 내용을 바탕으로 대답할 수 있는 질문; 사실이나 이해, 정의에 대한 질문
+3. 적용: 텍스트에 대해 추가적인 내용을 질문하거나 (방법, 선행문헌 등) 비슷하지만 다른 상황에 적용하는 질문
+4. 분석: 텍스트의 내용 요소 간 연결 관계, 인과 관계 등을 묻는 질문, 텍스트 및 저자들의 의도를 묻는 질문
+5. 평가: (배경지식을 활용하여) 텍스트에 대한 판단 및 비평을 제안하는 질문
+6. 창조: 창의적인 연구 가설 또는 연구를 할 수 있는 새로운 방향을 제안하는 질문
+
+예시들:""",
+        suffix="""이제 다음 질문을 분류해주세요.
+
+Paragraph: {paragraph}
+Question: {question}
+
+{format_instructions}
+
+분류 결과:""",
+        input_variables=["paragraph", "question"],
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+
+    return few_shot_prompt, parser
+
+@lru_cache(maxsize=None)
+def related_question_prompt():
+    """Few-shot prompt and output parser for related question suggestions"""
+    
+    # Create output parser
+    parser = PydanticOutputParser(pydantic_object=QuestionSuggestion)
+    
+    example_selector = LengthBasedExampleSelector(
+        examples=RELATED_QUESTION_EXAMPLES,
+        example_prompt=PromptTemplate(
+            input_variables=["paragraph", "user_question", "suggested_question"],
+            template="Paragraph: {paragraph}\nUser Question: {user_question}\nSuggested Question: {suggested_question}"
+        ),
+        max_length=1500,
+    )
+    
+    few_shot_prompt = FewShotPromptTemplate(
+        example_selector=example_selector,
+        example_prompt=PromptTemplate(
+            input_variables=["paragraph", "user_question", "suggested_question"],
+            template="Paragraph: {paragraph}\nUser Question: {user_question}\nSuggested Question: {suggested_question}"
+        ),
+        prefix="""다음은 사용자의 질문 요소를 활용해 '창조' 수준의 질문을 제안하는 예시들입니다:
+
+중요 지침: 
+- 반드시 사용자의 원래 질문에서 핵심 단어나 개념을 포함해야 합니다
+- 사용자 질문을 확장하고 발전시키는 방향으로 작성하세요
+- 완전히 새로운 주제로 바꾸지 마세요
+- 사용자의 관심사와 접근법을 더 깊이 탐구하세요
+
+예시들:""",
+        suffix="""이제 다음 조건을 반드시 *모두* 따라 새로운 질문을 하나만 제안해주세요:
+
+핵심 원칙: 학습자의 기존 질문을 발전시키고 확장하는 방향으로 질문을 구성하세요.
+
+조건:
+1. 학습자가 기존에 제시한 질문(question)의 핵심 키워드와 주제를 반드시 포함해야 함
+2. 기존 질문에서 제기한 관점이나 접근법을 더 깊이 있게 탐구하는 방향
+3. 기존 질문 + paragraph의 새로운 내용을 결합하여 확장된 질문 구성
+4. Bloom's taxonomy에서 '창조' 수준의 질문 (새롭고 창의적인 연구 문제를 제안)
+5. 대학교 학부생 수준에서 이해 가능해야 함
+6. 질문은 한국어로 한 문장이어야 함 (글자수 65-75자)
+7. 물음표로 끝나야 함
+
+금지사항:
+- 기존 질문과 완전히 다른 주제로 바꾸는 것
+- 기존 질문의 핵심 개념을 무시하는 것
+- 기존 질문보다 단순한 수준의 질문
+
+중요: 학습자의 원래 질문 "{question}"의 핵심 요소를 반드시 포함하고 발전시켜야 합니다.
+
+Paragraph: {paragraph}
+User Question: {question}
+
+{format_instructions}
+
+새로운 질문 (기존 질문을 발전시킨 버전):""",
+        input_variables=["paragraph", "question"],
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+
+    return few_shot_prompt, parser
+
+@lru_cache(maxsize=None)
+def unrelated_question_prompt():
+    """Few-shot prompt and output parser for unrelated question suggestions"""
+    
+    # Create output parser
+    parser = PydanticOutputParser(pydantic_object=QuestionSuggestion)
+    
+    example_selector = LengthBasedExampleSelector(
+        examples=UNRELATED_QUESTION_EXAMPLES,
+        example_prompt=PromptTemplate(
+            input_variables=["paragraph", "user_question", "suggested_question"],
+            template="Paragraph: {paragraph}\nUser Question: {user_question}\nSuggested Question: {suggested_question}"
+        ),
+        max_length=1500,
+    )
+    
+    few_shot_prompt = FewShotPromptTemplate(
+        example_selector=example_selector,
+        example_prompt=PromptTemplate(
+            input_variables=["paragraph", "user_question", "suggested_question"],
+            template="Paragraph: {paragraph}\nUser Question: {user_question}\nSuggested Question: {suggested_question}"
+        ),
+        prefix="""다음은 사용자의 질문과 무관하게 paragraph만을 기반으로 '창조' 수준의 질문을 제안하는 예시들입니다:
+
+중요 지침:
+- 사용자의 원래 질문에서 사용된 단어나 개념을 절대 사용하지 마세요
+- 사용자 질문과는 완전히 다른 각도에서 접근하세요
+- 사용자 질문을 발전시키거나 확장하지 마세요
+- paragraph의 다른 측면이나 요소에 집중하세요
+
+예시들:""",
+        suffix="""이제 다음 조건을 반드시 *모두* 따라 새로운 질문을 하나만 제안해주세요:
+
+핵심 원칙: 제시된 Paragraph 내에서, 학습자의 기존 질문과는 완전히 다른 관점을 탐구하는 질문을 구성하세요.
+
+조건:
+1. 반드시 제시된 Paragraph의 내용과 직접 관련된 질문이어야 함
+2. 학습자가 기존에 제시한 질문(question)의 키워드, 주제, 접근법을 일절 사용하지 말 것
+3. Paragraph에서 기존 질문이 다루지 않은 완전히 다른 측면이나 요소를 선택
+4. 같은 텍스트 내의 다른 개념, 인물, 시대, 방법론, 분야 등에 집중
+5. Bloom's taxonomy에서 '창조' 수준의 질문 (새롭고 창의적인 연구 문제를 제안)
+6. 대학교 학부생 수준에서 이해 가능해야 함
+7. 질문은 한국어로 한 문장이어야 함 (글자수 65-75자)
+8. 물음표로 끝나야 함
+
+금지사항:
+- Paragraph 범위를 벗어나 완전히 다른 주제로 가는 것
+- 기존 질문에서 언급된 개념이나 단어 재사용
+- Paragraph에 없는 내용을 추가하는 것
+
+전략: Paragraph를 다시 읽고, 사용자가 주목하지 않은 다른 요소(인물, 시대적 배경, 다른 개념, 응용 분야, 사회적 함의 등)를 찾아 질문하세요.
+
+중요: 학습자의 원래 질문 "{question}"과는 완전히 무관하지만, Paragraph 내용에는 반드시 기반해야 합니다.
+
+Paragraph: {paragraph}
+User Question: {question}
+
+{format_instructions}
+
+새로운 질문 (기존 질문과 무관한 새로운 관점):""",
+        input_variables=["paragraph", "question"],
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+
+    return few_shot_prompt, parser
@@ -0,0 +1,212 @@
+"""
+Stimulus set: the paragraphs of stimuli.json, indexed once per version.
+
+stimuli.json holds every paragraph with its index, genre, text and role
+(experiment, practice or excluded). The file is read, hashed (sha256) and
+turned into an immutable StimulusSet: slotted Stimulus records with the
+content word set, token count and keyphrases precomputed, plus the genre
+ranges and the practice, excluded and experiment indices.
+The set is version-stamped by the file's content hash.
+
+Hot reload: get_stimulus_set() checks the file's modification time at most
+every RELOAD_CHECK_SECONDS. When the content hash changed, the new file is
+validated and swapped in; an invalid file is reported and the current set
+kept. Caches derived from the set are keyed on its content hash, so they
+never mix versions. Running sessions are unaffected: they keep the
+paragraph lists they were given at the start of the practice and main
+trials, and a new version only applies to sessions starting them later.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from bloom_study.metrics import get_common_words, get_content_words
+
+# Stimulus file (default: stimuli.json in the repository root)
+STIMULUS_FILE = os.getenv("STIMULUS_FILE") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "stimuli.json"
+)
+
+# Seconds between checks of the stimulus file for changes (0 = check on every use)
+RELOAD_CHECK_SECONDS = float(os.getenv("STIMULUS_RELOAD_SECONDS", "2"))
+
+ROLES = ("experiment", "practice", "excluded")
+
+KEYPHRASE_COUNT = 5
+
+# Particles stripped from the end of a word before counting keyphrases (longest first)
+PARTICLES = ("에서는", "으로서", "에서", "으로", "에게", "이다", "하는", "은", "는", "이", "가", "을", "를",
+             "의", "에", "로", "와", "과", "도", "적")
+
+# Endings of verbs and adjectives, which are not keyphrases
+PREDICATE_ENDINGS = ("다", "는", "한", "어", "고", "며", "면", "게", "지", "던")
+
+@dataclass(frozen=True, slots=True)
+class Stimulus:
+    """One paragraph of the stimulus set"""
+    index: int
+    genre: str
+    role: str
+    text: str
+    content_hash: str
+    content_words: frozenset
+    token_count: int
+    keyphrases: tuple
+
+    def as_dict(self):
+        """The paragraph dict ('index', 'content', 'genre') the engine and the logs use"""
+        return {'index': self.index, 'content': self.text, 'genre': self.genre}
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def extract_keyphrases(text, count=KEYPHRASE_COUNT):
+    """Terms glossed in parentheses, then the most frequent content word stems"""
+    phrases = [term.strip() for term in re.findall(r"\(([^()]{2,40})\)", text)]
+    common_words = get_common_words()
+    stems = []
+    for word in text.lower().split():
+        # A glossed term counts as the word before its parentheses
+        word = word.split("(")[0].strip("[]'\"“”‘’·.,?!")
+        for particle in PARTICLES:
+            if word.endswith(particle) and len(word) - len(particle) >= 2:
+                word = word[:-len(particle)]
+                break
+        if len(word) >= 2 and word not in common_words and not word.endswith(PREDICATE_ENDINGS):
+            stems.append(word)
+    # Ties keep the order of first appearance
+    for stem, _ in Counter(stems).most_common():
+        if len(phrases) >= count:
+            break
+        if stem not in phrases:
+            phrases.append(stem)
+    return tuple(phrases[:count])
+
+def build_stimulus(index, genre, role, text):
+    return Stimulus(
+        index=index,
+        genre=genre,
+        role=role,
+        text=text,
+        content_hash=content_hash(text),
+        content_words=frozenset(get_content_words(text)),
+        token_count=len(text.split()),
+        keyphrases=extract_keyphrases(text)
+    )
+
+# eq=False: compared and hashed by identity, and there is one object per content hash,
+# so caches keyed on a StimulusSet are keyed on its version
+@dataclass(frozen=True, slots=True, eq=False)
+class StimulusSet:
+    """One version of the stimulus file"""
+    path: str
+    content_hash: str
+    stimuli: tuple
+    genre_ranges: dict
+    practice_indices: tuple
+    excluded_indices: tuple
+    experiment_indices: tuple
+
+    @property
+    def genre_by_index(self):
+        return {stimulus.index: stimulus.genre for stimulus in self.stimuli}
+
+def read_stimulus_file(path):
+    """(content hash, raw bytes) of the file"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if not raw:
+        raise ValueError(f"{path} is empty")
+    return hashlib.sha256(raw).hexdigest()[:16], raw
+
+def parse_stimulus_set(path, digest, raw):
+    """Validate the file's paragraphs and build the StimulusSet"""
+    entries = json.loads(raw)["paragraphs"]
+    if [entry.get("index") for entry in entries] != list(range(len(entries))):
+        raise ValueError("paragraph indices must be 0, 1, 2, ... in file order")
+    stimuli = []
+    for entry in entries:
+        if entry.get("role") not in ROLES:
+            raise ValueError(f"paragraph {entry['index']}: role must be one of {', '.join(ROLES)}")
+        if not entry.get("genre") or not str(entry.get("text", "")).strip():
+            raise ValueError(f"paragraph {entry['index']}: genre and text are required")
+        stimuli.append(build_stimulus(entry["index"], entry["genre"], entry["role"], entry["text"]))
+
+    genre_ranges = {}
+    for stimulus in stimuli:
+        genre_ranges.setdefault(stimulus.genre, []).append(stimulus.index)
+    return StimulusSet(
+        path=path,
+        content_hash=digest,
+        stimuli=tuple(stimuli),
+        genre_ranges=genre_ranges,
+        practice_indices=tuple(s.index for s in stimuli if s.role == "practice"),
+        excluded_indices=tuple(s.index for s in stimuli if s.role == "excluded"),
+        experiment_indices=tuple(s.index for s in stimuli if s.role == "experiment")
+    )
+
+def load_stimulus_set(path=None):
+    path = path or STIMULUS_FILE
+    return parse_stimulus_set(path, *read_stimulus_file(path))
+
+_current = None
+_file_stamp = None
+_next_check = 0.0
+_reload_lock = threading.Lock()
+
+def reload_stimuli(force=False):
+    """Reload the stimulus file if it changed; returns the current set
+
+    A file that cannot be read or fails validation is reported and the set
+    in use is kept (the first load raises instead).
+    """
+    global _current, _file_stamp, _next_check
+    with _reload_lock:
+        _next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+        stamp = None
+        try:
+            stat = os.stat(STIMULUS_FILE)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if _current is not None and stamp == _file_stamp and not force:
+                return _current
+            digest, raw = read_stimulus_file(STIMULUS_FILE)
+            if _current is None or digest != _current.content_hash:
+                stimulus_set = parse_stimulus_set(STIMULUS_FILE, digest, raw)
+                if _current is not None:
+                    print(f"Stimuli reloaded: {STIMULUS_FILE} {_current.content_hash} -> {digest}")
+                _current = stimulus_set
+            _file_stamp = stamp
+        except Exception as e:
+            if _current is None:
+                raise
+            if stamp != _file_stamp:
+                # Reported once per change of the file
+                print(f"Stimulus reload failed, keeping {_current.content_hash}: {e}")
+            _file_stamp = stamp
+        return _current
+
+def get_stimulus_set():
+    """The current stimulus set, reloaded when the file has changed"""
+    if _current is None or time.monotonic() >= _next_check:
+        return reload_stimuli()
+    return _current
+
+def get_stimulus_index():
+    """All paragraphs as Stimulus records, position = paragraph index"""
+    return get_stimulus_set().stimuli
+
+def get_stimulus(index):
+    return get_stimulus_index()[index]
+
+def precomputed_content_words(index, text):
+    """Content words of paragraph `index`, if its current text is `text` (None otherwise)"""
+    stimuli = get_stimulus_index()
+    if 0 <= index < len(stimuli) and stimuli[index].text == text:
+        return stimuli[index].content_words
+    return None
@@ -0,0 +1,189 @@
+"""
+Compact trial records and the disk-spilled logs of a session.
+
+A finished trial is kept as a slotted TrialRecord that refers to its
+paragraph by index; the paragraph text is only joined back in when rows
+are written (TrialRecord.as_row), so the CSV columns stay as they were.
+
+SpillLog is the append-only list behind the event log and the trial logs.
+Without a spill file it is a plain in-memory list. With one, the engine
+calls spill() at the end of every trial: the entries so far are appended
+to the file as JSON lines and dropped from memory, so a session holds at
+most one trial's worth of entries however long it runs. Iterating reads
+the spilled entries back from the file, then the ones still in memory.
+Once the completed session is saved and stored, unspill() brings the
+entries back into memory and deletes the file.
+
+A session checkpoint stores each log as a snapshot: the spill file, the
+number of entries in it and the entries still in memory.
+"""
+
+import json
+import os
+import re
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+
+@dataclass(slots=True)
+class TrialRecord:
+    """One finished trial (row of the responses CSV without the paragraph text)"""
+    iteration: int
+    paragraph_index: int
+    paragraph_genre: str
+    feedback_type: str = 'unknown'
+    original_question: str = ''
+    question_input_interaction_time_seconds: float = None
+    feedback: str = ''
+    feedback_connection_reused: bool = None
+    curiosity: str = None
+    relatedness: str = None
+    accept_feedback: str = None
+    edited_question: str = ''
+    edit_textarea_interaction_time_seconds: float = None
+    timestamp: str = None
+    suggested_question_relatedness_score: float = None
+    suggested_question_paragraph_relevance: float = None
+    suggested_question_length: int = None
+    suggested_question_word_count: int = None
+    suggested_question_ends_with_question_mark: bool = None
+    suggested_question_is_empty: bool = None
+    # "<stage>_time_seconds" and the client render timings of the stages that were timed
+    stage_durations: dict = field(default_factory=dict)
+
+    def as_row(self, paragraph_text=None):
+        """The responses CSV row: the paragraph text after the iteration, stage durations last"""
+        row = {"iteration": self.iteration, "paragraph": paragraph_text}
+        for f in fields(self):
+            if f.name in ("iteration", "stage_durations"):
+                continue
+            row[f.name] = getattr(self, f.name)
+        row.update(self.stage_durations)
+        return row
+
+    def as_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+def spill_prefix(spill_dir, session_id):
+    """Path prefix of a session's spill files (unique even if two sessions get the same ID)"""
+    safe_id = re.sub(r"[^\w.-]", "_", str(session_id))
+    return os.path.join(spill_dir, f"{safe_id}_{uuid.uuid4().hex[:8]}")
+
+class SpillLog:
+    """Append-only list whose older entries can be moved to a JSON lines file"""
+
+    __slots__ = ("path", "spilled", "_tail")
+
+    def __init__(self, path=None):
+        self.path = path
+        self.spilled = 0
+        self._tail = []
+
+    def _encode(self, entry):
+        return entry
+
+    def _decode(self, data):
+        return data
+
+    def append(self, entry):
+        self._tail.append(entry)
+
+    def extend(self, entries):
+        self._tail.extend(entries)
+
+    def spill(self):
+        """Move the entries in memory to the spill file (no-op without one)"""
+        if self.path is None or not self._tail:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for entry in self._tail:
+                    f.write(json.dumps(self._encode(entry), ensure_ascii=False) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            # Keep everything in memory from here on rather than lose entries
+            print(f"Could not spill to {self.path}, keeping the log in memory: {e}")
+            self._tail = list(self)
+            self.path = None
+            self.spilled = 0
+            return
+        self.spilled += len(self._tail)
+        self._tail = []
+
+    def unspill(self):
+        """Read the spilled entries back into memory and delete the spill file"""
+        if self.path is None:
+            return
+        entries = list(self)
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not remove the spill file {self.path}: {e}")
+            return
+        self._tail = entries
+        self.path = None
+        self.spilled = 0
+
+    def __len__(self):
+        return self.spilled + len(self._tail)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        if self.spilled:
+            with open(self.path, encoding="utf-8") as f:
+                for _, line in zip(range(self.spilled), f):
+                    yield self._decode(json.loads(line))
+        yield from self._tail
+
+    def snapshot(self):
+        """JSON-ready state of the log for a session checkpoint"""
+        return {"path": os.path.abspath(self.path) if self.path else None, "spilled": self.spilled,
+                "tail": [self._encode(entry) for entry in self._tail]}
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """The log as it was at the checkpoint
+
+        Lines the file got after the checkpoint was saved are cut off, so
+        they are neither read nor followed by new entries.
+        """
+        log = cls(snapshot["path"])
+        log.spilled = snapshot["spilled"]
+        log._tail = [log._decode(data) for data in snapshot["tail"]]
+        if log.path is not None and (log.spilled or os.path.exists(log.path)):
+            with open(log.path, "r+b") as f:
+                for _ in range(log.spilled):
+                    if not f.readline():
+                        raise ValueError(f"{log.path} has fewer than {log.spilled} entries")
+                f.truncate(f.tell())
+        return log
+
+    def __getitem__(self, index):
+        # Slices of the entries still in memory (e.g. not yet stored events) never touch the file
+        if isinstance(index, slice) and index.step is None and (index.start or 0) >= self.spilled:
+            start = (index.start or 0) - self.spilled
+            stop = None if index.stop is None else max(index.stop - self.spilled, 0)
+            return self._tail[start:stop]
+        return list(self)[index]
+
+class TrialLog(SpillLog):
+    """The finished trials of one context (practice or main) as TrialRecords"""
+
+    __slots__ = ()
+
+    def _encode(self, record):
+        return record.as_dict()
+
+    def _decode(self, data):
+        return TrialRecord.from_dict(data)
+
+    def rows(self, paragraph_text):
+        """Responses CSV rows, with the text of each paragraph looked up by index"""
+        return [record.as_row(paragraph_text.get(record.paragraph_index)) for record in self]
@@ -0,0 +1,247 @@
+"""
+Columnar export of responses and event logs.
+
+ExperimentEngine.save_logs() in bloom_study/engine.py writes a pretty-printed
+JSON event log and a pandas CSV of responses. Both repeat the full paragraph
+text on every row and lose all numeric types on reload. This module writes
+the same data as typed Arrow tables instead:
+
+- Parquet (zstd) when pyarrow.parquet is available, otherwise Arrow IPC files.
+- Repeated strings (paragraph text, genre, stage, event name, ...) are
+  dictionary-encoded.
+- Timestamps are int64 nanoseconds since the epoch (`*_ns` columns).
+- Event `data` payloads vary per event, so they are kept as a JSON string.
+
+open_logs_dataset() opens every exported file in a logs/ directory as one
+lazily scanned pyarrow dataset, so a whole cohort can be filtered and
+projected without loading all sessions into memory.
+"""
+
+import glob
+import json
+import os
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+    ds = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+EVENT_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+RESPONSE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Response columns with low cardinality that are stored dictionary-encoded
+DICTIONARY_COLUMNS = {
+    "participant_id", "paragraph", "paragraph_genre", "feedback_type",
+    "accept_feedback", "stage", "event", "context"
+}
+
+# Response columns with a fixed type; anything else is inferred
+RESPONSE_COLUMN_TYPES = {
+    "iteration": "int32",
+    "paragraph_index": "int32",
+    "curiosity": "int8",
+    "relatedness": "int8",
+    "suggested_question_relatedness_score": "float64",
+    "suggested_question_paragraph_relevance": "float64",
+    "suggested_question_length": "int32",
+    "suggested_question_word_count": "int32",
+    "suggested_question_ends_with_question_mark": "bool",
+    "suggested_question_is_empty": "bool",
+    "feedback_connection_reused": "bool",
+}
+
+
+def columnar_available():
+    """True if pyarrow is installed"""
+    return pa is not None
+
+
+def export_format():
+    """Return 'parquet' or 'arrow' depending on what pyarrow supports here"""
+    return "parquet" if pq is not None else "arrow"
+
+
+def _to_ns(value, fmt):
+    """Convert a logged timestamp string (local time) to int64 epoch ns"""
+    if value is None or value == "":
+        return None
+    try:
+        parsed = datetime.strptime(value, fmt)
+    except (TypeError, ValueError):
+        return None
+    seconds = int(parsed.replace(microsecond=0).timestamp())
+    return (seconds * 1_000_000 + parsed.microsecond) * 1000
+
+
+def _seconds_to_ns(value):
+    if value is None:
+        return None
+    return int(round(value * 1e9))
+
+
+def _to_int(value):
+    """Survey answers are stored as strings like '5'"""
+    if value is None or value == "":
+        return None
+    try:
+        return int(str(value).split()[0])
+    except ValueError:
+        return None
+
+
+def _arrow_type(name):
+    return {
+        "int8": pa.int8(),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+    }[name]
+
+
+def _column(name, values, arrow_type=None):
+    """Build an Arrow array, dictionary-encoding low-cardinality strings"""
+    if arrow_type is not None:
+        array = pa.array(values, type=arrow_type)
+    else:
+        array = pa.array(values)
+    if name in DICTIONARY_COLUMNS and pa.types.is_string(array.type):
+        array = array.dictionary_encode()
+    return array
+
+
+def responses_table(responses, participant_id):
+    """Build a typed Arrow table from the session's response dicts"""
+    columns = []
+    for row in responses:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    names = ["participant_id"]
+    arrays = [_column("participant_id", [str(participant_id)] * len(responses))]
+
+    for key in columns:
+        values = [row.get(key) for row in responses]
+
+        if key == "timestamp":
+            names.append("timestamp_ns")
+            arrays.append(pa.array([_to_ns(v, RESPONSE_TIMESTAMP_FORMAT) for v in values], type=pa.int64()))
+        elif key.endswith("_client_onset") or key.endswith("_client_visible_onset"):
+            names.append(f"{key}_ns")
+            arrays.append(pa.array([_seconds_to_ns(v) for v in values], type=pa.int64()))
+        elif key in ("curiosity", "relatedness"):
+            names.append(key)
+            arrays.append(pa.array([_to_int(v) for v in values], type=pa.int8()))
+        elif key.endswith("_seconds"):
+            names.append(key)
+            arrays.append(pa.array(values, type=pa.float64()))
+        elif key in RESPONSE_COLUMN_TYPES:
+            names.append(key)
+            arrays.append(_column(key, values, _arrow_type(RESPONSE_COLUMN_TYPES[key])))
+        else:
+            names.append(key)
+            arrays.append(_column(key, values))
+
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def events_table(event_log, participant_id):
+    """Build a typed Arrow table from the session's event log"""
+    return pa.Table.from_arrays(
+        [
+            _column("participant_id", [str(participant_id)] * len(event_log)),
+            pa.array([_to_ns(e.get("timestamp"), EVENT_TIMESTAMP_FORMAT) for e in event_log], type=pa.int64()),
+            pa.array([e.get("iteration") for e in event_log], type=pa.int32()),
+            _column("stage", [e.get("stage") for e in event_log]),
+            _column("event", [e.get("event") for e in event_log]),
+            _column("context", [e.get("context") for e in event_log]),
+            pa.array([json.dumps(e["data"], ensure_ascii=False, default=str) if "data" in e else None
+                      for e in event_log], type=pa.string()),
+        ],
+        names=["participant_id", "timestamp_ns", "iteration", "stage", "event", "context", "data"]
+    )
+
+
+def write_table(table, path_without_extension):
+    """Write a table as Parquet or Arrow IPC; returns the written path"""
+    if export_format() == "parquet":
+        path = f"{path_without_extension}.parquet"
+        pq.write_table(table, path, compression="zstd")
+    else:
+        path = f"{path_without_extension}.arrow"
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    return path
+
+
+def export_session(event_log, responses, participant_id, timestamp, logs_dir="logs"):
+    """
+    Write the session's events and responses as columnar files.
+    Returns (events_path, responses_path); either is None if not written.
+    """
+    if not columnar_available():
+        print("Warning: pyarrow is not installed; skipping columnar export.")
+        return None, None
+
+    if not os.path.exists(logs_dir):
+        os.makedirs(logs_dir)
+
+    events_path = None
+    responses_path = None
+    if event_log:
+        events_path = write_table(events_table(event_log, participant_id),
+                                  os.path.join(logs_dir, f"events_{participant_id}_{timestamp}"))
+    if responses:
+        responses_path = write_table(responses_table(responses, participant_id),
+                                     os.path.join(logs_dir, f"responses_{participant_id}_{timestamp}"))
+    return events_path, responses_path
+
+
+def _file_schema(path):
+    if path.endswith(".parquet"):
+        return pq.read_schema(path)
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).schema
+
+
+def open_logs_dataset(logs_dir="logs", kind="responses"):
+    """
+    Open all exported `kind` files ('responses' or 'events') in logs_dir as a
+    single lazily scanned dataset. Sessions with different column sets are
+    unified into one schema; missing columns read as null.
+    """
+    if not columnar_available():
+        raise ImportError("pyarrow is required to open the columnar logs dataset")
+    if kind not in ("responses", "events"):
+        raise ValueError(f"Unknown log kind: {kind}")
+
+    parquet_files = sorted(glob.glob(os.path.join(logs_dir, f"{kind}_*.parquet")))
+    arrow_files = sorted(glob.glob(os.path.join(logs_dir, f"{kind}_*.arrow")))
+    if not parquet_files and not arrow_files:
+        raise FileNotFoundError(f"No columnar {kind} files found in {logs_dir}")
+
+    # Only file footers/headers are read here, not the data
+    schema = pa.unify_schemas([_file_schema(p) for p in parquet_files + arrow_files],
+                              promote_options="permissive")
+
+    children = []
+    if parquet_files:
+        children.append(ds.dataset(parquet_files, schema=schema, format="parquet"))
+    if arrow_files:
+        children.append(ds.dataset(arrow_files, schema=schema, format="ipc"))
+    return children[0] if len(children) == 1 else ds.dataset(children)
+
+
+def load_logs_table(logs_dir="logs", kind="responses", columns=None, filter=None):
+    """Scan the dataset with optional projection and filter into one table"""
+    return open_logs_dataset(logs_dir, kind).to_table(columns=columns, filter=filter)
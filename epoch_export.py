@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+"""
+EEG epoch table export.
+
+Time-locks the `MARKER:` events of each participant's event log to the trial
+data and to sample indices in the EEG acquisition file, using vectorized
+NumPy lookups instead of per-row loops:
+
+- every main-experiment `paragraph_start` marker opens a trial window that
+  lasts until the next trial's `paragraph_start`;
+- for each stage (paragraph, question input, feedback, survey, edit) the
+  first start marker inside the window is the onset, and the last end marker
+  before the stage starts again (or the window ends) is the offset, both
+  found with np.searchsorted over the sorted marker times. The engine sends
+  survey_end and edit_end before validating a submission, so a rejected
+  submission leaves an earlier end marker that the real one supersedes;
+- times are mapped to sample indices with the sampling rate and a sync anchor:
+  sample = anchor_sample + round((t - anchor_time) * sfreq).
+
+The anchor is a marker that is also visible in the acquisition file (by
+default the first `baseline_start`) together with its sample index there.
+Missing onsets/offsets are written as -1. The trial columns come from the
+responses CSV for main trials and from the event log for practice trials
+(which the CSV does not contain). Trials during which the session
+was resumed after a disconnect or restart (a `session_resumed` marker in the
+trial window) have interrupted = True.
+
+Output is one table per participant and context
+(`epochs_{participant}_{session}_{context}`),
+Parquet when pyarrow is installed, otherwise a NumPy structured array (.npy).
+
+Usage:
+    python epoch_export.py logs/ --sfreq 500 --anchor-sample 15230 -o epochs/
+    python epoch_export.py logs/ --sfreq 500 --anchors anchors.csv -o epochs/
+
+anchors.csv has the columns participant_id, anchor_sample and optionally
+session, anchor_marker and sfreq.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+
+import numpy as np
+
+from aggregate_cohort import EVENT_LOG_PATTERN, iter_json_array, trials_from_events
+
+MARKER_PREFIX = "MARKER: "
+
+# Stage name -> (onset marker, offset marker)
+EPOCH_STAGES = {
+    "paragraph": ("paragraph_start", "paragraph_end"),
+    "question_input": ("question_input_start", "question_input_end"),
+    "feedback": ("feedback_start", "feedback_end"),
+    "survey": ("survey_start", "survey_end"),
+    "edit": ("edit_start", "edit_end"),
+}
+
+# Trial columns copied from the responses CSV into the epoch table
+TRIAL_COLUMNS = ("paragraph_index", "paragraph_genre", "feedback_type", "curiosity", "relatedness", "accept_feedback")
+
+MISSING = -1
+
+
+def read_markers(event_log_path, context="main"):
+    """Return marker names, times (datetime64[us]) and iterations as arrays"""
+    names = []
+    timestamps = []
+    iterations = []
+    for entry in iter_json_array(event_log_path):
+        event = entry.get("event", "")
+        if not event.startswith(MARKER_PREFIX):
+            continue
+        if context is not None and entry.get("context", "main") != context:
+            continue
+        names.append(event[len(MARKER_PREFIX):])
+        timestamps.append(entry["timestamp"].replace(" ", "T"))
+        iterations.append(entry.get("iteration", 0))
+
+    times = np.array(timestamps, dtype="datetime64[us]")
+    order = np.argsort(times, kind="stable")
+    return np.array(names, dtype=object)[order], times[order], np.array(iterations, dtype=np.int32)[order]
+
+
+def to_samples(times, anchor_time, anchor_sample, sfreq):
+    """Map datetime64 times to acquisition sample indices"""
+    offsets_us = (times - anchor_time).astype(np.int64)
+    return anchor_sample + np.rint(offsets_us * (sfreq / 1e6)).astype(np.int64)
+
+
+def build_epoch_table(names, times, iterations, anchor_time, anchor_sample, sfreq):
+    """
+    Vectorized onset/offset sample indices per stage per trial.
+    Returns a dict of column name -> array, one row per trial.
+    """
+    trial_mask = names == "paragraph_start"
+    trial_onsets = times[trial_mask]
+    n_trials = len(trial_onsets)
+
+    # Each trial window ends where the next trial starts
+    window_ends = np.empty_like(trial_onsets)
+    window_ends[:-1] = trial_onsets[1:]
+    if n_trials:
+        window_ends[-1] = np.datetime64("9999-12-31T00:00:00", "us")
+
+    table = {"iteration": iterations[trial_mask].astype(np.int32)}
+
+    for stage, (start_marker, end_marker) in EPOCH_STAGES.items():
+        starts = times[names == start_marker]
+        ends = times[names == end_marker]
+
+        onset = np.full(n_trials, MISSING, dtype=np.int64)
+        offset = np.full(n_trials, MISSING, dtype=np.int64)
+
+        if len(starts):
+            # First start marker at or after the trial onset...
+            start_idx = np.searchsorted(starts, trial_onsets, side="left")
+            has_start = start_idx < len(starts)
+            start_times = starts[np.minimum(start_idx, len(starts) - 1)]
+            # ...that still belongs to this trial
+            has_start &= start_times < window_ends
+            onset[has_start] = to_samples(start_times[has_start], anchor_time, anchor_sample, sfreq)
+
+            if len(ends):
+                # Last end marker before the stage starts again or the trial window ends...
+                bounds = window_ends.copy()
+                restarts = start_idx + 1 < len(starts)
+                bounds[restarts] = np.minimum(bounds[restarts], starts[start_idx[restarts] + 1])
+                end_idx = np.searchsorted(ends, bounds, side="left") - 1
+                end_times = ends[np.maximum(end_idx, 0)]
+                # ...that is not before the stage started
+                has_end = has_start & (end_idx >= 0) & (end_times >= start_times)
+                offset[has_end] = to_samples(end_times[has_end], anchor_time, anchor_sample, sfreq)
+
+        table[f"{stage}_onset_sample"] = onset
+        table[f"{stage}_offset_sample"] = offset
+
+    # Trials continued after a disconnect or restart: the gap lies inside their window
+    resumed = times[names == "session_resumed"]
+    table["interrupted"] = (np.searchsorted(resumed, window_ends, side="left") -
+                            np.searchsorted(resumed, trial_onsets, side="left")) > 0
+
+    return table
+
+
+def read_trials(responses_path):
+    """Responses CSV rows keyed by iteration"""
+    if not responses_path or not os.path.exists(responses_path):
+        return {}
+    with open(responses_path, newline="", encoding="utf-8") as f:
+        return {int(row["iteration"]): row for row in csv.DictReader(f)}
+
+
+def read_event_trials(event_log_path, context):
+    """Trial rows of one context reconstructed from the event log, keyed by iteration"""
+    rows, _ = trials_from_events(event_log_path)
+    return {int(row["iteration"]): row for row in rows if row["context"] == context}
+
+
+def attach_trial_data(table, trials):
+    """Add the trial columns (from the responses CSV or the event log) to the epoch table"""
+    for column in TRIAL_COLUMNS:
+        values = [trials.get(int(i), {}).get(column) for i in table["iteration"]]
+        values = [None if v in (None, "") else v for v in values]
+        if column in ("paragraph_index", "curiosity", "relatedness"):
+            table[column] = np.array([int(v) if v is not None else MISSING for v in values], dtype=np.int16)
+        else:
+            table[column] = np.array([v or "" for v in values], dtype=object)
+    return table
+
+
+def write_epoch_table(table, path_without_extension):
+    """Write Parquet if pyarrow is available, otherwise a .npy structured array"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        path = f"{path_without_extension}.parquet"
+        columns = {}
+        for name, values in table.items():
+            if values.dtype == object:
+                columns[name] = pa.array(values.tolist(), type=pa.string()).dictionary_encode()
+            else:
+                columns[name] = pa.array(values)
+        pq.write_table(pa.table(columns), path, compression="zstd")
+        return path
+
+    path = f"{path_without_extension}.npy"
+    dtype = []
+    for name, values in table.items():
+        if values.dtype == object:
+            width = max([len(str(v).encode("utf-8")) for v in values] + [1])
+            dtype.append((name, f"S{width}"))
+        else:
+            dtype.append((name, values.dtype))
+    records = np.zeros(len(table["iteration"]), dtype=dtype)
+    for name, values in table.items():
+        records[name] = [str(v).encode("utf-8") for v in values] if values.dtype == object else values
+    np.save(path, records)
+    return path
+
+
+def find_anchor_time(names, times, anchor_marker):
+    matches = np.flatnonzero(names == anchor_marker)
+    if not len(matches):
+        raise ValueError(f"Anchor marker '{anchor_marker}' not found in event log")
+    return times[matches[0]]
+
+
+def export_participant(event_log_path, responses_path, output_dir, sfreq, anchor_sample,
+                       anchor_marker="baseline_start", context="main"):
+    """Build and write the epoch table for one saved session; returns the path"""
+    match = EVENT_LOG_PATTERN.match(os.path.basename(event_log_path))
+    participant_id = match.group("participant_id") if match else "unknown"
+    session = match.group("timestamp") if match else "unknown"
+
+    # The anchor may be logged outside the main context (e.g. baseline)
+    all_names, all_times, _ = read_markers(event_log_path, context=None)
+    anchor_time = find_anchor_time(all_names, all_times, anchor_marker)
+
+    names, times, iterations = read_markers(event_log_path, context=context)
+    table = build_epoch_table(names, times, iterations, anchor_time, anchor_sample, sfreq)
+    # The responses CSV only has main trials
+    trials = read_trials(responses_path) if context == "main" else read_event_trials(event_log_path, context)
+    table = attach_trial_data(table, trials)
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    return write_epoch_table(table, os.path.join(output_dir, f"epochs_{participant_id}_{session}_{context}"))
+
+
+def read_anchors(path):
+    """anchors.csv -> {(participant_id, session or None): row}"""
+    anchors = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            anchors[(row["participant_id"], row.get("session") or None)] = row
+    return anchors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export EEG epoch tables from the event logs")
+    parser.add_argument('logs_dir', nargs='?', default="logs",
+                        help='Directory with participant_*.json and responses_*.csv (default: logs)')
+    parser.add_argument('-o', '--output-dir', default="epochs",
+                        help='Directory for the epoch tables (default: epochs)')
+    parser.add_argument('--sfreq', type=float, required=True,
+                        help='EEG sampling rate in Hz')
+    parser.add_argument('--anchor-marker', default="baseline_start",
+                        help='Marker whose first occurrence is the sync anchor (default: baseline_start)')
+    parser.add_argument('--anchor-sample', type=int, default=None,
+                        help='Sample index of the anchor marker in the acquisition file')
+    parser.add_argument('--anchors', default=None,
+                        help='CSV with per-participant anchor_sample (and optional session, anchor_marker, sfreq)')
+    parser.add_argument('--context', default="main", choices=["main", "practice"],
+                        help='Which trials to export (default: main)')
+    args = parser.parse_args(argv)
+
+    if args.anchor_sample is None and args.anchors is None:
+        parser.error("one of --anchor-sample or --anchors is required")
+    anchors = read_anchors(args.anchors) if args.anchors else {}
+
+    exported = 0
+    for event_log_path in sorted(glob.glob(os.path.join(args.logs_dir, "participant_*.json"))):
+        match = EVENT_LOG_PATTERN.match(os.path.basename(event_log_path))
+        if not match:
+            continue
+        participant_id = match.group("participant_id")
+        session = match.group("timestamp")
+
+        anchor = anchors.get((participant_id, session)) or anchors.get((participant_id, None)) or {}
+        anchor_sample = int(anchor["anchor_sample"]) if anchor.get("anchor_sample") else args.anchor_sample
+        if anchor_sample is None:
+            print(f"⚠ No anchor for {participant_id} ({session}); skipping")
+            continue
+
+        responses_path = os.path.join(args.logs_dir, f"responses_{participant_id}_{session}.csv")
+        try:
+            path = export_participant(
+                event_log_path, responses_path, args.output_dir,
+                sfreq=float(anchor.get("sfreq") or args.sfreq),
+                anchor_sample=anchor_sample,
+                anchor_marker=anchor.get("anchor_marker") or args.anchor_marker,
+                context=args.context
+            )
+        except ValueError as e:
+            print(f"⚠ {participant_id} ({session}): {e}")
+            continue
+        print(f"✓ {path}")
+        exported += 1
+
+    print(f"Exported {exported} epoch table(s)")
+    return 0 if exported else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+"""
+Record/replay cassettes for the LLM calls of the feedback chains.
+
+In record mode every chat model call is passed to the real model, and the
+request and raw response are appended to a cassette file (JSON Lines, one
+entry per call, flushed immediately):
+
+    {"key": ..., "chain": "bloom_classification", "model": "gpt-4-0613",
+     "params": {"temperature": 0.1, "stop": null}, "prompt_hash": ...,
+     "response": "<raw model output>", "error": null, "latency_seconds": 1.92,
+     "recorded_at": "2026-01-01 10:00:00.123456"}
+
+The key is the SHA-256 of the chain, model, parameters and messages. In
+replay mode the same requests are answered from the cassette, so the chains,
+parsers, fallbacks and get_ai_feedback produce byte-identical feedback. A
+key that was recorded several times (e.g. retries) is served in recorded
+order. Recorded API errors are raised again. Timing is "original" (sleep for
+the recorded latency) or "instant".
+
+Requests without a recording are reported on the console and appended to
+<cassette>.misses. They go to the real model if one is configured; otherwise
+they raise CassetteMiss, so the usual retry/fallback path runs.
+
+app17.py enables this with LLM_CASSETTE_MODE=record|replay (see bloom_study/config.py).
+
+Usage:
+    python llm_cassette.py summary cassettes/run_20260101_100000.jsonl
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from functools import lru_cache
+
+
+class CassetteMiss(Exception):
+    """A replayed request has no recording and no real model to fall back to"""
+
+
+class RecordedLLMError(Exception):
+    """Replay of an API error that happened while recording"""
+
+
+def request_key(chain, model, params, messages):
+    """Stable identity of one chat model request"""
+    payload = json.dumps({"chain": chain, "model": model, "params": params, "messages": messages},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """One cassette file, opened for recording or for replay"""
+
+    def __init__(self, path, mode, timing="instant"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        if timing not in ("original", "instant"):
+            raise ValueError(f"Unknown cassette timing '{timing}'")
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self._lock = threading.Lock()
+        self.recordings = {}
+        self.served = 0
+        self.misses = []
+
+        if mode == "replay":
+            for entry in read_entries(path):
+                self.recordings.setdefault(entry["key"], deque()).append(entry)
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+    def record(self, entry):
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def take(self, key):
+        """Next recorded entry for this key, or None"""
+        with self._lock:
+            entries = self.recordings.get(key)
+            if not entries:
+                return None
+            self.served += 1
+            return entries.popleft()
+
+    def miss(self, entry):
+        with self._lock:
+            self.misses.append(entry)
+            with open(f"{self.path}.misses", "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"Cassette miss: {entry['chain']} request {entry['key'][:12]} not in {self.path}")
+
+    def report(self):
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "served": self.served,
+                "misses": len(self.misses),
+                "unused": sum(len(entries) for entries in self.recordings.values())
+            }
+
+
+def read_entries(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@lru_cache(maxsize=1)
+def _cassette_model_class():
+    """Defined on first use so importing this module does not import LangChain"""
+    from typing import Any
+
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    class CassetteChatModel(BaseChatModel):
+        """Chat model that records or replays the calls of an inner model"""
+
+        inner: Any = None
+        cassette: Any = None
+        chain: str = "llm"
+        model_name: str = "unknown"
+        temperature: Any = None
+
+        @property
+        def _llm_type(self):
+            return "cassette"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            message_data = [{"type": m.type, "content": m.content} for m in messages]
+            params = {"temperature": self.temperature, "stop": stop}
+            key = request_key(self.chain, self.model_name, params, message_data)
+            entry = {
+                "key": key,
+                "chain": self.chain,
+                "model": self.model_name,
+                "params": params,
+                "prompt_hash": hashlib.sha256("\n".join(m["content"] for m in message_data).encode("utf-8")).hexdigest()
+            }
+
+            if self.cassette.mode == "replay":
+                recorded = self.cassette.take(key)
+                if recorded is not None:
+                    if self.cassette.timing == "original":
+                        time.sleep(recorded.get("latency_seconds") or 0.0)
+                    if recorded.get("error"):
+                        raise RecordedLLMError(recorded["error"])
+                    return ChatResult(generations=[ChatGeneration(message=AIMessage(content=recorded["response"]))])
+
+                # Keep the full messages so the mismatch can be diagnosed
+                self.cassette.miss(dict(entry, messages=message_data))
+                if self.inner is None:
+                    raise CassetteMiss(f"No recording for {self.chain} request {key[:12]}")
+                return self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+            # Record: call the real model and keep the raw output (or the error)
+            start = time.perf_counter()
+            try:
+                result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                entry.update(response=None, error=f"{type(e).__name__}: {e}")
+                raise
+            else:
+                entry.update(response=result.generations[0].message.content, error=None)
+                return result
+            finally:
+                entry["latency_seconds"] = round(time.perf_counter() - start, 6)
+                entry["recorded_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+                self.cassette.record(entry)
+
+    return CassetteChatModel
+
+
+def wrap_chat_model(inner, cassette, chain, model="gpt-4-0613", temperature=None):
+    """Wrap a LangChain chat model (or None when replaying without API access)"""
+    return _cassette_model_class()(
+        inner=inner,
+        cassette=cassette,
+        chain=chain,
+        model_name=getattr(inner, "model_name", model),
+        temperature=getattr(inner, "temperature", temperature)
+    )
+
+
+def summary(path):
+    entries = read_entries(path)
+    chains = Counter(entry["chain"] for entry in entries)
+    errors = sum(1 for entry in entries if entry.get("error"))
+    latencies = sorted(entry.get("latency_seconds") or 0.0 for entry in entries)
+    print(f"{path}: {len(entries)} recorded call(s), {len(set(e['key'] for e in entries))} distinct request(s), {errors} error(s)")
+    for chain, count in sorted(chains.items()):
+        print(f"  {chain}: {count}")
+    if latencies:
+        print(f"  latency: median {latencies[len(latencies) // 2]:.3f}s, max {latencies[-1]:.3f}s, total {sum(latencies):.1f}s")
+    misses_path = f"{path}.misses"
+    if os.path.exists(misses_path):
+        misses = read_entries(misses_path)
+        print(f"  {len(misses)} unmatched replay request(s) in {misses_path}")
+        for chain, count in sorted(Counter(m["chain"] for m in misses).items()):
+            print(f"    {chain}: {count}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] != "summary":
+        print("Usage: python llm_cassette.py summary <cassette.jsonl>")
+        return 2
+    summary(argv[1])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""
+Preflight probe of the LLM endpoint: latency, throughput and rate-limit headroom.
+
+Sends representative feedback requests to the chat completions endpoint at
+a chosen concurrency. Each request is one of the three chain prompts
+(classification, related or unrelated suggestion), rendered with the real
+prompt templates (bloom_study.prompts) for a real stimulus paragraph and a
+question from the few-shot examples. It goes out with the model and
+temperature that chain uses.
+
+The OpenAI client is used directly with retries disabled, so every 429 is
+counted instead of being retried away. Reported:
+
+- latency p50/p95/p99 of successful requests
+- tokens/s: completion (and total) tokens over the probe's wall time
+- 429 responses and other errors
+- rate-limit headroom from the x-ratelimit-* response headers, when the
+  endpoint sends them (api.openai.com does, mock_llm_server.py does not)
+- a recommended cap on concurrent feedback requests
+
+Works against any OpenAI-compatible endpoint, e.g. a local stand-in:
+
+    python mock_llm_server.py --port 8011 --error-rate 0.05
+    python llm_probe.py --base-url http://127.0.0.1:8011/v1 --requests 40 --concurrency 8
+
+Usage:
+    python llm_probe.py [--requests 20] [--concurrency 4] [--base-url URL] [-o report.json]
+
+run_experiment.py --probe runs the same probe before a lab session.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MODEL = "gpt-4-0613"
+
+# Request kind -> temperature of the chat model that runs that chain
+KINDS = {
+    "classification": 0.1,
+    "related": 0.7,
+    "unrelated": 0.7,
+}
+
+# Share of the rate limit the recommended cap may use
+RATE_LIMIT_SAFETY = 0.8
+
+
+def build_requests(count, seed=0):
+    """Rendered chain prompts for random stimulus paragraphs and example questions"""
+    from bloom_study.assignment import get_experiment_paragraphs
+    from bloom_study.prompts import (
+        BLOOM_CLASSIFICATION_EXAMPLES, bloom_classification_prompt, related_question_prompt, unrelated_question_prompt
+    )
+
+    prompts = {
+        "classification": bloom_classification_prompt()[0],
+        "related": related_question_prompt()[0],
+        "unrelated": unrelated_question_prompt()[0],
+    }
+    rng = random.Random(seed)
+    paragraphs = [p["content"] for p in get_experiment_paragraphs()]
+    questions = [example["question"] for example in BLOOM_CLASSIFICATION_EXAMPLES]
+    kinds = list(KINDS)
+
+    requests = []
+    for i in range(count):
+        # Each feedback is a classification followed by a related or unrelated suggestion
+        kind = kinds[0] if i % 2 == 0 else rng.choice(kinds[1:])
+        prompt = prompts[kind].format(paragraph=rng.choice(paragraphs), question=rng.choice(questions))
+        requests.append({"kind": kind, "temperature": KINDS[kind], "prompt": prompt})
+    return requests
+
+
+def rate_limit_headers(headers):
+    return {name: headers.get(name) for name in (
+        "x-ratelimit-limit-requests", "x-ratelimit-limit-tokens",
+        "x-ratelimit-remaining-requests", "x-ratelimit-remaining-tokens"
+    ) if headers.get(name) is not None}
+
+
+def send(client, request, timeout):
+    """One chat completion: latency, outcome, token usage and rate-limit headers"""
+    import openai
+
+    result = {"kind": request["kind"], "status": "ok", "prompt_tokens": 0, "completion_tokens": 0, "limits": {}}
+    start = time.perf_counter()
+    try:
+        raw = client.chat.completions.with_raw_response.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": request["prompt"]}],
+            temperature=request["temperature"],
+            timeout=timeout
+        )
+        completion = raw.parse()
+        result["limits"] = rate_limit_headers(raw.headers)
+        if completion.usage:
+            result["prompt_tokens"] = completion.usage.prompt_tokens
+            result["completion_tokens"] = completion.usage.completion_tokens
+    except openai.RateLimitError as e:
+        result["status"] = "rate_limited"
+        result["limits"] = rate_limit_headers(e.response.headers)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"[:200]
+    result["latency"] = time.perf_counter() - start
+    return result
+
+
+def run_probe(requests, concurrency, api_key=None, base_url=None, timeout=60.0):
+    """Send all requests with at most `concurrency` in flight: (results, wall seconds)"""
+    from openai import OpenAI
+
+    client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY") or "probe",
+                    base_url=base_url or None, max_retries=0)
+    done = []
+    lock = threading.Lock()
+
+    def task(request):
+        result = send(client, request, timeout)
+        with lock:
+            done.append(result)
+            print(f"  {len(done)}/{len(requests)} {result['kind']:<15} {result['status']:<13} "
+                  f"{result['latency'] * 1000:7.0f}ms", flush=True)
+        return result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(task, requests))
+    return results, time.perf_counter() - start
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def parse_limit(value):
+    """Header value -> number ('10000' or OpenAI's abbreviated '1.2M')"""
+    if value is None:
+        return None
+    scale = {"K": 1e3, "M": 1e6}.get(str(value)[-1:].upper(), 1)
+    try:
+        return float(str(value).rstrip("kKmM")) * scale
+    except ValueError:
+        return None
+
+
+def recommend_concurrency(ok, rate_limited, requests, concurrency, limits):
+    """Cap on concurrent requests and the reason for it"""
+    if rate_limited:
+        # Back off in proportion to the share of requests that were limited
+        cap = max(1, int(concurrency * (1 - rate_limited / requests)) - 1)
+        return cap, f"{rate_limited} request(s) got 429 at concurrency {concurrency}"
+
+    rpm = parse_limit(limits.get("x-ratelimit-limit-requests"))
+    tpm = parse_limit(limits.get("x-ratelimit-limit-tokens"))
+    if ok and (rpm or tpm):
+        mean_latency = sum(r["latency"] for r in ok) / len(ok)
+        mean_tokens = sum(r["prompt_tokens"] + r["completion_tokens"] for r in ok) / len(ok)
+        per_minute = min(v for v in (rpm, tpm / mean_tokens if tpm and mean_tokens else None) if v)
+        # Requests in flight when sending at the limit (Little's law)
+        cap = max(1, int(per_minute / 60.0 * mean_latency * RATE_LIMIT_SAFETY))
+        return cap, f"{RATE_LIMIT_SAFETY:.0%} of the rate limit ({per_minute:.0f} requests/min) at {mean_latency:.1f}s per request"
+
+    return concurrency, f"no 429s and no rate-limit headers; the limit is at least {concurrency} (probe higher to find it)"
+
+
+def summarize(results, wall, concurrency):
+    ok = [r for r in results if r["status"] == "ok"]
+    rate_limited = sum(1 for r in results if r["status"] == "rate_limited")
+    errors = [r for r in results if r["status"] == "error"]
+    latencies = [r["latency"] for r in ok]
+    completion_tokens = sum(r["completion_tokens"] for r in ok)
+    total_tokens = completion_tokens + sum(r["prompt_tokens"] for r in ok)
+
+    # Limits as sent by the endpoint; for the remaining counts, the lowest headroom seen
+    limits = {}
+    for r in results:
+        for name, value in r["limits"].items():
+            if name.startswith("x-ratelimit-remaining") and name in limits:
+                value = min(value, limits[name], key=lambda v: parse_limit(v) or 0)
+            limits[name] = value
+
+    cap, reason = recommend_concurrency(ok, rate_limited, len(results), concurrency, limits)
+    return {
+        "requests": len(results),
+        "concurrency": concurrency,
+        "ok": len(ok),
+        "rate_limited": rate_limited,
+        "errors": len(errors),
+        "error_examples": sorted({r["error"] for r in errors})[:5],
+        "wall_seconds": round(wall, 3),
+        "latency_seconds": {
+            f"p{pct}": round(percentile(latencies, pct), 3) for pct in (50, 95, 99)
+        } if latencies else {},
+        "latency_by_kind": {
+            kind: round(percentile([r["latency"] for r in ok if r["kind"] == kind], 50), 3)
+            for kind in KINDS if any(r["kind"] == kind for r in ok)
+        },
+        "completion_tokens_per_second": round(completion_tokens / wall, 1) if wall else None,
+        "total_tokens_per_second": round(total_tokens / wall, 1) if wall else None,
+        "rate_limits": limits,
+        "recommended_concurrency": cap,
+        "recommendation_reason": reason,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['requests']} requests at concurrency {report['concurrency']} in {report['wall_seconds']:.1f}s: "
+          f"{report['ok']} ok, {report['rate_limited']} rate limited (429), {report['errors']} error(s)")
+    for example in report["error_examples"]:
+        print(f"  error: {example}")
+    if report["latency_seconds"]:
+        latency = report["latency_seconds"]
+        print(f"latency: p50 {latency['p50']:.2f}s  p95 {latency['p95']:.2f}s  p99 {latency['p99']:.2f}s")
+        print("median by request: " + ", ".join(f"{kind} {value:.2f}s" for kind, value in report["latency_by_kind"].items()))
+        print(f"throughput: {report['completion_tokens_per_second']} completion tokens/s, "
+              f"{report['total_tokens_per_second']} total tokens/s")
+    if report["rate_limits"]:
+        print("rate limits: " + ", ".join(f"{name[12:]}={value}" for name, value in report["rate_limits"].items()))
+    print(f"recommended cap: {report['recommended_concurrency']} concurrent feedback requests "
+          f"({report['recommendation_reason']})")
+
+
+def probe(requests=20, concurrency=4, base_url=None, api_key=None, timeout=60.0, seed=0):
+    """Build, send and summarize the probe requests; prints progress and the report"""
+    print(f"Probing {base_url or 'api.openai.com'} with {requests} request(s) at concurrency {concurrency}...")
+    results, wall = run_probe(build_requests(requests, seed), concurrency, api_key, base_url, timeout)
+    report = summarize(results, wall, concurrency)
+    print_report(report)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preflight latency, throughput and rate-limit probe of the LLM endpoint")
+    parser.add_argument('--requests', type=int, default=20, help='Requests to send (default: 20)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Requests in flight at once (default: 4)')
+    parser.add_argument('--base-url', default=os.getenv("OPENAI_BASE_URL", ""),
+                        help='OpenAI-compatible endpoint (default: OPENAI_BASE_URL or api.openai.com)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Per-request timeout in seconds (default: 60)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for paragraph and question choice (default: 0)')
+    parser.add_argument('-o', '--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    report = probe(args.requests, args.concurrency, args.base_url or None, timeout=args.timeout, seed=args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,487 @@
+#!/usr/bin/env python
+"""
+Load test: many simulated participants running app17.py at once.
+
+Each virtual participant is a Streamlit AppTest session of app17.py in its
+own worker process (AppTest swaps a process-global mock runtime in and out
+on every run, so sessions cannot share one process). Participants click
+through start, baseline, both practice trials and the main trials, answering
+with scripted questions, survey answers and edits, after a random think time
+before every action.
+
+Feedback comes from the offline mock backend (FEEDBACK_BACKEND=mock) after
+--feedback-latency seconds, so no API key or network is needed. With
+--mock-server the real LangChain chains run instead, against a local
+mock_llm_server.py with the given latency distribution. The pretest
+form uses st.data_editor, which AppTest cannot fill in, so scripted pretest
+answers are submitted through the engine instead.
+
+Reported:
+- latency percentiles per stage: from the click until the next screen has
+  rendered. For submit_question this includes the feedback.
+- CPU (% of one core) and RSS summed over the participant processes, over
+  time. This is the server load plus the small AppTest overhead. Cached
+  resources (models, marker sinks, session database) are loaded once per
+  process instead of once per server, so RSS is an upper bound. Sampling
+  uses psutil when installed and /proc otherwise.
+- script runs per trial, and full/fragment runs and mean run time per
+  stage (app17's run_stats). AppTest always runs the whole script, so the
+  fragment-only reruns of a browser (the question field) cannot be driven
+  here; typed values and selections are sent with the next click instead.
+- error rate: actions that raised, showed st.error, produced an error
+  feedback text or could not find the expected button
+
+Usage:
+    python load_test.py --participants 8 --think 2:6 --feedback-latency 1.5
+    python load_test.py --participants 20 --trials 5 --baseline-seconds 3 --script script.json -o report.json
+    python load_test.py --participants 8 --mock-server lognormal:-0.5,0.4 --mock-error-rate 0.02
+
+script.json may override any key of DEFAULT_SCRIPT (questions, edits,
+survey, pretest, think), where think maps a stage name to [min, max] seconds.
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app17.py")
+
+DEFAULT_SCRIPT = {
+    "questions": [
+        "이 글에서 말하는 핵심 개념은 무엇인가?",
+        "이 현상이 일어나는 이유는 무엇일까?",
+        "이 주장을 다른 분야에 적용하면 어떻게 될까?",
+        "저자의 관점과 반대되는 근거는 무엇이 있을까?"
+    ],
+    "edits": [],  # Empty: append " (수정)" to the original question
+    "survey": {
+        "curiosity": ["3", "4", "5", "6"],
+        "relatedness": ["2", "4", "6"],
+        "accept_feedback": ["예", "아니오"]
+    },
+    "pretest": {
+        "gender": "여",
+        "age": 25,
+        "ai_frequency": 3,
+        "ai_tools": "ChatGPT"
+    },
+    "think": {}  # stage -> [min, max] seconds; stages without an entry use --think
+}
+
+WIDGET_TIMEOUT = 300  # seconds per AppTest run
+BASELINE_POLL_SECONDS = 0.5  # BASELINE_POLL_SECONDS of app17.py (AppTest does not run fragment timers)
+
+
+class LoadResults:
+    """Stage latencies and errors of one participant, sent back to the parent"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.script_runs = []  # script runs per trial
+        self.run_stats = {}  # stage -> full/fragment run counts and seconds (app17's run_stats)
+        self.actions = 0
+        self.errors = []
+        self.completed = 0
+
+    def record(self, stage, seconds):
+        self.latencies.setdefault(stage, []).append(seconds)
+        self.actions += 1
+
+    def error(self, participant, stage, message):
+        self.errors.append({"participant": participant, "stage": stage, "error": message})
+
+    def merge(self, other):
+        """Add the results of one participant (as sent by participant_worker)"""
+        for stage, values in other["latencies"].items():
+            self.latencies.setdefault(stage, []).extend(values)
+        self.script_runs.extend(other["script_runs"])
+        for stage, entry in other["run_stats"].items():
+            total = self.run_stats.setdefault(stage, {"full": 0, "fragment": 0, "seconds": 0.0})
+            for name, value in entry.items():
+                total[name] += value
+        self.actions += other["actions"]
+        self.errors.extend(other["errors"])
+        self.completed += other["completed"]
+
+
+def process_usage(pid):
+    """(cpu_seconds, rss_bytes) of a process, or None if it is gone or unsupported"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    try:
+        if psutil is not None:
+            process = psutil.Process(pid)
+            cpu = process.cpu_times()
+            return cpu.user + cpu.system, process.memory_info().rss
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        ticks = os.sysconf("SC_CLK_TCK")
+        return (int(fields[11]) + int(fields[12])) / ticks, rss_pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+class ResourceSampler(threading.Thread):
+    """Sample CPU usage and RSS of the participant processes at a fixed interval"""
+
+    def __init__(self, processes, interval=1.0):
+        super().__init__(daemon=True)
+        self.processes = processes
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        start = time.perf_counter()
+        last_wall = start
+        last_cpu = {}
+        while not self._stop_event.wait(self.interval):
+            wall = time.perf_counter()
+            cpu_delta = 0.0
+            rss = 0
+            active = 0
+            for process in list(self.processes):
+                usage = process_usage(process.pid) if process.is_alive() else None
+                if usage is None:
+                    continue
+                active += 1
+                cpu_delta += usage[0] - last_cpu.get(process.pid, usage[0])
+                last_cpu[process.pid] = usage[0]
+                rss += usage[1]
+            self.samples.append({
+                "t": round(wall - start, 2),
+                "cpu_percent": round(100.0 * cpu_delta / (wall - last_wall), 1),
+                "rss_mb": round(rss / 2**20, 1),
+                "active_participants": active
+            })
+            last_wall = wall
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class VirtualParticipant:
+    """Drives one AppTest session of app17.py through the experiment"""
+
+    def __init__(self, number, script, think, max_trials, results, seed):
+        self.participant_id = f"load{number:03d}"
+        self.script = script
+        self.think = think
+        self.max_trials = max_trials
+        self.results = results
+        self.rng = random.Random(seed)
+        self.questions = itertools.cycle(script["questions"])
+        self.at = None
+
+    # AppTest helpers
+
+    @property
+    def engine(self):
+        return self.at.session_state.engine
+
+    def pause(self, stage):
+        low, high = self.script["think"].get(stage, self.think)
+        if high > 0:
+            time.sleep(self.rng.uniform(low, high))
+
+    def find_button(self, label):
+        for button in self.at.button:
+            if button.label == label:
+                return button
+        return None
+
+    def check(self, stage):
+        """Record app exceptions and st.error messages shown after an action"""
+        problems = [e.message for e in self.at.exception] + [e.value for e in self.at.error]
+        for message in problems:
+            self.results.error(self.participant_id, stage, str(message)[:200])
+        return not problems
+
+    def click(self, label, stage):
+        """Press a button and record the time until the next screen has rendered"""
+        self.pause(stage)
+        button = self.find_button(label)
+        if button is None:
+            self.results.error(self.participant_id, stage, f"button '{label}' not found")
+            return False
+        start = time.perf_counter()
+        button.click().run(timeout=WIDGET_TIMEOUT)
+        self.results.record(stage, time.perf_counter() - start)
+        return self.check(stage)
+
+    def wait_for_baseline(self):
+        """Rerun at the fixation timer's poll interval, as the browser does, until the baseline ends"""
+        while self.engine.state.stage == "baseline_screen":
+            time.sleep(BASELINE_POLL_SECONDS)
+            self.at.run(timeout=WIDGET_TIMEOUT)
+        self.check("baseline_screen")
+
+    def set_radio(self, key_prefix, value):
+        for radio in self.at.radio:
+            if radio.key and radio.key.startswith(key_prefix):
+                radio.set_value(value)
+                return
+
+    # Experiment flow
+
+    def run_stats(self):
+        if "run_stats" not in self.at.session_state:
+            return {}
+        return self.at.session_state["run_stats"]
+
+    def script_runs(self):
+        return sum(entry["full"] + entry["fragment"] for entry in self.run_stats().values())
+
+    def run_trial(self, number):
+        runs_before = self.script_runs()
+        question = next(self.questions)
+        edits = self.script["edits"]
+        edited = edits[number % len(edits)] if edits else f"{question} (수정)"
+
+        self.click("읽기 완료", "show_paragraph")
+
+        # Typed values and selections are sent with the next click: the survey and
+        # edit are forms, and the question field is a fragment, which AppTest
+        # cannot rerun on its own (like typing and clicking submit right away)
+        self.pause("ask_question")
+        self.at.text_input[0].input(question)
+        self.click("질문 제출", "ask_question")
+        feedback = self.engine.state.current_iteration_data.get("feedback", "")
+        if feedback.startswith("Error"):
+            self.results.error(self.participant_id, "ask_question", feedback[:200])
+
+        self.click("다음", "show_feedback")
+
+        for name, choices in self.script["survey"].items():
+            self.set_radio(f"{name}_", self.rng.choice(choices))
+        self.click("설문 제출", "survey")
+
+        self.pause("edit_question")
+        self.at.text_area[0].input(edited)
+        self.click("최종 제출", "edit_question")
+        self.results.script_runs.append(self.script_runs() - runs_before)
+
+    def run(self):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP_PATH, default_timeout=WIDGET_TIMEOUT)
+        self.at.run()
+
+        self.at.text_input[0].input(self.participant_id)
+        self.click("실험 시작", "start")
+
+        # The pretest form cannot be filled in through AppTest (st.data_editor)
+        self.engine.complete_pretest(dict(self.script["pretest"]))
+        self.at.run()
+
+        self.click("베이스라인 측정으로 이동", "pretest_completed")
+        self.click("베이스라인 시작", "baseline_screen")
+        self.wait_for_baseline()
+        self.click("다음 단계로 이동", "baseline_complete")
+        self.click("연습 세션 시작", "bloom_explanation")
+        self.click("연습 시작", "practice_ready")
+
+        trial = 0
+        while self.engine.state.stage == "show_paragraph":
+            self.run_trial(trial)
+            trial += 1
+
+        self.click("본 실험 시작", "practice_completed")
+        if self.max_trials is not None:
+            state = self.engine.state
+            state.experiment_paragraphs = state.experiment_paragraphs[:self.max_trials]
+
+        while self.engine.state.stage == "show_paragraph":
+            self.run_trial(trial)
+            trial += 1
+
+        return self.engine.state.stage == "completed"
+
+
+def participant_worker(number, settings, script, queue):
+    """Process entry point: run one virtual participant and send back its results"""
+    results = LoadResults()
+    participant = VirtualParticipant(number, script, settings["think"], settings["trials"], results,
+                                     seed=settings["seed"] + number)
+    quiet = contextlib.nullcontext() if settings["verbose"] else contextlib.redirect_stdout(open(os.devnull, "w"))
+    with quiet:
+        try:
+            results.completed = int(participant.run())
+        except Exception as e:
+            results.error(participant.participant_id, "run", f"{type(e).__name__}: {e}")
+        results.run_stats = {stage: dict(entry) for stage, entry in participant.run_stats().items()}
+    print(f"{participant.participant_id}: {'completed' if results.completed else 'FAILED'}", file=sys.stderr)
+    # Plain dict: AppTest replaces __main__, so classes defined here cannot be pickled
+    queue.put(vars(results))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(results, samples, args, elapsed):
+    stages = {}
+    for stage, values in results.latencies.items():
+        stages[stage] = {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": max(values),
+            "mean": statistics.fmean(values)
+        }
+    return {
+        "participants": args.participants,
+        "completed": results.completed,
+        "elapsed_seconds": elapsed,
+        "actions": results.actions,
+        "errors": len(results.errors),
+        "error_rate": len(results.errors) / results.actions if results.actions else 0.0,
+        "script_runs_per_trial": statistics.fmean(results.script_runs) if results.script_runs else None,
+        "runs_per_stage": {
+            stage: dict(entry, mean_ms=1000 * entry["seconds"] / max(entry["full"] + entry["fragment"], 1))
+            for stage, entry in results.run_stats.items()
+        },
+        "stages": stages,
+        "resources": samples,
+        "error_details": results.errors
+    }
+
+
+def print_report(report):
+    print(f"\n{report['completed']}/{report['participants']} participants completed in {report['elapsed_seconds']:.1f}s")
+    print(f"{'stage':<20}{'n':>6}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (seconds)")
+    for stage, row in sorted(report["stages"].items()):
+        print(f"{stage:<20}{row['count']:>6}{row['p50']:>9.3f}{row['p90']:>9.3f}{row['p99']:>9.3f}{row['max']:>9.3f}")
+
+    samples = report["resources"]
+    if samples:
+        cpu = [s["cpu_percent"] for s in samples]
+        rss = [s["rss_mb"] for s in samples]
+        print(f"CPU: mean {statistics.fmean(cpu):.0f}%  max {max(cpu):.0f}%   "
+              f"RSS: start {rss[0]:.0f} MB  max {max(rss):.0f} MB  end {rss[-1]:.0f} MB")
+
+    if report["script_runs_per_trial"] is not None:
+        print(f"script runs per trial: {report['script_runs_per_trial']:.1f}")
+        print(f"{'runs in stage':<20}{'full':>6}{'fragment':>10}{'mean ms':>9}")
+        for stage, row in sorted(report["runs_per_stage"].items()):
+            print(f"{stage:<20}{row['full']:>6}{row['fragment']:>10}{row['mean_ms']:>9.1f}")
+    if "llm_server" in report:
+        print(f"mock LLM server: {report['llm_server']}")
+    print(f"errors: {report['errors']} of {report['actions']} actions ({100 * report['error_rate']:.2f}%)")
+    for error in report["error_details"][:10]:
+        print(f"  {error['participant']} [{error['stage']}] {error['error']}")
+
+
+def parse_range(value):
+    low, _, high = value.partition(":")
+    return float(low), float(high or low)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent participants against app17.py")
+    parser.add_argument('--participants', type=int, default=4, help='Concurrent virtual participants (default: 4)')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='Seconds between participant starts (default: 0)')
+    parser.add_argument('--think', type=parse_range, default=(1.0, 3.0),
+                        help='Think time before each action, MIN:MAX seconds (default: 1:3)')
+    parser.add_argument('--trials', type=int, default=None, help='Main trials per participant (default: all)')
+    parser.add_argument('--feedback-latency', type=float, default=1.0,
+                        help='Seconds the mock LLM takes per feedback (default: 1.0)')
+    parser.add_argument('--mock-server', default=None, metavar='LATENCY',
+                        help='Run the LangChain chains against mock_llm_server.py with this latency '
+                             'distribution (e.g. lognormal:-0.5,0.4) instead of the mock backend')
+    parser.add_argument('--mock-error-rate', type=float, default=0.0, help='429 rate of the mock server')
+    parser.add_argument('--mock-malformed-rate', type=float, default=0.0, help='Malformed reply rate of the mock server')
+    parser.add_argument('--baseline-seconds', type=float, default=30.0,
+                        help='Baseline fixation duration (default: 30)')
+    parser.add_argument('--script', default=None, help='JSON file overriding DEFAULT_SCRIPT')
+    parser.add_argument('--sample-interval', type=float, default=1.0, help='CPU/RSS sampling interval (default: 1s)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for think times and answers')
+    parser.add_argument('-o', '--output', default=None, help='Write the full report (incl. timeline) as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Show the app\'s console output')
+    args = parser.parse_args(argv)
+
+    script = dict(DEFAULT_SCRIPT)
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script.update(json.load(f))
+
+    # Offline and isolated: mock LLM, logs and session database in a scratch directory
+    llm_server = None
+    if args.mock_server:
+        import mock_llm_server
+
+        behaviour = mock_llm_server.MockBehaviour(
+            mock_llm_server.parse_distribution(args.mock_server), seed=args.seed,
+            error_rate=args.mock_error_rate, malformed_rate=args.mock_malformed_rate
+        )
+        llm_server = mock_llm_server.serve(port=0, behaviour=behaviour)
+        threading.Thread(target=llm_server.serve_forever, daemon=True).start()
+        os.environ["FEEDBACK_BACKEND"] = "openai"
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm_server.server_address[1]}/v1"
+    else:
+        os.environ["FEEDBACK_BACKEND"] = "mock"
+        os.environ["MOCK_FEEDBACK_LATENCY"] = str(args.feedback_latency)
+    os.environ["BASELINE_SECONDS"] = str(args.baseline_seconds)
+    os.environ.pop("OPENAI_API_KEY", None)
+    workdir = tempfile.mkdtemp(prefix="load_test_")
+    os.environ["SESSION_DB_PATH"] = os.path.join(workdir, "sessions.db")
+    output = os.path.abspath(args.output) if args.output else None
+    os.chdir(workdir)
+    print(f"Writing session logs to {workdir}", file=sys.stderr)
+
+    settings = {"think": args.think, "trials": args.trials, "seed": args.seed, "verbose": args.verbose}
+    queue = multiprocessing.Queue()
+    processes = []
+    sampler = ResourceSampler(processes, args.sample_interval)
+    sampler.start()
+    start = time.perf_counter()
+
+    for number in range(args.participants):
+        process = multiprocessing.Process(target=participant_worker, args=(number, settings, script, queue))
+        process.start()
+        processes.append(process)
+        if args.ramp_up:
+            time.sleep(args.ramp_up)
+
+    # Collect before joining so a full queue cannot block the workers
+    results = LoadResults()
+    for _ in processes:
+        results.merge(queue.get())
+    for process in processes:
+        process.join()
+
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+
+    report = summarize(results, sampler.samples, args, elapsed)
+    if llm_server is not None:
+        report["llm_server"] = dict(llm_server.behaviour.stats)
+        llm_server.shutdown()
+    print_report(report)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✓ Report written to {output}")
+    return 0 if results.completed == args.participants and not results.errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
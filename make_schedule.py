@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Precompute the counterbalancing schedule of a study into a lookup file.
+
+Each row is one participant's paragraph order (a row of a balanced Latin
+square), related/unrelated split within each genre and practice conditions
+(see bloom_study.assignment). The app looks a session's row up in the file
+(SCHEDULE_FILE, default schedule.json):
+
+- participants listed with --ids or --id-format get rows in enrolment order,
+  so any 2k consecutive participants are exactly counterbalanced
+- any other participant ID gets the least used row; the session database
+  (logs/sessions.db) records it, so the participant keeps it
+
+The file is stamped with the stimulus version (stimuli.json content hash);
+after the stimuli change the app computes rows instead until the schedule
+is regenerated.
+
+Commit the generated schedule.json (it is not ignored), or copy it to every
+machine that runs sessions: a machine without it computes its own rows, and
+listed participants only get their rows where the file is.
+
+Usage:
+    python make_schedule.py --participants 40 --id-format "P{:03d}"
+    python make_schedule.py --participants 60 --ids participant_ids.txt --seed 7 -o schedule.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+from bloom_study.assignment import SCHEDULE_FILE, build_schedule
+
+
+def read_ids(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def balance_report(schedule):
+    """Condition counts per paragraph and position coverage of the rows"""
+    rows = schedule["rows"]
+    related = Counter(idx for row in rows for idx, condition in row["conditions"].items() if condition == "related")
+    paragraphs = rows[0]["order"]
+    counts = [related[idx] for idx in paragraphs]
+    positions = {idx: len({row["order"].index(idx) for row in rows}) for idx in paragraphs}
+    print(f"{len(rows)} rows over {len(paragraphs)} paragraphs, stimuli {schedule['stimulus_version']}, "
+          f"seed {schedule['seed']}, {len(schedule['participants'])} listed participants")
+    print(f"related per paragraph: min {min(counts)}, max {max(counts)} of {len(rows)} rows")
+    print(f"distinct positions per paragraph: min {min(positions.values())}, max {max(positions.values())}")
+    first_practice = Counter(row["practice_conditions"].get(0) for row in rows)
+    print("first practice condition: " + ", ".join(f"{c} {n}" for c, n in sorted(first_practice.items())))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the counterbalancing schedule into a lookup file")
+    parser.add_argument('--participants', type=int, required=True, help='Number of schedule rows')
+    parser.add_argument('--ids', help='File with one participant ID per line, in enrolment order')
+    parser.add_argument('--id-format', help='Generate IDs 1..N with a format string, e.g. "P{:03d}"')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the condition splits (default: 0)')
+    parser.add_argument('-o', '--output', default=SCHEDULE_FILE, help=f'Output file (default: {SCHEDULE_FILE})')
+    args = parser.parse_args(argv)
+
+    if args.participants < 2:
+        parser.error("--participants must be at least 2 (rows are counterbalanced in pairs)")
+    participant_ids = []
+    if args.ids:
+        participant_ids = read_ids(args.ids)
+    elif args.id_format:
+        participant_ids = [args.id_format.format(i) for i in range(1, args.participants + 1)]
+    if len(set(participant_ids)) != len(participant_ids):
+        parser.error("participant IDs must be unique")
+
+    schedule = build_schedule(args.participants, participant_ids=participant_ids, seed=args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(schedule, f, ensure_ascii=False)
+    print(f"Wrote {os.path.abspath(args.output)}")
+    balance_report(schedule)
+    if args.participants % 2:
+        print("⚠ Odd number of rows: the last row has no counterbalancing partner")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
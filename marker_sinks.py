@@ -0,0 +1,278 @@
+"""
+Marker sinks for EEG event codes.
+
+ExperimentEngine.send_marker() (bloom_study/engine.py) fans every event code
+out to all configured sinks:
+
+- ParallelPortSink: the hardware trigger line (psychopy.parallel, opened
+  with open_parallel_port()), a short pulse followed by a reset to 0.
+- MmapRingSink: a memory-mapped ring buffer file that a recorder on the
+  acquisition host can tail with sub-millisecond latency. Records are packed
+  directly into the mapping, so no intermediate copies are made.
+- ConsoleSink: prints the marker, used while the parallel port is disabled.
+
+Ring file layout (all little-endian, fixed size = 64 + capacity * 48 bytes):
+
+    header (64 bytes)
+        0   4s   magic        b"BLMR"
+        4   H    version      1
+        6   H    record_size  48
+        8   I    capacity     number of record slots
+        12  I    (reserved)
+        16  Q    write_count  total records ever written
+        24  ...  (reserved, zero)
+
+    record slot i at offset 64 + i * 48, for record number n (0-based) the
+    slot is n % capacity
+        0   Q    seq            n + 1 (0 = never written)
+        8   q    perf_counter_ns  time.perf_counter_ns() of the writer
+        16  H    marker_code
+        18  H    (reserved)
+        20  i    iteration
+        24  24s  stage        UTF-8, NUL padded
+
+The writer packs the record first and then bumps write_count, so a reader
+that sees write_count == N can read records up to N - 1. A reader that falls
+more than `capacity` records behind has been lapped and skips ahead; every
+record's seq field is checked so torn or overwritten slots are detected.
+perf_counter_ns uses the system-wide monotonic clock on Linux and Windows, so
+timestamps are comparable between the writer and a reader on the same host.
+
+Reading from another process:
+
+    from marker_sinks import RingReader
+    reader = RingReader("markers.ring")
+    for record in reader.tail():
+        print(record.perf_counter_ns, record.marker_code, record.stage)
+
+or from the command line: python marker_sinks.py tail markers.ring
+"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from bloom_study.clock import RealClock
+
+RING_MAGIC = b"BLMR"
+RING_VERSION = 1
+
+HEADER_STRUCT = struct.Struct("<4sHHIIQ")
+HEADER_SIZE = 64
+WRITE_COUNT_OFFSET = 16
+WRITE_COUNT_STRUCT = struct.Struct("<Q")
+
+RECORD_STRUCT = struct.Struct("<QqHHi24s")
+RECORD_SIZE = RECORD_STRUCT.size  # 48 bytes
+
+DEFAULT_RING_CAPACITY = 4096
+
+MarkerRecord = namedtuple("MarkerRecord", ["seq", "perf_counter_ns", "marker_code", "iteration", "stage"])
+
+
+def open_parallel_port(address=0x378):
+    """Open the psychopy parallel port, or return None (with the reason printed)"""
+    try:
+        from psychopy import parallel
+        # Check if ParallelPort exists and is callable
+        if hasattr(parallel, 'ParallelPort') and callable(parallel.ParallelPort):
+            port = parallel.ParallelPort(address=address)
+            print("Parallel port initialized successfully")
+            return port
+        print("ParallelPort class not available in psychopy.parallel")
+    except Exception as e:
+        print(f"Parallel port initialization failed: {e}")
+    return None
+
+
+class ParallelPortSink:
+    """Send marker codes as a short pulse on the parallel port"""
+
+    name = "parallel_port"
+
+    def __init__(self, port, pulse_seconds=0.05, clock=None):
+        self.port = port
+        self.pulse_seconds = pulse_seconds
+        self.clock = clock or RealClock()
+
+    def send(self, timestamp_ns, marker_code, iteration, stage):
+        self.port.setData(marker_code)
+        self.clock.sleep(self.pulse_seconds)  # Brief pulse
+        self.port.setData(0)  # Reset
+
+    def close(self):
+        pass
+
+
+class ConsoleSink:
+    """Print markers instead of sending them (test mode without hardware)"""
+
+    name = "console"
+
+    def __init__(self, markers, message="[TEST MODE] Would send marker: {name} (value: {code})"):
+        self.names = {code: name for name, code in markers.items()}
+        self.message = message
+
+    def send(self, timestamp_ns, marker_code, iteration, stage):
+        print(self.message.format(name=self.names.get(marker_code, marker_code), code=marker_code))
+
+    def close(self):
+        pass
+
+
+class MmapRingSink:
+    """Write marker records into a memory-mapped ring buffer file"""
+
+    name = "mmap_ring"
+
+    def __init__(self, path, capacity=DEFAULT_RING_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self._lock = threading.Lock()
+
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Reuse an existing ring with the same geometry so readers keep their cursor
+        reuse = os.path.exists(path) and os.path.getsize(path) == size
+        self._file = open(path, "r+b" if reuse else "w+b")
+        if not reuse:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+        if reuse:
+            magic, version, record_size, ring_capacity, _, write_count = HEADER_STRUCT.unpack_from(self._map, 0)
+            reuse = (magic == RING_MAGIC and version == RING_VERSION and
+                     record_size == RECORD_SIZE and ring_capacity == capacity)
+        if reuse:
+            self._write_count = write_count
+        else:
+            self._map[:] = bytes(size)
+            HEADER_STRUCT.pack_into(self._map, 0, RING_MAGIC, RING_VERSION, RECORD_SIZE, capacity, 0, 0)
+            self._write_count = 0
+
+    def send(self, timestamp_ns, marker_code, iteration, stage):
+        stage_bytes = stage.encode("utf-8")[:24] if stage else b""
+        with self._lock:
+            n = self._write_count
+            offset = HEADER_SIZE + (n % self.capacity) * RECORD_SIZE
+            RECORD_STRUCT.pack_into(self._map, offset, n + 1, timestamp_ns, marker_code, 0, iteration, stage_bytes)
+            self._write_count = n + 1
+            WRITE_COUNT_STRUCT.pack_into(self._map, WRITE_COUNT_OFFSET, self._write_count)
+
+    def close(self):
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+                self._file.close()
+
+
+class MarkerDispatcher:
+    """Fan a marker out to every configured sink with a single timestamp"""
+
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks or [])
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def dispatch(self, marker_code, iteration=0, stage=""):
+        """
+        Send to all sinks. A failing sink does not stop the others; the errors
+        are returned as a list of (sink_name, exception).
+        """
+        timestamp_ns = time.perf_counter_ns()
+        errors = []
+        for sink in self.sinks:
+            try:
+                sink.send(timestamp_ns, marker_code, iteration, stage)
+            except Exception as e:
+                errors.append((getattr(sink, "name", type(sink).__name__), e))
+        return errors
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+class RingReader:
+    """Tail an MmapRingSink file from another process"""
+
+    def __init__(self, path, from_start=False):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, capacity, _, write_count = HEADER_STRUCT.unpack_from(self._map, 0)
+        if magic != RING_MAGIC or version != RING_VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a version {RING_VERSION} marker ring")
+        self.capacity = capacity
+        self.cursor = max(write_count - capacity, 0) if from_start else write_count
+        self.lost = 0
+
+    def write_count(self):
+        return WRITE_COUNT_STRUCT.unpack_from(self._map, WRITE_COUNT_OFFSET)[0]
+
+    def read_new(self):
+        """Return all records written since the last call"""
+        available = self.write_count()
+        if available - self.cursor > self.capacity:
+            # Lapped by the writer: the oldest records were overwritten
+            self.lost += available - self.capacity - self.cursor
+            self.cursor = available - self.capacity
+
+        records = []
+        while self.cursor < available:
+            offset = HEADER_SIZE + (self.cursor % self.capacity) * RECORD_SIZE
+            seq, timestamp_ns, code, _, iteration, stage = RECORD_STRUCT.unpack_from(self._map, offset)
+            if seq != self.cursor + 1:
+                # Overwritten while we were reading it
+                self.lost += 1
+            else:
+                records.append(MarkerRecord(seq, timestamp_ns, code, iteration,
+                                            stage.rstrip(b"\0").decode("utf-8", "replace")))
+            self.cursor += 1
+        return records
+
+    def tail(self, poll_interval=0.0005):
+        """Yield records as they are written (busy-polls the header)"""
+        while True:
+            records = self.read_new()
+            if records:
+                yield from records
+            else:
+                time.sleep(poll_interval)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] != "tail":
+        print("Usage: python marker_sinks.py tail <ring file>")
+        return 1
+
+    reader = RingReader(argv[1])
+    print(f"Tailing {argv[1]} (capacity {reader.capacity}, starting at record {reader.cursor})")
+    try:
+        for record in reader.tail():
+            latency_us = (time.perf_counter_ns() - record.perf_counter_ns) / 1000
+            print(f"#{record.seq} code={record.marker_code} iteration={record.iteration} "
+                  f"stage={record.stage} t={record.perf_counter_ns} latency={latency_us:.1f}us")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+"""
+Local OpenAI-compatible mock server for the feedback chains.
+
+Serves POST /v1/chat/completions the way api.openai.com does for the
+requests app17.py sends, so the whole LangChain path runs unchanged without
+network or cost:
+
+    python mock_llm_server.py --port 8011 --latency lognormal:-0.2,0.5 --seed 1
+    OPENAI_BASE_URL=http://127.0.0.1:8011/v1 streamlit run app17.py
+
+Replies are schema-valid for the two parsers: {"bloom_level": ...} when the
+prompt's format instructions ask for BloomClassification and
+{"suggested_question": "...?"} for QuestionSuggestion. Content is chosen
+from the participant's question, so the same request always gets the same
+answer.
+
+Latency and faults are drawn from a random generator seeded with --seed,
+the request body and how often that body has been seen, so a run is
+reproducible regardless of how concurrent requests interleave (a retry of
+the same request gets the next draw):
+
+    --latency       fixed:S | uniform:A,B | lognormal:MU,SIGMA | normal:MEAN,SD
+    --spike-rate    probability of a tail spike, which adds --spike-seconds
+    --error-rate    probability of a 429 rate limit response
+    --malformed-rate probability of a reply that is not valid JSON
+    --connect-delay seconds added to the first request of a new connection
+                    (stands in for DNS/TLS setup)
+    --idle-timeout  close keep-alive connections idle this long, as API
+                    servers and proxies do (default: never)
+
+GET /stats returns request and fault counters; GET /health returns ok.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BLOOM_LEVELS = ["기억", "이해", "적용", "분석", "평가", "창조"]
+
+RELATED_TEMPLATES = [
+    "'{concept}' 개념을 다른 상황에 적용하면 어떤 새로운 결과를 예측할 수 있을까?",
+    "'{concept}' 개념을 바탕으로 새로운 연구 방향을 제안해볼 수 있을까?",
+    "'{concept}' 개념의 한계를 보완하는 새로운 방법은 무엇일까?"
+]
+
+UNRELATED_TEMPLATES = [
+    "이 주제의 다른 측면을 새롭게 탐구할 수 있는 방법은 무엇일까?",
+    "텍스트에서 다루지 않은 관련 요소를 발전시킬 수 있을까?",
+    "이 개념을 다른 방향으로 확장해볼 수 있는 방안은 무엇일까?"
+]
+
+MALFORMED_REPLIES = [
+    "죄송합니다. 분류 결과는 다음과 같습니다: 이해",
+    '{"bloom_level": ',
+    "```json\n{\"result\": null}\n```"
+]
+
+
+def parse_distribution(spec):
+    """'lognormal:-0.2,0.5' -> function(rng) returning seconds"""
+    name, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",")] if params else []
+    if name == "fixed":
+        return lambda rng: values[0] if values else 0.0
+    if name == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if name == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    if name == "normal":
+        return lambda rng: max(rng.gauss(values[0], values[1]), 0.0)
+    raise argparse.ArgumentTypeError(f"unknown latency distribution '{spec}'")
+
+
+def last_question(prompt):
+    """The participant's question: the last 'Question:' line of the prompt"""
+    matches = re.findall(r"Question:\s*(.+)", prompt)
+    return matches[-1].strip() if matches else ""
+
+
+def stable_index(text, count):
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16) % count
+
+
+def reply_content(prompt):
+    """Schema-valid JSON for whichever parser produced the format instructions"""
+    question = last_question(prompt)
+    if '"bloom_level"' in prompt:
+        return json.dumps({"bloom_level": BLOOM_LEVELS[stable_index(question, len(BLOOM_LEVELS))]},
+                          ensure_ascii=False)
+
+    # The unrelated chain asks for questions "사용자의 질문과 무관하게"
+    templates = UNRELATED_TEMPLATES if "무관" in prompt else RELATED_TEMPLATES
+    words = [w for w in question.replace("?", "").split() if len(w) > 1]
+    concept = words[0] if words else "이 개념"
+    template = templates[stable_index(question, len(templates))]
+    return json.dumps({"suggested_question": template.format(concept=concept)}, ensure_ascii=False)
+
+
+class MockBehaviour:
+    """Seeded latency and fault injection shared by all handler threads"""
+
+    def __init__(self, latency, seed=0, spike_rate=0.0, spike_seconds=5.0, error_rate=0.0,
+                 malformed_rate=0.0, retry_after=0.5, connect_delay=0.0, idle_timeout=None):
+        self.latency = latency
+        self.seed = seed
+        self.spike_rate = spike_rate
+        self.spike_seconds = spike_seconds
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+        self.connect_delay = connect_delay
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._seen = {}
+        self.stats = {"requests": 0, "rate_limited": 0, "malformed": 0, "spikes": 0, "latency_seconds": 0.0,
+                      "connections": 0}
+
+    def rng_for(self, body):
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            count = self._seen.get(digest, 0)
+            self._seen[digest] = count + 1
+            self.stats["requests"] += 1
+        return random.Random(f"{self.seed}:{digest}:{count}")
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+
+def make_handler(behaviour):
+    class MockOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Socket timeout between requests: an idle keep-alive connection is closed
+        timeout = behaviour.idle_timeout
+
+        def setup(self):
+            super().setup()
+            self.new_connection = True
+            behaviour.count("connections")
+
+        def handle_one_request(self):
+            if self.new_connection and behaviour.connect_delay:
+                # Wait for the first request line, then charge the setup cost once
+                try:
+                    self.rfile.peek(1)
+                except TimeoutError:
+                    self.close_connection = True
+                    return
+                time.sleep(behaviour.connect_delay)
+            self.new_connection = False
+            super().handle_one_request()
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_json(self, status, payload, headers=None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                self.send_json(200, {"status": "ok"})
+            elif self.path.rstrip("/") == "/stats":
+                with behaviour._lock:
+                    self.send_json(200, dict(behaviour.stats))
+            elif self.path.rstrip("/").endswith("/models"):
+                self.send_json(200, {"object": "list", "data": [{"id": "gpt-4-0613", "object": "model"}]})
+            else:
+                self.send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+                return
+            try:
+                request = json.loads(body)
+            except json.JSONDecodeError:
+                self.send_json(400, {"error": {"message": "invalid JSON body", "type": "invalid_request_error"}})
+                return
+
+            rng = behaviour.rng_for(body)
+            delay = behaviour.latency(rng)
+            if rng.random() < behaviour.spike_rate:
+                delay += behaviour.spike_seconds
+                behaviour.count("spikes")
+            rate_limited = rng.random() < behaviour.error_rate
+            malformed = rng.random() < behaviour.malformed_rate
+
+            time.sleep(delay)
+            behaviour.count("latency_seconds", delay)
+
+            if rate_limited:
+                behaviour.count("rate_limited")
+                self.send_json(429, {"error": {
+                    "message": "Rate limit reached for requests (mock)",
+                    "type": "requests",
+                    "code": "rate_limit_exceeded"
+                }}, headers={"Retry-After": str(behaviour.retry_after)})
+                return
+
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            if malformed:
+                behaviour.count("malformed")
+                content = MALFORMED_REPLIES[rng.randrange(len(MALFORMED_REPLIES))]
+            else:
+                content = reply_content(prompt)
+
+            prompt_tokens = len(prompt) // 4
+            completion_tokens = len(content) // 4
+            self.send_json(200, {
+                "id": f"chatcmpl-mock-{hashlib.sha256(body).hexdigest()[:24]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-4-0613"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+
+    return MockOpenAIHandler
+
+
+def serve(host="127.0.0.1", port=8011, behaviour=None):
+    """Create the server (call serve_forever() on it, or run it in a thread)"""
+    behaviour = behaviour or MockBehaviour(parse_distribution("fixed:0"))
+    server = ThreadingHTTPServer((host, port), make_handler(behaviour))
+    server.daemon_threads = True
+    server.behaviour = behaviour
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock server for the feedback chains")
+    parser.add_argument('--host', default="127.0.0.1", help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8011, help='Port (default: 8011)')
+    parser.add_argument('--latency', type=parse_distribution, default=parse_distribution("lognormal:-0.5,0.4"),
+                        help='Latency distribution (default: lognormal:-0.5,0.4, median ~0.6s)')
+    parser.add_argument('--spike-rate', type=float, default=0.0, help='Probability of a tail spike (default: 0)')
+    parser.add_argument('--spike-seconds', type=float, default=5.0, help='Extra delay of a spike (default: 5)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a 429 response (default: 0)')
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help='Probability of a reply that fails the output parser (default: 0)')
+    parser.add_argument('--retry-after', type=float, default=0.5, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--connect-delay', type=float, default=0.0,
+                        help='Delay of the first request on a new connection (default: 0)')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help='Close connections idle this many seconds (default: never)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency and fault draws (default: 0)')
+    args = parser.parse_args(argv)
+
+    behaviour = MockBehaviour(args.latency, seed=args.seed, spike_rate=args.spike_rate,
+                              spike_seconds=args.spike_seconds, error_rate=args.error_rate,
+                              malformed_rate=args.malformed_rate, retry_after=args.retry_after,
+                              connect_delay=args.connect_delay, idle_timeout=args.idle_timeout)
+    server = serve(args.host, args.port, behaviour)
+    print(f"Mock OpenAI server on http://{args.host}:{args.port}/v1 (seed {args.seed})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
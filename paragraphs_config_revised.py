@@ -1,109 +0,0 @@
-"""
-Configuration file for experiment paragraphs.
-Replace these sample paragraphs with your actual stimuli before running the experiment.
-"""
-
-PARAGRAPHS = [
-    "잉카 제국은 종이와 문자를 사용하지 않고, ‘키푸(Khipu)’라는 끈과 매듭을 이용한 기록 방식을 발전시켰다. 키푸는 중심 끈에 여러 개의 가느다란 끈이 매달려 있는 형태로, 각 끈의 색깔, 위치, 꼬임 방향, 그리고 매듭의 종류와 위치를 조합하여 숫자나 정보를 표현했다. 예를 들어, 끈의 위치는 자릿수를 나타내고, 매듭의 종류는 숫자의 단위를 의미했으며, 색깔은 곡물, 인구, 조세 등 항목의 종류를 구분하는 데 사용되었다. 잉카 제국에서는 이런 방식으로 각 지방에서 정보를 수집하여 해당 내용을 수도로 보고하였고, 이를 해석하고 관리하는 키푸캄약(khipukamayuq)이라는 전문가들이 따로 존재했다. 키푸는 잉카 제국의 행정과 통치를 뒷받침한 중요한 정보 기록 도구였다.",
-    
-    "엘프어는 J.R.R. 톨킨이 『반지의 제왕』, 『실마릴리온』 등의 세계관을 구축하기 위해 창조한 인공 언어로, 대표적으로 콰냐(Quenya)와 신다린(Sindarin)이 있다. 콰냐는 고대 엘프들의 전례적 언어로 라틴어와 유사한 위상을 지니며, 정교한 문법과 복잡한 곡용 체계를 갖춘 고전어이다. 반면 신다린은 중간계에서 실질적 소통에 쓰이는 일상 언어로, 웨일스어에서 영향을 받은 음운적 특징을 지닌다. 톨킨은 이들 언어를 단순한 소품이 아닌, 독립적인 역사와 신화를 내포한 완결된 언어 생태계로 설계했다. 엘프어는 언어가 허구 세계의 정체성과 문화적 깊이를 어떻게 형성하는지를 보여주는 대표적 사례로 평가받으며, 언어 창조와 서사 구축의 융합 가능성을 입증한 선구적 작업으로도 간주된다.",
-    
-    "고대 그리스에서는 ‘시간’을 단일한 개념으로 보지 않고, 크로노스(Chronos)와 카이로스(Kairos)라는 두 가지로 구분했다. 크로노스는 시계로 측정 가능한 선형적‧양적 시간으로, 일상에서의 흐름이나 일정, 나이를 의미한다. 반면 카이로스는 특정한 의미와 전환점을 지닌 질적 시간으로, ‘때’를 직관적으로 포착하는 순간의 감각을 의미한다. 철학자 베르그송은 이러한 시간의 이중성을 통해, 인간의 내면적 경험이 정량화된 시간과는 다른 리듬으로 움직인다고 보았다. 크로노스가 ‘언제’에 주목한다면, 카이로스는 ‘왜 그 순간인가’에 질문을 던지며, 삶의 전환점과 선택의 깊이를 드러낸다. 오늘날 이 구분은 교육, 상담, 리더십, 문학 분석 등 다양한 인문학적 실천에서 재조명되고 있다.",
-    
-    "지금의 콩고 민주 공화국에 존재하던 옛 국가인 자이르의 은키시(Nkisi)는 중앙 아프리카에서 중요한 의례적 역할을 하는 상징적인 조각상이다. 은키시는 일반적으로 나무로 만들어지며, 그 안에는 철, 유리 구슬, 동물의 뼈, 약초, 금속 조각 등 여러 가지 상징적인 물건들이 삽입된다. 이 물건들은 영혼이나 신의 힘을 담고 있다고 믿어지며, 주로 의식이나 기도, 치유 활동에 사용된다. 은키시의 표면에 침을 박거나 껍질을 덧붙이기도 하며, 사람들은 이를 통해 특정 신이나 영혼과의 소통을 시도했다. 예를 들어, 치료를 원하는 사람은 은키시 앞에 가서 기도를 하거나 치유의 의식을 행한다. 은키시는 단순한 예술 작품이 아니라, 신적 존재나 영적 힘을 소환하고 통제하는 도구로서 중요한 의미를 지닌다.",
-
-    "‘신화만들기(Mythopoeia)’는 단순히 기존 신화를 분석하는 데 그치지 않고, 작가가 자신만의 신화 체계를 창조하는 창작 행위를 의미한다. 이 개념은 특히 C.S. 루이스의 『나니아 연대기』에서 잘 드러나며, 그는 고유한 존재들, 종교적 상징, 윤리적 질서를 나니아라는 유기적 세계로 구성하였다. 그의 작업은 단순한 판타지를 넘어서, 선과 악의 대립 같은 신화적 주제를 통해 인간 존재의 의미를 탐구하려는 시도였다. 이러한 미토포에시스는 고대 문명처럼 상징과 서사를 통해 세계를 설명하려는 인간의 본능과도 관련이 깊다. 현대의 문학 작품, 판타지 게임, 영화 시나리오에서도 미토포에시스는 중요한 내러티브 기법으로 활용되며, 이는 신화가 여전히 살아 있는 사유 방식임을 보여준다.",
-
-    "8세기 후반 바그다드에는 ‘지혜의 집(Bayt al-Hikma)’이라는 지식 집약 기관이 설립되어, 고대 그리스의 철학과 자연과학 문헌을 아랍어로 번역하는 대규모 작업이 이루어졌다. 이 번역은 단순히 언어를 바꾸는 것이 아니라, 플라톤, 아리스토텔레스, 히포크라테스 등의 사상을 해석하고 보완하며 새로운 학문 체계를 세우는 과정이었다. 특히 알 킨디, 알 파라비, 이븐 시나 같은 학자들은 기존 지식에 이슬람적 사유를 접목시켜 독창적인 철학과 과학 이론을 전개하였다. 이러한 아랍의 지적 유산은 12세기경 라틴어로 다시 번역되어 유럽의 르네상스 운동에 결정적 기여를 하였다. 이 사례는 지식의 전승과 창조가 문화 간의 활발한 교류와 해석을 통해 가능함을 보여준다.",
-
-    "텍스트 외 존재론(Ontology Outside of Text)은 해체주의 이후의 철학과 문학이론에서 등장한 개념으로, 언어 바깥의 세계와 경험을 이해하려는 시도를 말한다. 기존의 문학 이론은 주로 언어, 기호, 담론을 통해 인간의 현실을 해석했지만, 이 이론은 그것만으로는 설명되지 않는 실제 삶의 층위를 강조한다. 데리다의 해체론이 모든 의미는 언어 안에서 차이와 지연으로 구성된다고 본 반면, 텍스트 외 존재론은 언어로 포착되지 않는 감각, 몸, 침묵 같은 요소들에도 주목한다. 이 관점은 예술이나 문학에서 말로 설명되지 않는 감정이나 경험을 이해하는 데 도움을 준다. 결국 텍스트 외 존재론은 언어 중심의 사고에서 벗어나 인간 존재에 대한 보다 폭넓은 이해를 추구한다.",
-
-    "포스트휴먼 윤리학(posthuman ethics)은 인간 중심의 전통적 윤리관을 넘어서, 인공지능, 로봇, 유전자 조작 생명체 같은 비인간적 존재들을 도덕적으로 고려하려는 새로운 윤리학의 흐름이다. 이 윤리는 인간이라는 범주가 기술과 생물학의 발달로 인해 바뀌고 있다는 사실에서 출발한다. 특히 도나 해러웨이의 '사이보그 선언'이나 로지 브라이도티의 이론처럼, 인간과 비인간 사이의 경계가 흐려지는 사회에서 새로운 윤리적 기준이 필요하다고 주장한다. 포스트휴먼 윤리학은 더 이상 인간만이 도덕적 주체라는 생각을 벗어나, 다양한 존재들과의 관계 속에서 책임과 배려를 논의한다. 미래 사회에서 이 윤리는 인공지능이나 생명공학 기술과 관련된 복잡한 결정들을 내리는 데 중요한 기준이 될 수 있다.",
-
-    "포스트식민주의 문학은 제국주의 시대 이후 식민 지배의 영향을 받은 국가의 문화적 정체성과 저항을 다룬다. 이 문학은 주로 정체성, 언어, 권력의 문제를 중심으로 식민 지배를 겪은 사람들의 목소리를 대변한다. 친누아 아체베, 살만 루슈디 등이 대표적인 포스트식민주의 문학 작가들이며, 이들의 작품을 통해 식민주의의 잔재가 개인의 삶과 사회에 미치는 지속적인 영향을 비판적으로 탐구할 수 있다. 또한 포스트식민주의 문학은 주로 미국과 유럽의 백인 남성 시각에서 쓰인 기존 서구 중심의 문학적 기준에 도전함으로써 문학과 역사 해석의 다원성을 촉진하였다. 이를 통해 현대 문학 연구와 교육 과정에서 다문화적 접근과 상호 이해의 중요성을 강조하는 데 큰 역할을 수행하고 있다.",
-    
-    "도시 공간은 단순한 물리적 배치가 아니라, 자본과 계층에 따라 구획된 사회적 구조다. 고소득층은 조망권이 뛰어나고 중심 상업지구와 가까운 고층 아파트 단지에 거주하는 반면, 저소득층은 교통이 불편하거나 환경이 열악한 외곽 지역에 밀집되기 쉽다. 심지어 같은 지하철역이라도 출구 번호에 따라 분위기와 이미지가 달라지고, 지역 브랜드 인식도 크게 다르다. 공공시설, 녹지, 문화 공간의 분포 역시 자원 배분의 불균형을 그대로 반영하며, 이로 인해 주거 환경 자체가 계층의 상징이 되기도 한다. 이렇게 공간은 계층을 가시화하고, 일상의 이동과 관계 형성, 나아가 교육·노동 기회에도 영향을 미치며 사회적 격차를 더욱 고착화시키는 중요한 사회학적 요인이 된다.",
-
-    "코그니타리아트는 후기 자본주의 체제에서 인지, 정동, 창의성을 중심 자산으로 동원당하는 신(新)노동계급을 지칭하는 개념이다. 이들은 비물질적 노동의 수행 주체로서, 디지털 네트워크에 매개된 작업 환경 속에서 자기표현과 성과 창출의 무한한 자기책임성을 강요받는다. ‘자유로운 창조자’라는 표상 이면에는 플랫폼 자본주의가 조장한 노동의 유연화와 생계의 불확실성이 구조적으로 깊게 내재되어 있다. 이로써 코그니타리아트는 근대적 프롤레타리아트와 달리, 신자유주의적 자아 기술을 통해 자기 착취에 스스로를 능동적으로 동원하게 되는 존재로 전락한다. 이 개념은 노동의 본질이 물질에서 정보로 이행함에 따라, 권력과 저항의 지형 또한 근본적으로 재편되고 있음을 날카롭게 시사한다.",
-
-    "스마트폰이나 검색 엔진의 보편화로 인해, 우리는 점점 더 많은 정보를 스스로 기억하기보다 디지털 기기에 저장하거나 필요할 때 검색하는 방식에 의존하고 있다. 뇌가 정보를 저장하기보다 검색 경로를 기억하려는 방향으로 작동하는 이러한 현상은 ‘디지털 기억 외주화’로 불린다. 실제로 실험에 따르면, 어떤 정보를 검색을 통해 쉽게 찾을 수 있다고 인식한 사람은 그 내용을 장기 기억으로 옮기지 않고 더 빨리 잊는 경향이 있었다. 이처럼 반복적인 외주화는 뇌의 기억 저장에 관여하는 부위인 해마의 활동을 줄임으로써 기억력과 사고력 발달에 영향을 줄 수 있다는 우려의 목소리도 있다. 편리함을 추구하는 것을 넘어 뇌가 정보를 다루는 방식 자체에 점진적인 변화가 생길 수 있다는 것이다.",
-
-    "배달 앱, 택시 호출 서비스 등 디지털 플랫폼 기반의 노동이 확산되면서, 이른바 ‘플랫폼 노동자’의 권리 문제가 대두되고 있다. 플랫폼 노동자는 형식상 개인사업자로 분류되지만, 실제로는 플랫폼 기업이 정한 시스템에 따라 업무를 수행하기 때문에 종속적인 노동 관계에 있는 경우가 많다. 그럼에도 불구하고 법적으로는 '근로자'로 인정받지 못해, 최저임금, 주휴수당, 산업재해 보상 등에서 보호를 받기 어렵다. 정해진 시급이나 유급 휴일을 보장받지 못하고, 사고나 질병이 발생해도 산재 보상을 청구할 근거가 부족한 것이다. 이에 따라 일정 기준 이상의 노동 시간을 충족한 플랫폼 노동자에게는 고용보험 가입을 의무화하거나, 산재 보상 책임을 플랫폼 기업에게 부과하는 등의 제도 개선 요구가 확산되고 있다.",
-
-    "리퀴드 모더니티(liquid modernity)는 지그문트 바우만이 제시한 개념으로, 현대 사회의 유동성과 불확실성을 설명한다. 고체적 근대가 견고한 제도와 안정된 정체성을 기반으로 했다면, 리퀴드 모더니티는 관계, 노동, 소비 방식 모두가 유동적이며 일시적인 특성을 띤다. 리퀴드 모더니티를 보이는 사회는 개인에게 유연성과 선택의 자유를 제공하지만, 동시에 지속적인 자기 재구성과 정체성의 불안을 초래한다. 이 개념은 글로벌화, 디지털화, 개인화가 지배적인 시대에서 사회적 연대와 소속감의 해체를 분석하는 데 효과적으로 활용될 수 있다. 따라서 리퀴드 모더니티는 현대인의 삶의 조건을 해석하고 사회 정책의 방향을 모색하는 데 중요한 이론적 틀을 제공한다.",
-
-    "예측 처리 이론(predictive processing theory)은 인간의 뇌가 외부 자극을 받아들이기만 하는 수동적 기관이 아니라, 끊임없이 미래의 감각 정보를 예측하고 그 예측이 실제 감각 정보와 얼마나 일치하는지를 비교하면서 작동한다고 설명한다. 즉, 뇌는 예상과 다른 정보가 들어올 때 그 오류를 수정해나가는 방식으로 작동한다. 예측이 잘 맞으면 뇌의 에너지 사용은 줄어들고, 오류가 있으면 더 많은 자원이 동원되어 환경에 대한 새로운 모델을 학습하게 된다. 이 이론은 ‘정보가 입력되고 처리된다’는 고전적 인지 이론과 달리, 뇌가 능동적으로 세계를 구성한다는 관점의 전환을 보여준다. 또한, 주의, 정서, 자아감 형성과 같은 복잡한 심리 현상까지 설명할 수 있는 인지 모델을 제공한다.",
-
-    "시간 불일치(time inconsistency)는 사람들이 미래에 대해 계획할 때는 매우 합리적인 선택을 하더라도, 실제로 그 시간이 가까워지면 전혀 다른 비합리적인 행동을 하게 되는 현상을 설명한다. 예를 들어, 사람들은 ‘다음 달부터 매일 운동하겠다’고 계획하지만, 막상 그 시기가 오면 운동 대신 쉬는 것을 선택하는 경향이 있다. 이처럼 현재의 욕구가 미래의 계획을 압도하는 심리적 경향은 전통적인 경제학의 ‘합리적 행위자’ 가정에 대한 중요한 반례로 작용한다. 행동경제학에서는 이러한 시간 불일치를 극복하기 위해 유인 설계, 자동 저축 제도, 기한 설정 등 다양한 전략을 제안한다. 이 개념은 소비, 저축, 건강 행동, 정책 설계 등 매우 다양한 경제 현상을 이해하는 데 통찰을 제공한다.",
-
-    "상황학습(situated learning) 이론은 우리가 지식을 단순히 외우고 기억하는 것이 아니라, 특정한 사회문화적 맥락 속에서 ‘참여’와 ‘경험’을 통해 의미 있게 배운다는 관점이다. 이는 전통적인 교실 중심의 교육 방식보다 실제 문제를 해결하거나 공동체 내에서 활동하면서 배우는 방식을 강조하며, 배움의 효과성과 지속성을 높일 수 있다. 예를 들어, 도제식 학습이나 문제 기반 학습, 지역사회 참여 프로젝트 등은 모두 이러한 이론을 바탕으로 설계된 실제적인 학습 전략이다. 이 관점에서는 지식이 고립된 정보가 아니라, 사회적 상호작용과 문화적 배경 속에서 구성되는 것으로 본다. 학습자는 단순히 수동적인 수용자가 아니라, 맥락에 적응하고 변화시키는 능동적 참여자로 인식된다.",
-
-    "상변태 물질(Metamaterials)은 자연에 존재하지 않는 전자기적 성질을 갖도록 정밀하게 설계된 구조 기반 물질이다. 이들은 기본 성분이 아닌, 미세한 구조 배열을 통해 음의 굴절률, 빛의 왜곡, 투명화 같은 특이한 물리 현상을 유도한다. 예컨대 특정 주파수의 전자기파를 피하거나 휘게 만들어 ‘투명 망토’와 같은 응용이 이론적으로 가능하며, 실험에서도 구현 사례가 있다. 이러한 특성은 레이더 회피, 고성능 안테나, 초고해상도 렌즈, 음향 조절 장치 등 다양한 미래 기술의 핵심이 된다. 상변태 물질은 물질의 본질이 고정된 것이 아니라 설계될 수 있다는 점에서, 자연에 대한 인간 개입과 인식의 한계를 다시 묻는 과학적‧철학적 실험이자, 공상과학적 상상이 현실화되는 통로로 주목받고 있다.",
-
-    "초국가적 시민권이란 한 개인이 특정 국가의 경계를 초월하여 글로벌 시민으로서 가지는 권리와 책임을 의미하는 것으로 세계화와 국제 이주가 증가함에 따라 그 중요성이 더욱 커지고 있다. 이 개념은 다양한 국가와 문화를 넘어서는 소속감과 협력을 강조하며, 국제적 문제에 공동으로 대응하는 기반을 마련한다. 초국가적 시민권은 인권과 사회 정의를 전 세계적 관점에서 지키고 증진하는 역할을 한다. 또한, 다문화에 대한 이해와 글로벌 책임감을 높여 모두가 함께 살아가는 사회를 만드는 데 기여한다. 특히, 초국가적 시민권은 국제적 위기 상황에서 인도적 지원과 협력을 촉진하는 데 중요한 역할을 한다. 초국가적 시민권은 복잡해지는 국제 사회에서 평화와 협력을 위한 핵심 가치로 자리 잡을 것이다.",
-    
-    "우주에서의 생체분자 안정성은 극저온, 고에너지 방사선, 진공, 미세중력 등 극한 조건에서도 단백질, 핵산, 지질막 등이 구조와 기능을 유지하도록 하는 분자 수준의 과학적 도전이다. 이러한 환경에서는 단백질의 비정상적 응집, DNA의 가닥 절단, 세포막의 탈수와 붕괴가 발생하기 쉬워 생명 유지가 매우 어렵다. 이를 극복하기 위해 트레할로스 같은 보호 물질, 방사선 차폐용 고분자, 극한 생물 유래 안정화 단백질, 나노입자 기반의 균일 열 제어 기술 등이 정밀하게 연구되고 있다. 이와 같은 안정화 기술은 생명체의 우주 내 보존뿐 아니라, 인공 생명 시스템 구축과 유전자 장기 보관에도 필수적이다. 결국 이는 우주 생명공학의 핵심 기반이자, 생명 지속 가능성에 대한 분자적 해석을 가능하게 한다.",
-
-    "세균은 개별적으로 행동하는 것처럼 보이지만, 실제로는 화학 신호를 주고받으며 집단적으로 움직인다. 이 과정을 '쿼럼 센싱'이라고 한다. 세균은 주변에 같은 종류의 세균이 얼마나 많은지 화학 물질의 농도를 통해 감지한다. 일정 수 이상의 세균이 모이면, 이 신호가 일정 기준치에 도달하고, 그때부터 세균들은 한꺼번에 유전자를 활성화시켜 독소를 분비하거나, 생물막을 형성하는 등 집단적 행동을 시작한다. 예를 들어, 폐렴이나 식중독을 유발하는 세균들은 쿼럼 센싱을 통해 공격 시점을 조절함으로써 방어를 피해 더 효과적으로 숙주를 감염시킨다. 쿼럼 센싱은 세균에게 있어 신호를 읽고 함께 행동하는 일종의 커뮤니케이션 방식인 셈이다. 이로 인해 세균 집단은 마치 하나의 유기체처럼 행동할 수 있다.",
-
-    "식물의 뿌리는 특정 주파수의 소리나 진동에 민감하게 반응한다. 연구에 따르면, 약 40Hz에서 500Hz 사이의 주파수는 뿌리의 성장을 촉진하거나 억제하는 데 영향을 준다. 이러한 진동은 식물이 영양분을 찾는 과정에서 중요한 역할을 한다. 예를 들어, 뿌리는 주변 환경에서 발생하는 미세한 물리적 진동을 감지하고, 자원이 풍부한 쪽으로 뿌리를 더 깊게 성장시킨다. 또한, 식물은 진동을 통해 병원균의 존재나 외부 위협을 감지하고 방어적인 반응을 활성화시키기도 한다. 이처럼 식물은 외부의 물리적 자극인 진동을 환경에 적응하는 중요한 신호로 활용하며 이에 적응적으로 반응한다. 이러한 반응 메커니즘은 식물 생태계 내에서 상호작용과 생존 전략에 중요한 역할을 하는 것으로 여겨진다.",
-
-    "최근 연구에 따르면, 나뭇잎소리, 새소리, 물소리와 같은 자연의 소리를 듣는 것만으로도 스트레스 수치가 낮아지고 집중력이 향상될 수 있다고 한다. 실험 참가자들이 인공적인 도시 소음과 자연의 소리를 각각 들었을 때, 자연의 소리를 들은 그룹은 심박수와 코르티솔 수치가 낮아졌고, 주의 전환 속도와 기억력에서 더 높은 성과를 보였다. 연구자들은 자연의 소리가 뇌의 주의 회복 시스템을 자극해, 과도한 정보 처리에서 벗어나게 돕는다고 설명한다. 이는 단순히 조용한 환경이 주는 효과가 아니라, 자연 특유의 리듬과 패턴이 신경계에 긍정적 영향을 주기 때문으로 보인다. 이러한 연구 결과는 일상생활에서 자연 소리를 의도적으로 접하는 것이 정신 건강 증진에 실질적인 도움이 될 수 있음을 시사한다.",
-
-    "극한 내성 미생물은 고온, 고염, 고산소 결핍, 방사선 환경 등 일반 생물이 생존할 수 없는 환경에서도 살아가는 생물로, '극한균(extremophile)'이라고 불린다. 이와 같은 미생물은 열수분출공, 남극 빙하, 사막의 소금호수 등에서 발견되며, 극한의 환경에서 생존할 수 있게 하는 생리학적 특성은 생명에 대한 정의 자체를 확장시켰다. 일부 극한균은 DNA 복구 능력이 탁월하거나, 세포막 구조가 극한 환경에 최적화되어 있다. NASA와 같은 기관은 외계 생명 탐사에서 이들을 지구 밖 생명체의 모델로 삼고 있으며, 산업적으로도 고온효소 생산 등에서 활용 가능성이 높다. 극한 내성 미생물과 같은 존재는 생명의 기원, 진화, 생존 조건에 대해 새로운 질문을 던지게 만든다.",
-
-    "유전자 가위 기술, 예를 들어 CRISPR-Cas9 시스템은 특정 DNA 염기서열을 정밀하게 절단하고 편집할 수 있게 하여 생명과학 연구에 혁신을 가져왔다. 이 기술은 바이러스에 대항하는 박테리아의 면역 체계에서 유래되었으며, 연구자들은 이를 활용해 유전병 치료, 작물 개량, 생물 다양성 보존 등 다양한 분야에 적용하고 있다. 유전자 가위 기술은 기존의 유전자 조작 기술보다 훨씬 간편하고 저렴하며, 편집의 정밀도가 높아 다양한 생물학적 연구에 핵심 도구로 자리잡고 있다. 하지만 생식세포 유전자 편집과 관련된 윤리적 논쟁, 생태계에 미치는 영향 등에 대해서는 여전히 활발한 논의가 진행 중이다. CRISPR는 생명과 기술, 윤리가 얽힌 복합적 문제들을 우리에게 제기한다.",
-
-    "지질학적 시간은 수백만 년에서 수십억 년에 이르는 광대한 시간 범위를 가리키며, 인간의 일상적인 시간 감각으로는 쉽게 이해하기 어려워 ‘딥 타임(deep time)’이라는 개념이 사용된다. 이처럼 압도적인 시간 흐름을 설명하기 위해, 지질학자들은 암석의 지층, 방사성 동위원소 연대 측정, 화석 분포, 판 구조 운동 같은 자료를 분석해 지구의 과거를 재구성한다. 예를 들어, 대륙의 이동이나 대멸종 사건 같은 현상은 오랜 시간 축에서만 그 원인과 의미가 드러난다. 이런 이해는 지구가 점진적인 변화를 거쳐 현재에 이르렀음을 보여주며, 기후 변화나 생태계 위기 역시 장기적 관점에서 접근해야 함을 시사한다. 결국, 지질학적 시간은 자연 현상을 더 깊고 넓은 시야로 해석하게 해준다고 볼 수 있다.",
-
-    "인공 광합성은 태양 에너지를 이용해 물과 이산화탄소로부터 화학 에너지를 생성하는 기술이다. 이는 환경 오염 문제를 해결하고 지속 가능한 에너지원을 제공할 가능성을 지닌 혁신적인 기술로 주목받고 있다. 인공 광합성 기술은 실제 식물이 광합성을 통해 에너지를 얻는 과정을 모방하여 개발되었으며, 태양 전지보다 에너지 변환 효율이 높고 이산화탄소 저감에도 직접적으로 기여할 수 있다. 특히 이 기술은 청정 연료 생산, 친환경 화학 공정 등 에너지 및 환경 산업 전반에서 활용 가능성이 높다. 현재는 해당 기술의 효율성과 상용화 가능성을 극대화하기 위한 다양한 촉매제와 재료 개발에 대한 연구가 이루어지고 있다. 향후 이 기술이 기후 변화 대응과 탄소 중립 실현에 크게 이바지할 것으로 기대된다.",
-    
-    "소프트 로봇은 딱딱한 금속이 아닌 고무, 실리콘, 젤 등 유연한 소재로 구성된 로봇으로, 기존 로봇이 어려워하던 섬세한 동작이나 좁은 공간 진입, 충돌 회피 등에 특화되어 있다. 사람의 근육처럼 구부러지고 늘어나는 구조를 지니며, 생체 모사 기술을 기반으로 연체동물이나 식물의 움직임을 모방하는 경우도 많다. 의료용 로봇 팔, 재활 기기, 장기 내시경, 극한 환경 탐사용 로봇 등에서 활용도가 높아지고 있으며, 기존 기계 중심 로보틱스와는 다른 유연성과 적응력을 추구한다. 제어 방식 또한 기존의 정밀 좌표 기반 제어가 아니라 압력, 신축 센서, AI 예측 제어 등이 복합적으로 사용된다. 소프트 로봇은 기계의 개념을 재정의하며, 생물처럼 '움직이는' 존재로서의 로봇 가능성을 확장하고 있다.",
-
-    "건축 음향 설계는 소리의 반사, 흡수, 확산을 조절해 공연장, 강의실, 도서관 등 특정 공간에서 소리의 질을 최적화하는 정밀한 작업이다. 음향은 단순한 소리 전달을 넘어 사용자 경험과 공간의 목적 달성에 직접적인 영향을 미치는 핵심 요소다. 벽면 재료, 천장 높이, 구조의 곡률, 빈 공간의 유무는 음파의 전달 방식에 큰 영향을 미치며, 이를 정밀하게 계산하고 설계하는 것이 전문 음향 공학자의 역할이다. 최근에는 고해상도 시뮬레이션 기술을 활용해 건축 전 단계에서 가상 음향 테스트를 진행하고, 잔향 시간, 명료도, 반사 강도 등을 수치화하여 공간별 최적 해법을 도출하고 있다. 보이지 않지만 들리는 소리의 질은 건축의 기능성과 완성도를 결정짓는 중요한 공학적 변수다.",
-
-    "탄소중립을 실현하기 위한 노력의 일환으로, 에너지 소비를 최소화하는 친환경 설계가 주목받고 있다. 대표적인 예로, 패시브 하우스는 외부의 더위와 추위를 효과적으로 차단하는 단열 설계, 틈새를 최소화해 공기 누출을 막는 기밀 구조, 그리고 실내에서 빠져나가는 열을 재활용해 외부 공기를 데우는 환기 시스템을 갖추어 냉난방 에너지를 획기적으로 줄이는 건축 방식이다. 이러한 건물은 일반 주택에 비해 에너지 소비를 최대 90%까지 줄일 수 있다. 특히 고효율 단열 소재와 태양광, 지열 등 재생에너지 시스템을 접목한 설계가 확산되면서, 탄소 배출 저감에 실질적인 기여를 하고 있다. 친환경 건축은 단순한 기술 적용을 넘어, 인간과 환경이 공존하는 지속 가능한 삶의 방식으로 자리잡아 가고 있다.",
-
-    "양자 컴퓨팅은 기존의 이진법 기반 컴퓨터와 달리, 정보를 0과 1의 중첩 상태로 표현하는 큐비트(qubit)를 이용해 연산을 수행한다. 큐비트는 동시에 0이면서 1인 상태를 가질 수 있어, 복잡한 계산을 병렬로 처리할 수 있어 기존 컴퓨터보다 계산 속도가 빠르다. 이러한 특성 덕분에 양자 컴퓨터는 신약 개발, 기후 모델링 등 막대한 연산이 필요한 분야에서 혁신적인 성과를 낼 수 있다. 하지만 양자 컴퓨팅의 압도적인 계산 능력은 새로운 위험도 동반한다. 예를 들어, 현재 널리 사용되는 암호 체계는 양자 알고리즘에 의해 쉽게 해독될 수 있어 보안 면에서 취약하다. 이에 따라 양자 컴퓨터 환경에서도 안전한 암호 방식을 마련하려는 ‘양자 내성 암호’ 등 새로운 보안 기술 개발이 진행 중이다.",
-
-    "3D 프린팅은 디지털 설계 파일을 기반으로 한 층씩 재료를 쌓아가며 실물 물체를 형성하는 적층 제조(additive manufacturing) 기술이다. 전통적인 절삭 가공 방식과 달리, 필요한 부분만을 정밀하게 제작하므로 재료 낭비가 적고 복잡한 형상도 손쉽게 구현할 수 있다. 의료 분야에서는 환자의 신체에 맞춘 맞춤형 보형물이나 수술 도구를 제작하는 데 활용되며, 건축 분야에서는 구조적 실험이나 프로토타입 설계에 응용되고 있다. 우주산업에서는 달이나 화성에서 얻은 자원을 이용한 현장 제조 가능성이 탐색되고 있으며, 최근에는 생체 조직을 인쇄하는 바이오 프린팅 기술도 주목받고 있다. 이처럼 3D 프린팅은 생산 방식과 소비 방식 자체를 근본적으로 재정의하는 혁신적 기술로 평가받는다.",
-
-    "엣지 컴퓨팅(edge computing)은 데이터를 중앙 집중형 서버가 아닌 데이터가 발생하는 물리적 지점에 근접한 위치에서 실시간으로 처리하는 기술이다. 이에 따라 네트워크 지연을 줄이고 데이터 전송량을 감소시켜 에너지 소비를 최적화할 수 있다. 이 방식은 전력 사용이 분산되는 구조를 가져, 탄소 배출 감소와 같은 지속가능성 측면에서 많은 기대를 받고 있다. 그러나 엣지 컴퓨팅 인프라가 확산될수록 처리 장비의 수가 증가하고, 지역별 전력망의 불균형이나 전자폐기물의 증가와 같은 새로운 문제가 발생할 수 있다. 따라서 이 기술의 지속가능성을 면밀히 평가하려면 에너지 사용량뿐 아니라 장비의 수명주기 분석, 소재 재활용 가능성, 열 방출량 등 복합적인 환경 지표를 통합적으로 고려해야 한다.",
-
-    "자기치유 콘크리트(self-healing concrete)는 콘크리트 구조물에 균열이 발생하더라도 내부의 복원 메커니즘이 작동하여 스스로 파손 부위를 복구할 수 있도록 설계된 지능형 건축 자재다. 이 기술은 박테리아가 석회석을 생성하거나, 고분자 캡슐이 외부 자극에 반응해 복합 물질을 분출하는 등의 원리를 활용하여, 수분과 공기 침투를 막고 구조적 안정성을 연장시키는 방식으로 작동한다. 자기치유 콘크리트는 유지보수 주기를 줄이고 인프라의 전체 수명을 늘리는 데 기여하지만, 초기 제조 비용 증가, 성능의 일관성 확보 문제 등의 한계 역시 존재한다. 특히 극한 온도와 습도, 반복 진동 등 특수한 조건에서도 일관된 치유 성능을 발휘할 때, 지속가능한 도시 인프라를 구현하는 데 기여할 수 있다.",
-
-    "디지털 트윈(digital twin)은 물리적인 도시 환경과 실시간으로 연결된 가상 모델을 생성하여, 도시의 다양한 요소들을 모니터링하고 시뮬레이션할 수 있도록 해주는 기술이다. 이 시스템은 교통 흐름, 에너지 사용량, 공공 안전, 환경 변화 등 도시 전반의 데이터를 실시간으로 수집하고 분석하여, 스마트 도시 설계에서 도시 운영의 효율성을 향상시킬 수 있다. 즉 도시계획의 시나리오를 사전에 시뮬레이션하고 정책 시행 전의 영향을 예측함으로써, 보다 신중하고 투명한 의사결정을 가능하게 한다. 그러나 성공적 작동을 위해서는 개인정보 보호 문제, 이해관계자 간 운영 권한 배분, 기술 접근성 격차 해소 같은 사항도 고려되어야 한다. 이에 따라 디지털 트윈은 도시 거버넌스의 근본적 전환을 촉진한다.",
-
-    "스마트 그리드는 전기를 효율적으로 사용 및 관리할 수 있도록 만든 전력망이다. 기존의 전력망이 단방향으로 전기를 공급하는 방식이었다면, 스마트 그리드는 정보통신기술을 활용해 전력의 생산과 소비 정보를 실시간으로 주고받으며 관리한다. 예를 들어, 사용자가 전기를 많이 쓰는 시간대를 피해 에너지를 사용할 수 있도록 조정하거나, 가정에서 직접 생산한 태양광 전기를 이웃과 거래하는 것도 가능하다. 이처럼 스마트 그리드는 전력 수요와 공급을 실시간으로 조절하고, 재생 가능 에너지원을 효율적으로 통합함으로써 에너지 효율을 크게 높이며 전력 사용의 투명성과 안전성을 향상시킨다. 앞으로 스마트 그리드 기술이 더욱 발전하면 에너지 자립형 도시를 구축하고 탄소중립을 실현하는 데 중요한 역할을 하게 될 것이다.",
-    
-    "우키요에(浮世絵)는 에도 시대 일본에서 발전한 목판화 예술로, 유곽 여성, 가부키 배우, 풍경 등 당대 도시인의 삶을 묘사한 대중적이고 반복 생산이 가능한 이미지 형식이었다. 이 장르의 특징 중 하나는 여백의 적극적 활용으로, 화면의 비어 있는 공간은 단순한 공백이 아니라 감정의 여운과 시간의 흐름을 시각화하는 장치로 기능했다. 여백은 대상 사이의 긴장을 형성하거나, 정지된 순간 속에서 움직임과 정서를 암시하며, 관객의 시선을 유도하는 동시에 멈추게 한다. 이러한 구성은 서양 회화의 중심 구도와 삼차원적 공간 구성과는 달리, 중첩된 시선과 순환적 시간감각을 강조하는 동아시아적 시지각과 맞닿아 있다. 우키요에의 여백은 시각적 침묵의 형태로, 보이지 않는 감각을 시적으로 드러내는 미학적 전략이었다.",
-
-    "시타르(Sitar)는 북인도 힌두스타니 음악을 대표하는 발현악기로, 주로 라가(Rāga) 체계에 따라 연주되며, 감정과 시간대에 맞춘 정교한 선율 표현을 목표로 한다. 시타르는 휘어진 넥 위에 가변형 프렛과 6-7개의 연주 현, 그리고 그 아래 11-13개의 공명현이 배치되어 있어, 연주자가 건드리지 않은 줄도 함께 울림을 만든다. 이 공명현은 특정 음정에서 공진하며, 시타르 특유의 깊고 신비로운 울림과 공간감을 형성한다. 연주는 좌식 자세에서 손가락과 미즈라브라 불리는 금속 피크를 사용해 이루어지며, 미세한 음 높이 변화, 글리산도, 드론을 통해 감정을 섬세하게 구현한다. 시타르는 단순한 선율 악기를 넘어, 즉흥성, 명상성, 철학적 정조를 아우르는 사운드 수행의 도구로 여겨진다.",
-
-    "판소리는 단순히 노래만 하는 전통예술이 아니다. 소리꾼은 극 중 등장인물들의 대사와 이야기의 배경 및 상황을 설명하는 내레이션을 모두 혼자 소화하면서, 다양한 표정과 몸짓을 통해 이야기를 입체적으로 전달한다. 이러한 연기적 요소를 '너름새'라고 부르며, 이는 소리꾼의 해석 능력과 표현력을 보여주는 핵심적인 부분이다. 너름새는 관객의 몰입도를 높이고 극의 분위기를 생생하게 살리는 데 중요한 역할을 하며, 같은 대목도 소리꾼에 따라 전혀 다르게 느껴지게 할 수 있다. 소리꾼이 대사를 전달하는 방식에 따라 동일한 이야기가 때론 애절하게, 때론 유머러스하게 느껴질 수 있기 때문이다. 이처럼 판소리는 노래, 이야기, 연기가 결합된 종합 공연예술로서, 소리꾼의 예술성과 즉흥성이 빛나는 무대다.",
-
-    "19세기 이후 등장한 합성 안료(synthetic pigment)들은 회화적 표현 변화의 새로운 재료적 조건을 제공했다. 예컨대 크롬 옐로우나 코발트 블루 같은 안료는 이전의 천연 색소보다 더 밝고 선명하며, 자외선에도 잘 견뎌 야외 풍경을 강렬한 색감으로 표현하는 인상주의 화풍을 가능하게 했다. 이 안료들은 건조 속도, 입자 크기, 투명도 등에서도 다양한 특성을 지녀, 예술가가 물감의 두께나 질감을 조절하는 방식에도 영향을 미쳤다. 모네, 반 고흐, 마티스 등은 안료의 물리적 성질을 회화적 실험의 도구로 적극 활용하여, 빛과 대기의 순간적 변화를 즉흥적으로 포착하는 작업을 전개했다. 이와 같이 합성 안료의 등장은 기술의 발전이 예술 표현의 가능성을 어떻게 확장할 수 있는지를 보여준다.",
-
-    "미디어 아트는 디지털 기술과 예술 표현이 융합된 형태로, 관객의 적극적인 참여와 반응을 작품의 주요 구성 요소로 활용한다. 센서, 카메라, 알고리즘 등 다양한 기술을 통해 관람자의 움직임, 소리, 위치에 따라 작품이 실시간으로 변형되는 인터랙티브 요소가 두드러진다. 이러한 작품은 시각적인 감상에 그치지 않고, 관객의 몸짓과 감정이 예술적 서사를 함께 만들어가는 경험을 제공한다. 대표적인 사례로 일본의 ‘팀랩(teamLab)’은 몰입형 디지털 전시를 통해 공간, 소리, 빛이 관람자의 행동에 따라 유기적으로 변화하는 예술을 구현하고 있다. 이처럼 미디어 아트는 기술과 감성의 융합을 바탕으로 예술의 정의와 감상의 방식을 확장시키며 현대 예술의 경계를 허물고 있다.",
-
-    "현대무용에서는 과거의 안무가 중심의 구성 방식에서 벗어나, 무용수 개개인의 즉흥적 움직임이나 신체의 고유한 리듬을 바탕으로 안무를 창작하는 새로운 방식이 주목받고 있다. 이 과정은 모션 캡처 기술이나 인공지능 알고리즘과 결합하여 움직임 데이터를 수집하고 이를 분석하여 새로운 동작을 생성하는 방식으로 발전하고 있다. 예를 들어, 무용수가 주제에 맞춰 자유롭게 움직이면 알고리즘이 해당 움직임을 해석하고 이를 바탕으로 창의적인 안무 조합을 생성하는 시스템이 활용된다. 이러한 창작 방식은 인간의 감성과 기계의 계산이 협력하여 예술을 만들어내는 새로운 패러다임을 제시한다. 결국, 움직임 기반 안무는 테크놀로지와 예술, 창작자와 해석자 간의 경계를 허무는 현대 무용의 실험적 접근이라고 할 수 있다.",
-
-    "사운드 아트(sound art)는 소리를 단순한 청각 정보로서가 아니라 조형적이고 개입적인 예술 요소로 다루며, 감각과 공간 사이의 역동적인 상호작용을 중심으로 구성되는 현대 예술 장르이다. 이 예술 형식은 관람자가 특정한 소리의 방향성, 강약, 잔향 등 청각적 단서를 통해 공간을 재구성하고 새롭게 인식하게 만든다. 사운드 아트는 종종 건축학, 음향공학, 심리학 등과 협업하여 보다 정밀한 음향 환경을 구성하며, 이를 통해 관람자의 몰입을 유도한다. 이러한 방식은 특히 특정 주파수나 음향 패턴을 통해 감정이나 움직임을 유발하는 경우가 많아, 공간 지각의 인지적 확장을 가능하게 한다. 결국 사운드 아트는 감각 체계의 재구성과 공간 인식의 철학적 질문을 던지는 복합 예술로서 주목받고 있다.",
-
-    "기억의 장소(sites of memory)는 공동체의 역사적 경험이나 정체성이 구체적인 지리적 공간에 응축되어 저장된 장소를 의미하며, 예술은 이를 서사적으로 재구성하는 중요한 매체로 작동한다. 특히 역사적 트라우마와 같은 복잡한 주제들을 다루는 예술 작품은 과거의 사건을 현재의 감각과 윤리 속으로 불러오는 적극적인 재구성 작업을 수행한다. 예술적 재현은 공식 기록으로 남지 않은 기억의 공백을 채우고, 소외된 기억들을 복원함으로써 개인의 기억과 집단적 기억 사이의 경계를 흐리게 만든다. 이러한 작업은 관람자가 기억의 참여자이자 해석자로 전환되도록 유도한다. 이처럼 예술은 단순한 표현 수단을 넘어, 기억의 정치성과 윤리성, 사회적 기억의 구성 방식을 비판적으로 탐구하는 도구로 기능한다.",
-    
-    "그리자유르 기법은 회색조 단색만으로 입체감을 표현하는 고전 회화 기법이다. 화가는 다양한 명암의 회색을 이용해 빛과 그림자의 대비를 세밀하게 묘사함으로써, 색채 없이도 형태와 부피를 입체적으로 드러낸다. 이런 작품은 단조로워 보일 수 있지만, 오히려 깊이 있는 질감과 분위기를 전달한다. 르네상스 시대부터 그리자유르 기법은 미술가들 사이에서 형태와 명암을 탐구하는 중요한 방법으로 자리 잡았다. 화가들은 본격적인 채색 작업에 앞서 형태를 정교하게 설계할 때 이 기법을 활용해 작품의 구조적 완성도를 높였다. 그리자유르의 원리는 현대 미술에서도 다양하게 재해석되고 있다. 이처럼 그리자유르는 색채를 넘어 형태와 명암의 본질적인 아름다움을 드러내며, 시대를 초월해 예술가들에게 영감을 주고 있다.",
-]
-
-# You should have 40 paragraphs total for the experiment
-# If you have fewer than 40, the remaining will be filled with placeholders
-def get_paragraphs(count=45):
-    """Return the specified number of paragraphs, filling with placeholders if needed."""
-    result = PARAGRAPHS.copy()
-    
-    # If we need more paragraphs than provided, add placeholders
-    if len(result) < count:
-        for i in range(len(result), count):
-            result.append(f"Sample paragraph {i+1}. Replace this with your actual experimental stimulus. This text serves as a placeholder for the paragraph that participants will read during iteration {i+1} of the experiment.")
-    
-    return result[:count]
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Client-side render timestamps for stimulus onset.
+
+The stage timers in app17.py are taken on the server before Streamlit has sent
+the delta to the browser, so they include network and render latency. This
+module wraps a tiny custom component (render_timing_frontend/index.html) that
+reports, for each stage render, when the browser actually painted the stage
+and when the page was visible, using performance.now().
+
+The report also carries the timestamps needed for an NTP-style estimate of the
+offset between the browser clock and the server clock, so the client onsets
+can be expressed on the same clock as the server-side stage timers and markers.
+"""
+
+import os
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_timing_frontend")
+
+_component = None
+
+
+def _get_component():
+    """Declare the component on first use (declaration needs a running script)"""
+    global _component
+    if _component is None:
+        import streamlit.components.v1 as components
+        _component = components.declare_component("render_timing", path=_FRONTEND_DIR)
+    return _component
+
+
+def render_timing(stage, iteration, server_time, key):
+    """
+    Render the invisible timing component for a stage.
+
+    server_time is the server epoch time (seconds) at which the stage was first
+    rendered; it must stay constant across reruns of the same stage so that the
+    component instance is not reset. Returns the client report (a dict) once the
+    browser has painted the stage, otherwise None.
+    """
+    return _get_component()(
+        stage=stage,
+        iteration=iteration,
+        server_time_ms=server_time * 1000.0,
+        key=key,
+        default=None
+    )
+
+
+def estimate_clock_offset(report, server_receive_time):
+    """
+    Estimate the client-minus-server clock offset and round-trip time (both ms).
+
+    Uses the four NTP timestamps: server send (t0), client receive (t1),
+    client send (t2) and server receive (t3).
+    """
+    t0 = report["server_time_ms"]
+    t1 = report["client_received_ms"]
+    t2 = report["client_sent_ms"]
+    t3 = server_receive_time * 1000.0
+
+    offset_ms = ((t1 - t0) + (t2 - t3)) / 2.0
+    rtt_ms = max((t3 - t0) - (t2 - t1), 0.0)
+    return offset_ms, rtt_ms
+
+
+def client_onset_times(report, offset_ms):
+    """Return (paint_onset, visible_onset) converted to server epoch seconds"""
+    paint_onset = (report["client_paint_ms"] - offset_ms) / 1000.0
+    visible_onset = (report["client_visible_ms"] - offset_ms) / 1000.0
+    return paint_onset, visible_onset
@@ -0,0 +1,597 @@
+#!/usr/bin/env python
+"""
+Replay a logged participant session at accelerated speed.
+
+Reads a JSON event log written by save_logs (logs/participant_<id>_<ts>.json)
+and re-drives the participant's run: start, pretest, baseline, Bloom
+explanation, practice and main trials, with the logged questions, survey
+answers, edited questions, textarea focus and client render timings.
+
+Targets:
+- engine (default): the headless ExperimentEngine, timing each engine call
+- app: app17.py through Streamlit's AppTest, timing each rerun (script run
+  plus render), i.e. the server-side cost of every click on a realistic
+  trace. The pretest form cannot be filled in through AppTest
+  (st.data_editor), so the logged pretest answers go through the engine.
+
+Time is compressed by --speed (1 to 1000, or "max" for no waiting): the gap
+between two logged actions is waited for gap/speed seconds. The engine runs
+on a replay clock that jumps to each action's logged time, so stage
+durations and timestamps in the replayed trial records match the originals
+regardless of the speed. Feedback is served from the log (bloom level and
+suggested question, or the logged error text), so no LLM is called, and the
+logged practice conditions, main paragraph order and condition mapping are
+restored.
+
+The replayed trial records are compared with the originals: every trial's
+question, feedback, survey answers and edit against the event log, and every
+column of the main trials against the responses CSV next to the log when it
+exists (numbers within --tolerance). Actions that fail or find the session
+in a different stage than logged are reported as divergences.
+
+Usage:
+    python replay_session.py logs/participant_pilot1_20250101_100000.json --speed 100
+    python replay_session.py logs/participant_pilot1_20250101_100000.json --target app --speed max -o replay.json
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from bloom_study.clock import VirtualClock
+from bloom_study.engine import BASELINE_DURATION
+from bloom_study.feedback import format_feedback
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app17.py")
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+# Logged event -> engine action
+EVENT_ACTIONS = {
+    "Experiment started": "start_experiment",
+    "Pretest survey completed": "complete_pretest",
+    "Baseline session completed": "baseline_completed",
+    "Moving to Bloom explanation stage": "show_bloom_explanation",
+    "Bloom explanation completed": "finish_bloom_explanation",
+    "Practice session starting": "start_practice",
+    "Main experiment started": "start_main_experiment",
+    "Stage transition: show_paragraph -> ask_question": "paragraph_viewed",
+    "Question submitted": "submit_question",
+    "Stage transition: show_feedback -> survey": "feedback_viewed",
+    "Survey submitted": "submit_survey",
+    "Edited question submitted": "submit_edited_question",
+    "Client render timing": "record_client_render"
+}
+
+# Trial actions are logged in the stage the session was in before the action
+TRIAL_ACTIONS = {"paragraph_viewed", "record_textarea_focus", "submit_question", "feedback_viewed",
+                 "submit_survey", "submit_edited_question"}
+
+# Fields of a trial record that the event log also holds
+LOGGED_TRIAL_FIELDS = ["paragraph_index", "feedback_type", "original_question", "feedback", "curiosity",
+                       "relatedness", "accept_feedback", "edited_question"]
+
+# CSV columns that depend on the live LLM connection pool, which a replay does not have
+UNREPLAYED_COLUMNS = {"feedback_connection_reused"}
+
+
+def parse_timestamp(text):
+    return datetime.strptime(text, TIMESTAMP_FORMAT).timestamp()
+
+
+class ReplayClock(VirtualClock):
+    """Engine clock on the logged timeline; real waits are shortened by the speed-up"""
+
+    def __init__(self, start, speed=None):
+        super().__init__(start)
+        self.speed = speed
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+        if self.speed:
+            time.sleep(seconds / self.speed)
+
+
+class LoggedFeedback:
+    """Feedback backend returning the logged feedback of each trial in order, after its logged latency"""
+
+    def __init__(self, feedback, clock):
+        self.feedback = list(feedback)
+        self.clock = clock
+
+    def __call__(self, question, paragraph_content, feedback_type):
+        from bloom_study.feedback import FeedbackUnavailable
+
+        if not self.feedback:
+            raise FeedbackUnavailable("Error: no logged feedback for this trial.")
+        logged = self.feedback.pop(0)
+        self.clock.sleep(logged.get("latency", 0.0))
+        if logged.get("bloom_level") is None:
+            # The original call failed; the engine shows the logged error text again
+            raise FeedbackUnavailable(logged["feedback"])
+        return logged["bloom_level"], logged["suggested_question"]
+
+
+def load_session(log_path):
+    """Actions, restored conditions, logged feedback and trials of one event log"""
+    with open(log_path, encoding="utf-8") as f:
+        events = json.load(f)
+
+    # Batched events are written at flush time, so restore the logged order
+    events = sorted(events, key=lambda e: e["timestamp"])
+
+    session = {
+        "participant_id": None,
+        "actions": [],
+        "practice_condition_mapping": None,
+        "condition_mapping": None,
+        "paragraph_order": [],
+        "feedback": [],
+        "trials": [],
+        "baseline_seconds": None
+    }
+    baseline_start = None
+    trial = None
+
+    for event in events:
+        name = event["event"]
+        data = event.get("data") or {}
+        t = parse_timestamp(event["timestamp"])
+
+        if name == "Baseline session started":
+            # Logs from before the polled baseline have this twice (button and fixation screen)
+            if baseline_start is None:
+                baseline_start = t
+                session["actions"].append({"t": t, "action": "start_baseline", "args": (), "stage": event["stage"]})
+            continue
+        if name == "Session resumed":
+            # Continued from a checkpoint: the stage starts again here (an interrupted baseline from the button)
+            baseline_start = None
+            session["actions"].append({"t": t, "action": "restart_interrupted_stage",
+                                       "args": (data["gap_seconds"],), "stage": event["stage"]})
+            continue
+        if name.startswith("Textarea focus: "):
+            session["actions"].append({"t": data.get("focus_time", t), "action": "record_textarea_focus",
+                                       "args": (name.split(": ", 1)[1],), "stage": event["stage"]})
+            continue
+        if name == "AI feedback generated":
+            if trial is not None and "bloom_level" in data:
+                trial["logged_feedback"].update(bloom_level=data["bloom_level"],
+                                                suggested_question=data["suggested_question"])
+            elif trial is not None and "feedback_type" in data:
+                logged = trial["logged_feedback"]
+                # Only errors log the feedback text; otherwise it is formatted from the level and suggestion
+                feedback = data.get("feedback")
+                if feedback is None:
+                    feedback = format_feedback(logged.get("bloom_level"), logged.get("suggested_question"))
+                logged["feedback"] = feedback
+                logged["latency"] = max(t - trial["submitted"], 0.0)
+                trial["record"]["feedback"] = feedback
+                trial["record"]["feedback_type"] = data["feedback_type"]
+            continue
+
+        action = EVENT_ACTIONS.get(name)
+        if action is None:
+            continue
+
+        if action == "start_experiment":
+            session["participant_id"] = data["participant_id"]
+            args = (data["participant_id"],)
+        elif action == "complete_pretest":
+            args = (data,)
+        elif action == "baseline_completed":
+            # Measured since the polled baseline; older logs only have the event times
+            session["baseline_seconds"] = data.get("baseline_duration") or (t - baseline_start if baseline_start else None)
+            args = (data.get("planned_duration", BASELINE_DURATION),)
+        elif action == "start_practice":
+            session["practice_condition_mapping"] = {int(k): v for k, v in data["practice_condition_mapping"].items()}
+            args = ()
+        elif action == "start_main_experiment":
+            session["condition_mapping"] = {int(k): v for k, v in data["condition_mapping"].items()}
+            args = ()
+        elif action == "submit_question":
+            context = "practice" if data.get("practice_mode") else "main"
+            if context == "main":
+                session["paragraph_order"].append(data["paragraph_index"])
+            trial = {
+                "key": (context, data["iteration"]),
+                "submitted": t,
+                "logged_feedback": {},
+                "record": {"paragraph_index": data["paragraph_index"], "original_question": data["question"]}
+            }
+            session["trials"].append(trial)
+            session["feedback"].append(trial["logged_feedback"])
+            args = (data["question"],)
+        elif action == "submit_survey":
+            args = (data["curiosity"], data["relatedness"], data["accept_feedback"])
+            if trial is not None:
+                trial["record"].update(curiosity=data["curiosity"], relatedness=data["relatedness"],
+                                       accept_feedback=data["accept_feedback"])
+        elif action == "submit_edited_question":
+            args = (data["edited_question"],)
+            if trial is not None:
+                trial["record"]["edited_question"] = data["edited_question"]
+        elif action == "record_client_render":
+            args = (data["render_stage"], data["client_onset"], data["client_visible_onset"],
+                    data["clock_offset_ms"], data["rtt_ms"], data.get("was_hidden", False))
+        else:
+            args = ()
+
+        session["actions"].append({"t": t, "action": action, "args": args, "stage": event["stage"]})
+
+    session["actions"].sort(key=lambda a: a["t"])
+    return session
+
+
+def restore_conditions(engine, session):
+    """Replace the freshly drawn conditions and paragraph order with the logged ones"""
+    state = engine.state
+    if state.practice_mode and session["practice_condition_mapping"] is not None:
+        state.practice_condition_mapping = session["practice_condition_mapping"]
+    if not state.practice_mode and state.experiment_paragraphs is not None:
+        by_index = {p["index"]: p for p in state.experiment_paragraphs}
+        order = [i for i in session["paragraph_order"] if i in by_index]
+        state.experiment_paragraphs = [by_index[i] for i in order] + \
+                                      [p for p in state.experiment_paragraphs if p["index"] not in order]
+        if session["condition_mapping"] is not None:
+            state.condition_mapping = session["condition_mapping"]
+
+
+class EngineTarget:
+    """Replays actions by calling the headless engine directly"""
+
+    name = "engine"
+
+    def __init__(self, session, clock):
+        from bloom_study.engine import ExperimentEngine
+
+        self.session = session
+        self.engine = ExperimentEngine(clock=clock, feedback_backend=LoggedFeedback(session["feedback"], clock))
+
+    def perform(self, action):
+        engine = self.engine
+        name = action["action"]
+        if name == "start_baseline":
+            # Button and fixation screen onset, as in the app
+            engine.prepare_baseline()
+            engine.start_baseline()
+            engine.baseline_onset()
+        else:
+            getattr(engine, name)(*action["args"])
+        if name in ("start_practice", "start_main_experiment"):
+            restore_conditions(engine, self.session)
+
+    def records(self):
+        engine = self.engine
+        return ([("practice", r) for r in engine.response_rows(practice=True)] +
+                [("main", r) for r in engine.response_rows()])
+
+    def close(self):
+        pass
+
+
+class AppTarget:
+    """Replays actions by clicking through app17.py in an AppTest session"""
+
+    name = "app"
+
+    BUTTONS = {
+        "start_baseline": "베이스라인 시작",
+        "show_bloom_explanation": "다음 단계로 이동",
+        "finish_bloom_explanation": "연습 세션 시작",
+        "start_practice": "연습 시작",
+        "start_main_experiment": "본 실험 시작",
+        "paragraph_viewed": "읽기 완료",
+        "submit_question": "질문 제출",
+        "feedback_viewed": "다음",
+        "submit_survey": "설문 제출"
+    }
+
+    def __init__(self, session, clock, timeout=300):
+        from streamlit.testing.v1 import AppTest
+
+        self.session = session
+        self.clock = clock
+        self.timeout = timeout
+        self.pending_question = None
+
+        # The fixation timer runs on the engine clock for the logged baseline length
+        if session["baseline_seconds"] is not None:
+            os.environ["BASELINE_SECONDS"] = str(session["baseline_seconds"])
+        os.environ["FEEDBACK_BACKEND"] = "mock"
+
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.at.run()
+        self.engine.clock = clock
+        self.engine.feedback_backend = LoggedFeedback(session["feedback"], clock)
+
+    @property
+    def engine(self):
+        return self.at.session_state.engine
+
+    def find_button(self, label):
+        for button in self.at.button:
+            if button.label == label:
+                return button
+        return None
+
+    def click(self, label):
+        button = self.find_button(label)
+        if button is None:
+            raise RuntimeError(f"button '{label}' not shown in stage {self.engine.state.stage}")
+        button.click().run(timeout=self.timeout)
+
+    def check(self):
+        problems = [e.message for e in self.at.exception] + [e.value for e in self.at.error]
+        if problems:
+            raise RuntimeError(str(problems[0])[:200])
+
+    def perform(self, action):
+        name, args = action["action"], action["args"]
+        engine = self.engine
+
+        if name == "start_experiment":
+            self.at.text_input[0].input(args[0])
+            self.click("실험 시작")
+        elif name == "complete_pretest":
+            # st.data_editor cannot be filled in through AppTest
+            engine.complete_pretest(*args)
+            self.at.run(timeout=self.timeout)
+            self.click("베이스라인 측정으로 이동")
+        elif name == "baseline_completed":
+            # The clock is at the logged end: the next poll of the fixation timer completes it
+            while engine.state.stage == "baseline_screen":
+                self.at.run(timeout=self.timeout)
+        elif name == "record_client_render":
+            engine.record_client_render(*args)
+        elif name == "restart_interrupted_stage":
+            # The app session itself was not interrupted; restart the stage as the resume did
+            engine.restart_interrupted_stage(*args)
+            self.at.run(timeout=self.timeout)
+        elif name == "record_textarea_focus":
+            if args[0] == "question_input":
+                # Typing the question fires the focus callback
+                self.type_question(self.pending_question or "")
+            else:
+                engine.record_textarea_focus(*args)
+        elif name == "submit_question":
+            if engine.state.question_input_focus_time is None:
+                self.type_question(args[0])
+            self.click(self.BUTTONS[name])
+        elif name == "submit_survey":
+            for prefix, value in zip(("curiosity_", "relatedness_", "accept_feedback_"), args):
+                for radio in self.at.radio:
+                    if radio.key and radio.key.startswith(prefix):
+                        radio.set_value(value)
+            # The survey and the edit are forms: the values are sent with the submit
+            self.click(self.BUTTONS[name])
+        elif name == "submit_edited_question":
+            self.at.text_area[0].input(args[0])
+            self.click("최종 제출")
+        else:
+            self.click(self.BUTTONS[name])
+
+        if name in ("start_practice", "start_main_experiment"):
+            restore_conditions(self.engine, self.session)
+            self.at.run(timeout=self.timeout)
+        self.check()
+
+    def type_question(self, question):
+        for text_input in self.at.text_input:
+            if text_input.key and text_input.key.startswith("user_question_"):
+                text_input.input(question).run(timeout=self.timeout)
+                return
+
+    def prepare(self, actions, index):
+        """Look ahead for the question a focus event belongs to"""
+        if actions[index]["action"] == "record_textarea_focus":
+            for later in actions[index + 1:]:
+                if later["action"] == "submit_question":
+                    self.pending_question = later["args"][0]
+                    return
+
+    def records(self):
+        engine = self.engine
+        return ([("practice", r) for r in engine.response_rows(practice=True)] +
+                [("main", r) for r in engine.response_rows()])
+
+    def close(self):
+        pass
+
+
+def values_match(replayed, original, tolerance):
+    """Compare a replayed value with the CSV/JSON original"""
+    if replayed is None or replayed == "":
+        return original is None or original == ""
+    try:
+        return abs(float(replayed) - float(original)) <= tolerance
+    except (TypeError, ValueError):
+        return str(replayed) == str(original)
+
+
+def responses_csv_for(log_path):
+    directory, filename = os.path.split(log_path)
+    if not filename.startswith("participant_"):
+        return None
+    path = os.path.join(directory, "responses_" + filename[len("participant_"):-len(".json")] + ".csv")
+    return path if os.path.exists(path) else None
+
+
+def compare_records(records, session, csv_path, tolerance):
+    """Differences between the replayed trial records and the logged/saved originals"""
+    differences = []
+    replayed = {(context, record["iteration"]): record for context, record in records}
+
+    for trial in session["trials"]:
+        record = replayed.get(trial["key"])
+        if record is None:
+            differences.append({"trial": list(trial["key"]), "field": None, "error": "trial not replayed"})
+            continue
+        for field_name in LOGGED_TRIAL_FIELDS:
+            if field_name in trial["record"] and not values_match(record.get(field_name), trial["record"][field_name], 0):
+                differences.append({"trial": list(trial["key"]), "field": field_name, "source": "events",
+                                    "original": trial["record"][field_name], "replayed": record.get(field_name)})
+
+    if csv_path:
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            key = ("main", int(row["iteration"]))
+            record = replayed.get(key)
+            if record is None:
+                continue
+            for field_name, original in row.items():
+                if field_name in UNREPLAYED_COLUMNS:
+                    continue
+                if field_name == "timestamp":
+                    same = abs(datetime.strptime(original, "%Y-%m-%d %H:%M:%S").timestamp() -
+                               datetime.strptime(record["timestamp"], "%Y-%m-%d %H:%M:%S").timestamp()) <= 1
+                else:
+                    same = values_match(record.get(field_name), original, tolerance)
+                if not same:
+                    differences.append({"trial": list(key), "field": field_name, "source": "csv",
+                                        "original": original, "replayed": record.get(field_name)})
+    return differences
+
+
+def replay(log_path, target="engine", speed=100.0, tolerance=0.05, save_logs=None, verbose=False):
+    session = load_session(log_path)
+    actions = session["actions"]
+    if not actions:
+        raise ValueError(f"No replayable events in {log_path}")
+
+    log_start = actions[0]["t"]
+    clock = ReplayClock(log_start, speed)
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+
+    with quiet:
+        runner = AppTarget(session, clock) if target == "app" else EngineTarget(session, clock)
+
+    timings = {}
+    divergences = []
+    real_start = time.perf_counter()
+    for index, action in enumerate(actions):
+        if speed:
+            delay = real_start + (action["t"] - log_start) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        state = runner.engine.state
+        if action["action"] in TRIAL_ACTIONS and state.stage != action["stage"]:
+            divergences.append({"t": action["t"], "action": action["action"],
+                                "error": f"expected stage {action['stage']}, session is in {state.stage}"})
+
+        clock.advance_to(action["t"])
+        if hasattr(runner, "prepare"):
+            runner.prepare(actions, index)
+        start = time.perf_counter()
+        try:
+            with quiet:
+                runner.perform(action)
+        except Exception as e:
+            divergences.append({"t": action["t"], "action": action["action"], "error": f"{type(e).__name__}: {e}"})
+        timings.setdefault(action["action"], []).append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - real_start
+
+    saved = None
+    if save_logs and target == "engine":
+        saved = runner.engine.save_logs(save_logs)
+
+    csv_path = responses_csv_for(log_path)
+    differences = compare_records(runner.records(), session, csv_path, tolerance)
+    runner.close()
+
+    return {
+        "log": log_path,
+        "target": target,
+        "speed": f"{speed:g}x" if speed else "max",
+        "participant_id": session["participant_id"],
+        "actions": len(actions),
+        "logged_seconds": actions[-1]["t"] - log_start,
+        "elapsed_seconds": elapsed,
+        "final_stage": runner.engine.state.stage,
+        "trials": {"logged": len(session["trials"]), "replayed": len(runner.records())},
+        "compared_with": csv_path,
+        "action_times": {
+            name: {"count": len(values), "mean_ms": 1000 * statistics.fmean(values),
+                   "max_ms": 1000 * max(values), "total_ms": 1000 * sum(values)}
+            for name, values in timings.items()
+        },
+        "divergences": divergences,
+        "differences": differences,
+        "saved_logs": saved
+    }
+
+
+def print_report(report):
+    print(f"{report['log']}: {report['actions']} actions of {report['participant_id']} "
+          f"({report['logged_seconds']:.0f}s logged) replayed on the {report['target']} "
+          f"in {report['elapsed_seconds']:.2f}s ({report['speed']}); final stage {report['final_stage']}")
+    print(f"{'action':<26}{'n':>5}{'mean ms':>10}{'max ms':>10}{'total ms':>11}")
+    for name, row in sorted(report["action_times"].items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"{name:<26}{row['count']:>5}{row['mean_ms']:>10.2f}{row['max_ms']:>10.2f}{row['total_ms']:>11.1f}")
+
+    trials = report["trials"]
+    source = f"event log and {report['compared_with']}" if report["compared_with"] else "event log"
+    print(f"trials: {trials['replayed']} replayed of {trials['logged']} logged, compared with the {source}")
+    for divergence in report["divergences"][:10]:
+        print(f"  DIVERGED at {datetime.fromtimestamp(divergence['t']).strftime(TIMESTAMP_FORMAT)} "
+              f"{divergence['action']}: {divergence['error']}")
+    for difference in report["differences"][:20]:
+        print(f"  DIFF {difference['trial']} {difference['field']}: "
+              f"original {difference.get('original')!r} replayed {difference.get('replayed')!r}")
+    if not report["divergences"] and not report["differences"]:
+        print("✓ Replayed trial records match the originals")
+
+
+def parse_speed(value):
+    if value == "max":
+        return None
+    speed = float(value)
+    if not 1 <= speed <= 1000:
+        raise argparse.ArgumentTypeError("speed must be between 1 and 1000, or 'max'")
+    return speed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a logged participant session")
+    parser.add_argument('log', help='JSON event log (participant_<id>_<timestamp>.json)')
+    parser.add_argument('--target', choices=["engine", "app"], default="engine",
+                        help='Replay through the headless engine or app17.py via AppTest (default: engine)')
+    parser.add_argument('--speed', type=parse_speed, default=100.0,
+                        help='Time compression, 1 to 1000, or "max" for no waiting (default: 100)')
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='Allowed difference of numeric columns, e.g. seconds (default: 0.05)')
+    parser.add_argument('--save-logs', default=None, help='Write the replayed session\'s logs here (engine target)')
+    parser.add_argument('-o', '--output', default=None, help='Write the full report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Show the engine/app console output')
+    args = parser.parse_args(argv)
+
+    log_path = os.path.abspath(args.log)
+    output = os.path.abspath(args.output) if args.output else None
+    save_logs = os.path.abspath(args.save_logs) if args.save_logs else None
+    if args.target == "app":
+        # The app saves logs and indexes sessions on completion: keep them out of logs/
+        workdir = tempfile.mkdtemp(prefix="replay_")
+        os.environ["SESSION_DB_PATH"] = os.path.join(workdir, "sessions.db")
+        os.environ.pop("OPENAI_API_KEY", None)
+        os.chdir(workdir)
+
+    report = replay(log_path, args.target, args.speed, args.tolerance, save_logs, args.verbose)
+    print_report(report)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f"✓ Report written to {output}")
+    return 0 if not report["divergences"] and not report["differences"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,36 +2,48 @@
 """
 Launch script for the Bloom's Taxonomy Question Study.
 This script provides a convenient way to start the experiment with various options.
+
+With --warm the browser opens only once the server is warm: the launcher waits
+for Streamlit's health endpoint, then opens one warm-up session (?warmup=1)
+that builds the marker sinks, session store, stimulus and metrics caches, the
+LLM models and the feedback chains. --warm-probe also sends a one-token
+completion through each model, so the API connection is already open when the
+first participant submits a question.
+
+--probe checks the LLM endpoint before a session instead of starting the app:
+it sends representative classification and suggestion requests at a chosen
+concurrency and reports latency, tokens/s, 429s and a recommended concurrency
+cap (see llm_probe.py). --probe-base-url points it at a local stand-in, which
+needs no OpenAI API key.
 """
 
 import os
 import sys
 import argparse
+import importlib.util
 import subprocess
 import webbrowser
 from dotenv import load_dotenv
 import time
 
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app17.py")
+
 def check_dependencies():
-    """Check if all required dependencies are installed."""
-    try:
-        import streamlit
-        import pandas
-        import langchain
-        import openai
-        
-        # Try to import psychopy but don't fail if not available
-        try:
-            import psychopy
-            print("✓ PsychoPy is available for parallel port functionality")
-        except ImportError:
-            print("⚠ PsychoPy not found - parallel port functionality will be disabled")
-        
-        return True
-    except ImportError as e:
-        print(f"Error: Missing dependency - {e}")
+    """Check if all required dependencies are installed (found, not imported: the app imports them itself)."""
+    missing = [name for name in ("streamlit", "pandas", "langchain", "langchain_openai", "openai")
+               if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Error: Missing dependency - {', '.join(missing)}")
         print("Please install all dependencies with: pip install -r requirements.txt")
         return False
+    
+    # psychopy is optional: without it the parallel port functionality is disabled
+    if importlib.util.find_spec("psychopy") is not None:
+        print("✓ PsychoPy is available for parallel port functionality")
+    else:
+        print("⚠ PsychoPy not found - parallel port functionality will be disabled")
+    
+    return True
 
 def check_openai_key():
     """Check if OpenAI API key is available."""
@@ -60,74 +72,78 @@ def check_openai_key():
     
     return True
 
-def configure_paragraphs():
-    """Configure experiment paragraphs if needed."""
-    if not os.path.exists("paragraphs_config.py"):
-        print("⚠ Warning: paragraphs_config.py not found")
-        create_config = input("Would you like to create a template paragraphs_config.py file? (y/n): ")
-        
-        if create_config.lower() == 'y':
-            with open("paragraphs_config.py", "w") as f:
-                f.write('''"""
-Configuration file for experiment paragraphs.
-Replace these sample paragraphs with your actual stimuli before running the experiment.
-"""
+def uses_openai_api(base_url):
+    """Whether an OpenAI-compatible base URL (None: the default) is the OpenAI API itself"""
+    from urllib.parse import urlparse
+    return not base_url or (urlparse(base_url).hostname or "").endswith("openai.com")
 
-PARAGRAPHS = [
-    "Climate change is altering ecosystems worldwide. Rising temperatures are causing glaciers to melt, sea levels to rise, and weather patterns to become more extreme. These changes are affecting both natural habitats and human communities, with some regions experiencing drought while others face increased flooding.",
+def configure_paragraphs():
+    """Check the stimulus file (stimuli.json) the app reads its paragraphs from."""
+    from bloom_study.engine import PRACTICE_ITERATIONS
+    from bloom_study.stimuli import STIMULUS_FILE, load_stimulus_set
+    
+    if not os.path.exists(STIMULUS_FILE):
+        print(f"⚠ Warning: stimulus file {STIMULUS_FILE} not found")
+        print("Set STIMULUS_FILE or restore stimuli.json before running the experiment")
+        return False
+    
+    try:
+        stimulus_set = load_stimulus_set(STIMULUS_FILE)
+    except Exception as e:
+        print(f"⚠ Warning: Error in {STIMULUS_FILE}: {e}")
+        return False
     
-    "The human brain contains approximately 86 billion neurons. These neurons communicate through electrical and chemical signals, forming complex networks that enable consciousness, cognition, and behavior. Modern neuroscience continues to uncover how these neural connections give rise to our thoughts and experiences.",
+    print(f"✓ Found {len(stimulus_set.stimuli)} paragraphs in {os.path.basename(STIMULUS_FILE)} "
+          f"(version {stimulus_set.content_hash}): {len(stimulus_set.experiment_indices)} experiment, "
+          f"{len(stimulus_set.practice_indices)} practice, {len(stimulus_set.excluded_indices)} excluded")
+    if len(stimulus_set.practice_indices) < PRACTICE_ITERATIONS:
+        print(f"⚠ Warning: Fewer than {PRACTICE_ITERATIONS} practice paragraphs defined.")
     
-    # Add the remaining paragraphs here
-]
+    return True
 
-# You should have 40 paragraphs total for the experiment
-# If you have fewer than 40, the remaining will be filled with placeholders
-def get_paragraphs(count=40):
-    """Return the specified number of paragraphs, filling with placeholders if needed."""
-    result = PARAGRAPHS.copy()
-    
-    # If we need more paragraphs than provided, add placeholders
-    if len(result) < count:
-        for i in range(len(result), count):
-            result.append(f"Sample paragraph {i+1}. Replace this with your actual experimental stimulus.")
-    
-    return result[:count]
-''')
-            print("✓ Created paragraphs_config.py template")
-            print("⚠ Remember to edit this file to include your experiment paragraphs")
-            
-            edit_now = input("Would you like to edit the file now? (y/n): ")
-            if edit_now.lower() == 'y':
-                # Try to open with default editor
-                try:
-                    if sys.platform == 'win32':
-                        os.system("notepad paragraphs_config.py")
-                    elif sys.platform == 'darwin':  # macOS
-                        os.system("open -e paragraphs_config.py")
-                    else:  # Linux and other Unix
-                        editors = ["nano", "vim", "emacs", "gedit"]
-                        for editor in editors:
-                            if subprocess.call(["which", editor], stdout=subprocess.PIPE) == 0:
-                                os.system(f"{editor} paragraphs_config.py")
-                                break
-                except Exception as e:
-                    print(f"Could not open editor: {e}")
-                    print("Please manually edit paragraphs_config.py before running the experiment")
-    else:
-        # Check if there are enough paragraphs defined
-        try:
-            from paragraphs_config import get_paragraphs
-            paragraphs = get_paragraphs(40)
-            print(f"✓ Found {len(paragraphs)} paragraphs in configuration")
-            
-            if len(paragraphs) < 40:
-                print("⚠ Warning: Fewer than 40 unique paragraphs defined. Placeholders will be used.")
-        except Exception as e:
-            print(f"⚠ Warning: Error in paragraphs_config.py: {e}")
+def wait_for_server(port, timeout, process=None):
+    """Poll Streamlit's health endpoint until the server answers (False on timeout or exit)"""
+    import urllib.request
+    url = f"http://localhost:{port}/_stcore/health"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
             return False
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+def warm_up_server(port, probe, timeout):
+    """Run one warm-up session of the app and wait until its script run has finished"""
+    try:
+        from websockets.sync.client import connect
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    except ImportError as e:
+        print(f"⚠ Warm-up not possible: {e}")
+        return False
     
-    return True
+    request = BackMsg()
+    request.rerun_script.query_string = "warmup=probe" if probe else "warmup=1"
+    deadline = time.time() + timeout
+    try:
+        with connect(f"ws://localhost:{port}/_stcore/stream", subprotocols=["streamlit"]) as websocket:
+            websocket.send(request.SerializeToString())
+            while True:
+                message = ForwardMsg()
+                message.ParseFromString(websocket.recv(timeout=max(deadline - time.time(), 0.1)))
+                if message.WhichOneof("type") == "script_finished":
+                    return message.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY
+    except TimeoutError:
+        print(f"⚠ Warm-up did not finish within {timeout}s")
+    except Exception as e:
+        print(f"⚠ Warm-up failed: {e}")
+    return False
 
 def main():
     """Main function to run the experiment."""
@@ -142,6 +158,27 @@ def main():
     parser.add_argument('--test-parallel', action='store_true',
                         help='Run a test of the parallel port before starting')
     
+    parser.add_argument('--warm', action='store_true',
+                        help='Build the models, chains and caches before opening the browser')
+    
+    parser.add_argument('--warm-probe', action='store_true',
+                        help='Like --warm, and also send a one-token probe completion through each model')
+    
+    parser.add_argument('--warm-timeout', type=float, default=120,
+                        help='Seconds to wait for the server and the warm-up (default: 120)')
+    
+    parser.add_argument('--probe', action='store_true',
+                        help='Probe LLM latency and rate limits, then exit without starting the app')
+    
+    parser.add_argument('--probe-requests', type=int, default=20,
+                        help='Requests the probe sends (default: 20)')
+    
+    parser.add_argument('--probe-concurrency', type=int, default=4,
+                        help='Probe requests in flight at once (default: 4)')
+    
+    parser.add_argument('--probe-base-url', default=None,
+                        help='OpenAI-compatible endpoint to probe (default: OPENAI_BASE_URL or api.openai.com)')
+    
     args = parser.parse_args()
     
     # Print welcome message
@@ -154,9 +191,20 @@ def main():
     if not check_dependencies():
         return 1
     
-    # Check OpenAI API key
-    print("\nChecking OpenAI API key...")
-    check_openai_key()
+    # Check OpenAI API key (a probe of a local stand-in endpoint needs none)
+    load_dotenv()
+    probe_base_url = args.probe_base_url or os.getenv("OPENAI_BASE_URL") or None
+    if args.probe and not uses_openai_api(probe_base_url):
+        print(f"\nProbing {probe_base_url}: no OpenAI API key needed")
+    else:
+        print("\nChecking OpenAI API key...")
+        check_openai_key()
+    
+    if args.probe:
+        print("\nProbing the LLM endpoint...")
+        import llm_probe
+        report = llm_probe.probe(args.probe_requests, args.probe_concurrency, probe_base_url)
+        return 0 if report["ok"] else 1
     
     # Configure paragraphs
     print("\nChecking experiment paragraphs...")
@@ -187,23 +235,38 @@ def main():
     
     # Start the Streamlit app
     print("\nStarting experiment application...")
-    cmd = [sys.executable, "-m", "streamlit", "run", "app.py", "--server.port", str(args.port)]
+    cmd = [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.port", str(args.port)]
     
     # Add additional Streamlit arguments to reduce verbosity
     cmd.extend(["--server.headless", "true", "--logger.level", "error"])
     
-    # Open browser if requested
-    if not args.no_browser:
-        time.sleep(1)  # Give the server a moment to start
-        webbrowser.open(f"http://localhost:{args.port}")
-    
-    # Run the Streamlit process
-    print(f"\n✓ Experiment running at http://localhost:{args.port}")
-    print("\nPress Ctrl+C to stop the experiment\n")
-    
+    process = subprocess.Popen(cmd)
     try:
-        subprocess.call(cmd)
+        start = time.time()
+        if not wait_for_server(args.port, args.warm_timeout, process):
+            print("Error: the Streamlit server did not start")
+            process.terminate()
+            return 1
+        print(f"✓ Server ready in {time.time() - start:.1f}s")
+        
+        if args.warm or args.warm_probe:
+            print("\nWarming up models, chains and caches...")
+            start = time.time()
+            if warm_up_server(args.port, args.warm_probe, args.warm_timeout):
+                print(f"✓ Warm-up completed in {time.time() - start:.1f}s")
+            else:
+                print("⚠ Warm-up incomplete - the first participant may wait for the setup")
+        
+        # Open browser if requested
+        if not args.no_browser:
+            webbrowser.open(f"http://localhost:{args.port}")
+        
+        print(f"\n✓ Experiment running at http://localhost:{args.port}")
+        print("\nPress Ctrl+C to stop the experiment\n")
+        process.wait()
     except KeyboardInterrupt:
+        # Ctrl+C also reaches the Streamlit process; wait for it to shut down
+        process.wait()
         print("\nExperiment stopped by user")
     
     return 0
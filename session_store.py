@@ -0,0 +1,418 @@
+"""
+SQLite session store and index for all participants.
+
+The app writes every finished trial (plus the events and markers logged
+since the previous trial) into one SQLite database, so cross-session
+questions such as "all trials for paragraph 17 with feedback_type=unrelated"
+are indexed lookups instead of globbing and parsing every file in logs/.
+
+It also holds the latest checkpoint of every running session (the engine's
+state after each stage transition), from which a participant whose browser
+or the server restarted resumes where they left off.
+
+The database runs in WAL mode so the Streamlit server can keep writing while
+analysis scripts read. Existing log files can be backfilled with:
+
+    python session_store.py import logs/ [--db logs/sessions.db]
+
+and queried with:
+
+    python session_store.py trials --paragraph 17 --feedback-type unrelated
+
+It also records which counterbalancing schedule row each participant not
+listed in the schedule file was given (see bloom_study.assignment), so new
+participants fill the least used rows.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+from bloom_study.engine import MARKERS
+
+DEFAULT_DB_PATH = os.path.join("logs", "sessions.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id      TEXT PRIMARY KEY,
+    participant_id  TEXT NOT NULL,
+    started_at      TEXT,
+    completed_at    TEXT,
+    source          TEXT NOT NULL,
+    event_log_path  TEXT,
+    responses_path  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS trials (
+    id                  INTEGER PRIMARY KEY,
+    session_id          TEXT NOT NULL REFERENCES sessions(session_id),
+    participant_id      TEXT NOT NULL,
+    context             TEXT NOT NULL,
+    iteration           INTEGER NOT NULL,
+    paragraph_index     INTEGER,
+    paragraph_genre     TEXT,
+    feedback_type       TEXT,
+    original_question   TEXT,
+    feedback            TEXT,
+    curiosity           INTEGER,
+    relatedness         INTEGER,
+    accept_feedback     TEXT,
+    edited_question     TEXT,
+    timestamp           TEXT,
+    data                TEXT,
+    UNIQUE (session_id, context, iteration)
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id              INTEGER PRIMARY KEY,
+    session_id      TEXT NOT NULL REFERENCES sessions(session_id),
+    participant_id  TEXT NOT NULL,
+    timestamp       TEXT,
+    iteration       INTEGER,
+    stage           TEXT,
+    context         TEXT,
+    event           TEXT,
+    data            TEXT
+);
+
+CREATE TABLE IF NOT EXISTS markers (
+    id              INTEGER PRIMARY KEY,
+    session_id      TEXT NOT NULL REFERENCES sessions(session_id),
+    participant_id  TEXT NOT NULL,
+    timestamp       TEXT,
+    iteration       INTEGER,
+    stage           TEXT,
+    context         TEXT,
+    marker          TEXT,
+    code            INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS schedule_assignments (
+    schedule        TEXT NOT NULL,
+    participant_id  TEXT NOT NULL,
+    row             INTEGER NOT NULL,
+    assigned_at     TEXT,
+    PRIMARY KEY (schedule, participant_id)
+);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    session_id      TEXT PRIMARY KEY REFERENCES sessions(session_id),
+    participant_id  TEXT NOT NULL,
+    saved_at        REAL NOT NULL,
+    stage           TEXT,
+    iteration       INTEGER,
+    context         TEXT,
+    state           TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_checkpoints_participant ON checkpoints(participant_id, saved_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_participant ON sessions(participant_id);
+CREATE INDEX IF NOT EXISTS idx_trials_participant ON trials(participant_id);
+CREATE INDEX IF NOT EXISTS idx_trials_paragraph_feedback ON trials(paragraph_index, feedback_type);
+CREATE INDEX IF NOT EXISTS idx_trials_feedback ON trials(feedback_type);
+CREATE INDEX IF NOT EXISTS idx_events_participant ON events(participant_id);
+CREATE INDEX IF NOT EXISTS idx_events_session ON events(session_id);
+CREATE INDEX IF NOT EXISTS idx_events_stage ON events(stage);
+CREATE INDEX IF NOT EXISTS idx_markers_participant ON markers(participant_id);
+CREATE INDEX IF NOT EXISTS idx_markers_session ON markers(session_id);
+CREATE INDEX IF NOT EXISTS idx_markers_stage ON markers(stage);
+"""
+
+MARKER_PREFIX = "MARKER: "
+
+EVENT_LOG_PATTERN = re.compile(r"^participant_(?P<participant_id>.+)_(?P<timestamp>\d{8}_\d{6})\.json$")
+
+
+def _to_int(value):
+    """Survey answers are logged as strings like '5'"""
+    if value is None or value == "":
+        return None
+    try:
+        return int(str(value).split()[0])
+    except ValueError:
+        return None
+
+
+class SessionStore:
+    """Thread-safe writer/reader for the sessions database"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, marker_codes=None):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.marker_codes = marker_codes or {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Writing
+
+    def start_session(self, session_id, participant_id, started_at=None, source="app"):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, participant_id, started_at, source) VALUES (?, ?, ?, ?)",
+                (session_id, participant_id, started_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S"), source)
+            )
+
+    def complete_session(self, session_id, event_log_path=None, responses_path=None, completed_at=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sessions SET completed_at = ?, event_log_path = COALESCE(?, event_log_path), "
+                "responses_path = COALESCE(?, responses_path) WHERE session_id = ?",
+                (completed_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                 os.path.abspath(event_log_path) if event_log_path else None,
+                 os.path.abspath(responses_path) if responses_path else None,
+                 session_id)
+            )
+
+    def record_trial(self, session_id, participant_id, context, trial):
+        """Insert (or replace) one finished trial row"""
+        with self._lock, self._conn:
+            self._insert_trial(session_id, participant_id, context, trial)
+
+    def record_events(self, session_id, participant_id, events):
+        """Append log entries; MARKER events also go to the markers table"""
+        with self._lock, self._conn:
+            self._insert_events(session_id, participant_id, events)
+
+    def save_checkpoint(self, session_id, participant_id, saved_at, stage, iteration, context, state):
+        """Replace the session's checkpoint (state is the engine's JSON snapshot)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (session_id, participant_id, saved_at, stage, iteration, "
+                "context, state) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, participant_id, saved_at, stage, iteration, context, state)
+            )
+
+    def _insert_trial(self, session_id, participant_id, context, trial):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO trials (session_id, participant_id, context, iteration, paragraph_index, "
+            "paragraph_genre, feedback_type, original_question, feedback, curiosity, relatedness, "
+            "accept_feedback, edited_question, timestamp, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                session_id, participant_id, context,
+                _to_int(trial.get("iteration")),
+                _to_int(trial.get("paragraph_index")),
+                trial.get("paragraph_genre"),
+                trial.get("feedback_type"),
+                trial.get("original_question"),
+                trial.get("feedback"),
+                _to_int(trial.get("curiosity")),
+                _to_int(trial.get("relatedness")),
+                trial.get("accept_feedback"),
+                trial.get("edited_question"),
+                trial.get("timestamp"),
+                json.dumps(trial, ensure_ascii=False, default=str),
+            )
+        )
+
+    def _insert_events(self, session_id, participant_id, events):
+        event_rows = []
+        marker_rows = []
+        for entry in events:
+            event = entry.get("event", "")
+            common = (session_id, participant_id, entry.get("timestamp"), entry.get("iteration"),
+                      entry.get("stage"), entry.get("context"))
+            event_rows.append(common + (event, json.dumps(entry["data"], ensure_ascii=False, default=str)
+                                        if "data" in entry else None))
+            if event.startswith(MARKER_PREFIX):
+                marker = event[len(MARKER_PREFIX):]
+                marker_rows.append(common + (marker, self.marker_codes.get(marker)))
+
+        self._conn.executemany(
+            "INSERT INTO events (session_id, participant_id, timestamp, iteration, stage, context, event, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", event_rows)
+        self._conn.executemany(
+            "INSERT INTO markers (session_id, participant_id, timestamp, iteration, stage, context, marker, code) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", marker_rows)
+
+    # Backfill
+
+    def import_session_files(self, event_log_path, responses_path=None):
+        """
+        Import one saved session (JSON event log plus optional responses CSV).
+        Returns the session_id, or None if the files were already stored.
+        """
+        match = EVENT_LOG_PATTERN.match(os.path.basename(event_log_path))
+        if not match:
+            raise ValueError(f"Not a participant event log: {event_log_path}")
+        participant_id = match.group("participant_id")
+        session_id = f"{participant_id}_{match.group('timestamp')}"
+
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE event_log_path = ? OR session_id = ?",
+                (os.path.abspath(event_log_path), session_id)
+            ).fetchone()
+        if known:
+            return None
+
+        with open(event_log_path) as f:
+            events = json.load(f)
+
+        trials = []
+        if responses_path and os.path.exists(responses_path):
+            with open(responses_path, newline="") as f:
+                trials = list(csv.DictReader(f))
+
+        started_at = events[0].get("timestamp") if events else None
+        completed_at = events[-1].get("timestamp") if events else None
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, participant_id, started_at, completed_at, source, "
+                "event_log_path, responses_path) VALUES (?, ?, ?, ?, 'import', ?, ?)",
+                (session_id, participant_id, started_at, completed_at, os.path.abspath(event_log_path),
+                 os.path.abspath(responses_path) if trials else None)
+            )
+            self._insert_events(session_id, participant_id, events)
+            for trial in trials:
+                self._insert_trial(session_id, participant_id, "main", trial)
+        return session_id
+
+    def import_logs_directory(self, logs_dir="logs"):
+        """Backfill every participant_*.json (and matching responses CSV) in logs_dir"""
+        imported = []
+        for event_log_path in sorted(glob.glob(os.path.join(logs_dir, "participant_*.json"))):
+            match = EVENT_LOG_PATTERN.match(os.path.basename(event_log_path))
+            if not match:
+                continue
+            responses_path = os.path.join(
+                logs_dir, f"responses_{match.group('participant_id')}_{match.group('timestamp')}.csv"
+            )
+            session_id = self.import_session_files(event_log_path, responses_path)
+            if session_id:
+                imported.append(session_id)
+        return imported
+
+    def assign_schedule_row(self, schedule, participant_id, rows, reserved=()):
+        """Counterbalancing schedule row of a participant, assigned on first use
+
+        A participant keeps the row stored for them in this schedule. A new
+        participant gets the least used of the rows (the lowest on a tie),
+        where reserved lists rows already taken by participants enrolled in
+        the schedule file. The transaction is IMMEDIATE, so two server
+        processes on one database never hand out the same free row.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            existing = self._conn.execute(
+                "SELECT row FROM schedule_assignments WHERE schedule = ? AND participant_id = ?",
+                (schedule, participant_id)
+            ).fetchone()
+            if existing is not None:
+                return existing["row"]
+
+            counts = [0] * rows
+            for row in reserved:
+                counts[row] += 1
+            for assigned in self._conn.execute(
+                    "SELECT row, COUNT(*) AS n FROM schedule_assignments WHERE schedule = ? GROUP BY row", (schedule,)):
+                if assigned["row"] < rows:
+                    counts[assigned["row"]] += assigned["n"]
+            row = counts.index(min(counts))
+            self._conn.execute(
+                "INSERT INTO schedule_assignments (schedule, participant_id, row, assigned_at) VALUES (?, ?, ?, ?)",
+                (schedule, participant_id, row, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            return row
+
+    # Reading
+
+    def query_trials(self, participant_id=None, paragraph_index=None, feedback_type=None, context=None):
+        """Return trial rows matching all given filters"""
+        clauses = []
+        params = []
+        for column, value in (("participant_id", participant_id), ("paragraph_index", paragraph_index),
+                              ("feedback_type", feedback_type), ("context", context)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        sql = "SELECT * FROM trials"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY participant_id, session_id, context, iteration"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def latest_checkpoint(self, participant_id, saved_after=None):
+        """The newest checkpoint of the participant's unfinished sessions (None if there is none)"""
+        sql = ("SELECT c.* FROM checkpoints c JOIN sessions s ON s.session_id = c.session_id "
+               "WHERE c.participant_id = ? AND s.completed_at IS NULL")
+        params = [participant_id]
+        if saved_after is not None:
+            sql += " AND c.saved_at >= ?"
+            params.append(saved_after)
+        sql += " ORDER BY c.saved_at DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    def query_markers(self, session_id=None, stage=None):
+        clauses = []
+        params = []
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if stage is not None:
+            clauses.append("stage = ?")
+            params.append(stage)
+        sql = "SELECT * FROM markers"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Session store for the Bloom's Taxonomy Question Study")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH,
+                        help=f'SQLite database path (default: {DEFAULT_DB_PATH})')
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Backfill existing log files")
+    import_parser.add_argument('logs_dir', nargs='?', default="logs")
+
+    trials_parser = subparsers.add_parser("trials", help="Query trials")
+    trials_parser.add_argument('--participant')
+    trials_parser.add_argument('--paragraph', type=int)
+    trials_parser.add_argument('--feedback-type')
+    trials_parser.add_argument('--context', choices=["main", "practice"])
+
+    args = parser.parse_args(argv)
+    store = SessionStore(args.db, marker_codes=MARKERS)
+
+    if args.command == "import":
+        imported = store.import_logs_directory(args.logs_dir)
+        print(f"✓ Imported {len(imported)} session(s) into {args.db}")
+    else:
+        rows = store.query_trials(args.participant, args.paragraph, args.feedback_type, args.context)
+        for row in rows:
+            print(f"{row['participant_id']}\t{row['context']}\t{row['iteration']}\t"
+                  f"{row['paragraph_index']}\t{row['feedback_type']}\t{row['original_question']}")
+        print(f"{len(rows)} trial(s)")
+
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from bloom_study import assignment
+from bloom_study.assignment import (FLIPPED, build_schedule, get_experiment_paragraphs, get_schedule_row,
+                                    schedule_row, session_rng, williams_order)
+from session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("n", [4, 5, 6, 7])
+def test_williams_square_balances_positions_and_carryover(n):
+    rows = [williams_order(n, row) for row in range(n if n % 2 == 0 else 2 * n)]
+    repeats = len(rows) // n
+
+    assert all(sorted(order) == list(range(n)) for order in rows)
+    for position in range(n):
+        assert Counter(order[position] for order in rows) == {item: repeats for item in range(n)}
+    followers = Counter((a, b) for order in rows for a, b in zip(order, order[1:]))
+    assert set(followers.values()) == {repeats} and len(followers) == n * (n - 1)
+
+
+def test_schedule_rows_of_a_pair_see_each_paragraph_under_both_conditions():
+    paragraphs = get_experiment_paragraphs()
+    first, second = schedule_row(0, paragraphs), schedule_row(1, paragraphs)
+
+    assert second["conditions"] == {idx: FLIPPED[c] for idx, c in first["conditions"].items()}
+    assert first["practice_conditions"] != second["practice_conditions"]
+    for genre in {p['genre'] for p in paragraphs}:
+        counts = Counter(first["conditions"][p['index']] for p in paragraphs if p['genre'] == genre)
+        assert abs(counts["related"] - counts["unrelated"]) <= 1
+
+
+def test_full_schedule_is_balanced():
+    paragraphs = get_experiment_paragraphs()
+    schedule = build_schedule(len(paragraphs))
+    rows = schedule["rows"]
+
+    related = Counter(idx for row in rows for idx, c in row["conditions"].items() if c == "related")
+    assert set(related[p['index']] for p in paragraphs) == {len(rows) // 2}
+    for p in paragraphs:
+        assert len({row["order"].index(p['index']) for row in rows}) == len(paragraphs)
+
+
+def test_schedule_rows_do_not_touch_the_global_random_state():
+    random.seed(1)
+    expected = random.random()
+    random.seed(1)
+    rows = [schedule_row(row, get_experiment_paragraphs(), seed=7) for row in range(2)]
+    assert random.random() == expected
+    assert rows == [schedule_row(row, get_experiment_paragraphs(), seed=7) for row in range(2)]
+    assert session_rng("a", 1).random() == session_rng("a", 1).random()
+
+
+def write_schedule(tmp_path, monkeypatch, rows, participant_ids):
+    schedule = build_schedule(rows, participant_ids=participant_ids)
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps(schedule), encoding="utf-8")
+    monkeypatch.setattr(assignment, "SCHEDULE_FILE", str(path))
+    return schedule
+
+
+def test_participants_get_their_row_from_the_schedule_file(tmp_path, monkeypatch, store):
+    schedule = write_schedule(tmp_path, monkeypatch, 4, ["P001", "P002", "P003"])
+
+    listed = get_schedule_row("P002", session_store=store)
+    assert (listed["row"], listed["source"]) == (1, "listed")
+    assert listed["conditions"] == schedule["rows"][1]["conditions"]
+
+
+def test_unlisted_participants_fill_the_least_used_rows(tmp_path, monkeypatch, store):
+    write_schedule(tmp_path, monkeypatch, 4, ["P001", "P002", "P003"])
+
+    # Rows 0-2 are taken by the listed participants
+    rows = [get_schedule_row(f"walk-in {i}", session_store=store) for i in range(5)]
+    assert [row["row"] for row in rows] == [3, 0, 1, 2, 3]
+    assert {row["source"] for row in rows} == {"assigned"}
+    # A returning participant keeps their row
+    assert get_schedule_row("walk-in 1", session_store=store)["row"] == 0
+
+
+def test_unlisted_participants_are_hashed_without_a_session_store(tmp_path, monkeypatch):
+    write_schedule(tmp_path, monkeypatch, 4, ["P001"])
+
+    unlisted = get_schedule_row("someone else")
+    assert unlisted["source"] == "hashed" and unlisted == get_schedule_row("someone else")
+
+
+def test_rows_are_computed_without_a_schedule_file(tmp_path, monkeypatch, store):
+    monkeypatch.setattr(assignment, "SCHEDULE_FILE", str(tmp_path / "missing.json"))
+
+    rows = [get_schedule_row(f"P00{i}", session_store=store) for i in range(1, 4)]
+    assert [row["row"] for row in rows] == [0, 1, 2]
+    assert rows[0]["schedule"].endswith(":computed")
+    assert sorted(rows[0]["order"]) == sorted(p['index'] for p in get_experiment_paragraphs())
+    # The file's rows and the computed rows are assigned separately
+    write_schedule(tmp_path, monkeypatch, 4, [])
+    assert get_schedule_row("P001", session_store=store)["row"] == 0
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from bloom_study.connections import ConnectionWarmer
+from mock_llm_server import MockBehaviour, parse_distribution, serve
+
+
+def start_server(idle_timeout=None):
+    server = serve(port=0, behaviour=MockBehaviour(parse_distribution("fixed:0"), idle_timeout=idle_timeout))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def warmer():
+    server = start_server()
+    warmer = ConnectionWarmer(base_url=f"http://127.0.0.1:{server.server_address[1]}/v1", ping_interval=0)
+    yield warmer
+    warmer.client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def models(warmer):
+    warmer.client.get(f"{warmer.base_url}/models").raise_for_status()
+
+
+def test_first_call_connects_and_the_next_one_reuses_the_connection(warmer):
+    with warmer.track() as first:
+        models(warmer)
+    with warmer.track() as second:
+        models(warmer)
+        models(warmer)
+
+    assert (first["requests"], first["new_connections"], first["reused"]) == (1, 1, False)
+    assert first["idle_seconds"] is None
+    assert (second["requests"], second["new_connections"], second["reused"]) == (2, 0, True)
+    assert second["idle_seconds"] is not None
+
+
+def test_ping_opens_the_connection_the_call_reuses(warmer):
+    warmer.ping()
+    with warmer.track() as call:
+        models(warmer)
+
+    assert warmer.pings == 1
+    assert call["reused"] is True
+
+
+def test_only_requests_inside_the_block_are_tracked(warmer):
+    with warmer.track() as call:
+        pass
+    models(warmer)
+
+    assert call == {"requests": 0, "new_connections": 0, "idle_seconds": None, "reused": False}
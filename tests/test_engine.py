@@ -0,0 +1,183 @@
+import json
+import os
+
+import pytest
+
+from bloom_study.clock import VirtualClock
+from bloom_study.engine import MARKERS, PRACTICE_ITERATIONS, ExperimentEngine, SessionState, SubmissionError
+from bloom_study.feedback import StaticFeedbackBackend
+from session_store import SessionStore
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(start=1_700_000_000.0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"), marker_codes=MARKERS)
+    yield store
+    store.close()
+
+
+def new_engine(clock, store=None, spill_dir=None):
+    return ExperimentEngine(clock=clock, feedback_backend=StaticFeedbackBackend(clock=clock),
+                            session_store=store, spill_dir=spill_dir)
+
+
+def act(engine, call, *args):
+    """One participant action; the app checkpoints after every script run"""
+    engine.clock.advance(5)
+    call(*args)
+    engine.checkpoint()
+
+
+def start_session(engine, participant_id="p1"):
+    act(engine, engine.start_experiment, participant_id)
+    act(engine, engine.complete_pretest, {"age": "25"})
+    act(engine, engine.prepare_baseline)
+    act(engine, engine.start_baseline)
+    act(engine, engine.run_baseline_screen, 30)
+    act(engine, engine.show_bloom_explanation)
+    act(engine, engine.finish_bloom_explanation)
+    act(engine, engine.start_practice)
+
+
+def run_trial(engine):
+    act(engine, engine.paragraph_viewed)
+    act(engine, engine.record_textarea_focus, "question_input")
+    act(engine, engine.submit_question, "이 문단의 요지는 무엇인가?")
+    act(engine, engine.feedback_viewed)
+    act(engine, engine.submit_survey, "3", "4", "예")
+    act(engine, engine.submit_edited_question, "이 문단의 핵심 주장은 무엇인가?")
+
+
+def test_session_runs_through_every_stage(clock):
+    engine = new_engine(clock)
+    start_session(engine)
+    for _ in range(PRACTICE_ITERATIONS):
+        run_trial(engine)
+    assert engine.state.stage == "practice_completed"
+
+    act(engine, engine.start_main_experiment)
+    with pytest.raises(SubmissionError):
+        engine.submit_question(" ? ")
+    act(engine, engine.paragraph_viewed)
+    with pytest.raises(SubmissionError):
+        engine.submit_question("   ")
+    assert engine.state.stage == "ask_question"
+    act(engine, engine.submit_question, "이 문단의 요지는 무엇인가?")
+    act(engine, engine.feedback_viewed)
+    act(engine, engine.submit_survey, "3", "4", "예")
+    act(engine, engine.submit_edited_question, "이 문단의 핵심 주장은 무엇인가?")
+    while engine.state.stage == "show_paragraph":
+        run_trial(engine)
+
+    state = engine.state
+    assert state.stage == "completed"
+    assert len(state.practice_responses) == PRACTICE_ITERATIONS
+    assert len(state.responses) == len(state.experiment_paragraphs)
+    rows = engine.response_rows()
+    assert [row["paragraph_index"] for row in rows] == [p['index'] for p in state.experiment_paragraphs]
+    assert {row["feedback_type"] for row in rows} == {"related", "unrelated"}
+    assert all(row["survey_time_seconds"] == 5 for row in rows)
+
+
+def test_snapshot_round_trips_through_json(clock, tmp_path):
+    engine = new_engine(clock, spill_dir=str(tmp_path / "spill"))
+    start_session(engine)
+    for _ in range(PRACTICE_ITERATIONS):
+        run_trial(engine)
+    act(engine, engine.start_main_experiment)
+    run_trial(engine)
+    act(engine, engine.paragraph_viewed)
+    engine.flush_events()
+    state = engine.state
+
+    snapshot = json.loads(json.dumps(state.snapshot(), ensure_ascii=False))
+    paragraph_by_index = {p['index']: p for p in state.practice_paragraphs + state.experiment_paragraphs}
+    restored = SessionState.from_snapshot(snapshot, paragraph_by_index)
+
+    assert restored.snapshot() == state.snapshot()
+    assert (restored.stage, restored.iteration, restored.context) == ("ask_question", 1, "main")
+    assert restored.experiment_paragraphs == state.experiment_paragraphs
+    assert restored.condition_mapping == state.condition_mapping
+    assert list(restored.practice_responses) == list(state.practice_responses)
+    assert list(restored.responses) == list(state.responses)
+    assert len(restored.event_log) == len(state.event_log)
+
+
+def crash_and_resume(clock, store, spill_dir, gap, participant_id="p1", max_age=3600):
+    """A new engine (browser refresh or server restart) after gap seconds"""
+    clock.advance(gap)
+    engine = new_engine(clock, store, spill_dir)
+    return engine, engine.resume(participant_id, max_age=max_age)
+
+
+def test_resume_continues_the_interrupted_stage(clock, store, tmp_path):
+    spill_dir = str(tmp_path / "spill")
+    engine = new_engine(clock, store, spill_dir)
+    start_session(engine)
+    run_trial(engine)
+    act(engine, engine.paragraph_viewed)
+    events_at_checkpoint = len(engine.state.event_log)
+    # Focusing the textarea does not change the stage: no checkpoint, so this event is lost
+    act(engine, engine.record_textarea_focus, "question_input")
+
+    engine, resumed = crash_and_resume(clock, store, spill_dir, gap=60)
+
+    assert resumed
+    state = engine.state
+    assert (state.stage, state.iteration, state.context) == ("ask_question", 1, "practice")
+    assert len(state.practice_responses) == 1
+    assert len(state.event_log) == events_at_checkpoint + 2
+    resumed_event, marker = list(state.event_log)[-2:]
+    assert resumed_event["event"] == "Session resumed"
+    assert resumed_event["data"]["interrupted_stage"] == "ask_question"
+    # Measured from the checkpoint, 5 s before the lost focus event
+    assert resumed_event["data"]["gap_seconds"] == 65
+    assert marker["event"] == "MARKER: session_resumed"
+
+    act(engine, engine.record_textarea_focus, "question_input")
+    act(engine, engine.submit_question, "이 문단의 요지는 무엇인가?")
+    act(engine, engine.feedback_viewed)
+    act(engine, engine.submit_survey, "3", "4", "예")
+    act(engine, engine.submit_edited_question, "이 문단의 핵심 주장은 무엇인가?")
+    row = engine.response_rows(practice=True)[1]
+    assert row["ask_question_interruption_seconds"] == 65
+    # The stage restarted on resume: 5 s to focus and 5 s to submit
+    assert row["ask_question_time_seconds"] == 10
+
+    act(engine, engine.start_main_experiment)
+    while engine.state.stage == "show_paragraph":
+        run_trial(engine)
+    engine.save_logs(str(tmp_path / "logs"))
+    assert store.latest_checkpoint("p1") is None
+    assert os.listdir(spill_dir) == []
+
+
+def test_interrupted_baseline_is_measured_again(clock, store):
+    engine = new_engine(clock, store)
+    act(engine, engine.start_experiment, "p1")
+    act(engine, engine.complete_pretest, {"age": "25"})
+    act(engine, engine.prepare_baseline)
+    act(engine, engine.start_baseline)
+    engine.baseline_onset()
+    engine.checkpoint()
+
+    engine, resumed = crash_and_resume(clock, store, None, gap=10)
+
+    assert resumed
+    assert (engine.state.stage, engine.state.baseline_start_time) == ("baseline_ready", None)
+    assert engine.state.stage_timers["baseline_screen_interruption_seconds"] == 10
+
+
+def test_no_resume_for_old_other_or_unknown_sessions(clock, store):
+    engine = new_engine(clock, store)
+    start_session(engine)
+
+    assert not crash_and_resume(clock, store, None, gap=7200, max_age=3600)[1]
+    assert not crash_and_resume(clock, store, None, gap=0, participant_id="p2")[1]
+    assert not new_engine(clock).resume("p1")
+    assert crash_and_resume(clock, store, None, gap=0, max_age=None)[1]
@@ -0,0 +1,111 @@
+import csv
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from epoch_export import MISSING, build_epoch_table, export_participant
+
+START = 1_700_000_000.0
+
+
+def markers(*entries):
+    """(name, seconds after START, iteration) -> the arrays read_markers returns"""
+    names = np.array([name for name, _, _ in entries], dtype=object)
+    times = np.array([np.datetime64(int((START + t) * 1e6), "us") for _, t, _ in entries])
+    iterations = np.array([iteration for _, _, iteration in entries], dtype=np.int32)
+    return names, times, iterations
+
+
+def build(*entries):
+    return build_epoch_table(*markers(*entries), np.datetime64(int(START * 1e6), "us"), 0, 1000.0)
+
+
+def test_stage_onsets_and_offsets_are_aligned_per_trial():
+    table = build(("paragraph_start", 1, 0), ("paragraph_end", 2, 0), ("survey_start", 3, 0), ("survey_end", 4, 0),
+                  ("paragraph_start", 10, 1), ("paragraph_end", 12, 1))
+
+    assert table["iteration"].tolist() == [0, 1]
+    assert table["paragraph_onset_sample"].tolist() == [1000, 10000]
+    assert table["paragraph_offset_sample"].tolist() == [2000, 12000]
+    # Trial 1 has no survey: its window must not borrow trial 0's markers
+    assert table["survey_onset_sample"].tolist() == [3000, MISSING]
+    assert table["survey_offset_sample"].tolist() == [4000, MISSING]
+    assert table["interrupted"].tolist() == [False, False]
+
+
+def test_offset_is_the_last_end_marker_of_the_stage():
+    # A rejected submission sends survey_end before the real one
+    table = build(("paragraph_start", 1, 0), ("survey_start", 3, 0), ("survey_end", 4, 0), ("survey_end", 6, 0),
+                  ("paragraph_start", 10, 1), ("survey_start", 11, 1), ("survey_end", 12, 1))
+
+    assert table["survey_onset_sample"].tolist() == [3000, 11000]
+    assert table["survey_offset_sample"].tolist() == [6000, 12000]
+
+
+def test_trials_with_a_resume_are_interrupted():
+    table = build(("paragraph_start", 1, 0), ("session_resumed", 5, 0), ("paragraph_start", 10, 1))
+
+    assert table["interrupted"].tolist() == [True, False]
+
+
+def read_table(path):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_table(path).to_pydict()
+    records = np.load(path)
+    return {name: records[name].tolist() for name in records.dtype.names}
+
+
+def write_session(logs_dir):
+    """A saved session with one baseline, two practice trials and two main trials"""
+    start = datetime.fromtimestamp(START)
+    events = []
+
+    def log(seconds, event, context="main", iteration=0, data=None):
+        events.append({"timestamp": (start + timedelta(seconds=seconds)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                       "event": event, "context": context, "iteration": iteration, "data": data or {}})
+
+    log(0, "MARKER: baseline_start", context="baseline")
+    for context, first, offset in (("practice", 100, 30), ("main", 200, 60)):
+        for iteration in range(2):
+            t = offset + iteration * 10
+            log(t, "MARKER: paragraph_start", context, iteration)
+            log(t + 1, "Question submitted", context, iteration,
+                {"question": "질문은 무엇인가?", "paragraph_index": first + iteration, "paragraph_genre": "과학"})
+            log(t + 2, "MARKER: survey_start", context, iteration)
+            log(t + 3, "Survey submitted", context, iteration,
+                {"curiosity": "3", "relatedness": "4", "accept_feedback": "예"})
+            log(t + 3, "MARKER: survey_end", context, iteration)
+
+    event_log_path = logs_dir / "participant_p1_20250101_100000.json"
+    event_log_path.write_text(json.dumps(events, ensure_ascii=False), encoding="utf-8")
+    responses_path = logs_dir / "responses_p1_20250101_100000.csv"
+    with open(responses_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["iteration", "paragraph_index", "paragraph_genre", "feedback_type",
+                                               "curiosity", "relatedness", "accept_feedback"])
+        writer.writeheader()
+        for iteration in range(2):
+            writer.writerow({"iteration": iteration, "paragraph_index": 200 + iteration, "paragraph_genre": "과학",
+                             "feedback_type": "related", "curiosity": 5, "relatedness": 2, "accept_feedback": "예"})
+    return str(event_log_path), str(responses_path)
+
+
+def test_both_contexts_export_into_the_same_directory(tmp_path):
+    event_log_path, responses_path = write_session(tmp_path)
+    output_dir = str(tmp_path / "epochs")
+
+    main_path = export_participant(event_log_path, responses_path, output_dir, 1000.0, 0)
+    practice_path = export_participant(event_log_path, responses_path, output_dir, 1000.0, 0, context="practice")
+
+    assert main_path != practice_path
+    main = read_table(main_path)
+    practice = read_table(practice_path)
+    assert main["paragraph_onset_sample"] == [60000, 70000]
+    assert main["survey_offset_sample"] == [63000, 73000]
+    assert main["paragraph_index"] == [200, 201]
+    assert main["curiosity"] == [5, 5]
+    # Practice trials are not in the responses CSV: their columns come from the event log
+    assert practice["paragraph_onset_sample"] == [30000, 40000]
+    assert practice["paragraph_index"] == [100, 101]
+    assert practice["curiosity"] == [3, 3]
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from llm_cassette import Cassette, CassetteMiss, read_entries, wrap_chat_model
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "Suggest a better question."), ("human", "Question: {question}")])
+QUESTIONS = ["광합성은 왜 일어나는가?", "세포는 무엇인가?", "광합성은 왜 일어나는가?"]
+
+
+def feedback_chain(llm):
+    return PROMPT | llm | StrOutputParser()
+
+
+def test_replay_gives_byte_identical_feedback(tmp_path):
+    path = str(tmp_path / "cassettes" / "run.jsonl")
+    inner = FakeListChatModel(responses=['{"suggested_question": "엽록체는 어떤 역할을 하는가?"}',
+                                         '{"suggested_question": "세포막은 왜 필요한가?"}',
+                                         '{"suggested_question": "빛이 없으면 어떻게 되는가?"}'])
+    recorder = feedback_chain(wrap_chat_model(inner, Cassette(path, "record"), "question_generation", temperature=0.7))
+    recorded = [recorder.invoke({"question": q}) for q in QUESTIONS]
+    assert len(read_entries(path)) == 3
+
+    cassette = Cassette(path, "replay")
+    player = feedback_chain(wrap_chat_model(None, cassette, "question_generation", temperature=0.7))
+    replayed = [player.invoke({"question": q}) for q in QUESTIONS]
+
+    # A key recorded twice is served in recorded order
+    assert [r.encode("utf-8") for r in replayed] == [r.encode("utf-8") for r in recorded]
+    assert cassette.report() == {"mode": "replay", "served": 3, "misses": 0, "unused": 0}
+
+
+def test_unrecorded_request_is_reported_as_a_miss(tmp_path, capsys):
+    path = str(tmp_path / "run.jsonl")
+    recorder = feedback_chain(wrap_chat_model(FakeListChatModel(responses=["first"]), Cassette(path, "record"),
+                                              "question_generation", temperature=0.7))
+    recorder.invoke({"question": QUESTIONS[0]})
+
+    cassette = Cassette(path, "replay")
+    player = feedback_chain(wrap_chat_model(None, cassette, "question_generation", temperature=0.7))
+    with pytest.raises(CassetteMiss):
+        player.invoke({"question": "기록되지 않은 질문은?"})
+
+    assert cassette.report()["misses"] == 1
+    assert "Cassette miss: question_generation" in capsys.readouterr().out
+    with open(f"{path}.misses", encoding="utf-8") as f:
+        miss = json.loads(f.readline())
+    assert miss["messages"][-1]["content"] == "Question: 기록되지 않은 질문은?"
@@ -0,0 +1,74 @@
+from marker_sinks import MarkerDispatcher, MmapRingSink, RingReader
+
+
+class ListSink:
+    name = "list"
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, timestamp_ns, marker_code, iteration, stage):
+        self.sent.append((timestamp_ns, marker_code, iteration, stage))
+
+    def close(self):
+        pass
+
+
+class FailingSink(ListSink):
+    name = "failing"
+
+    def send(self, timestamp_ns, marker_code, iteration, stage):
+        raise OSError("port gone")
+
+
+def test_ring_reader_reads_records_in_order(tmp_path):
+    path = str(tmp_path / "markers.ring")
+    sink = MmapRingSink(path, capacity=8)
+    reader = RingReader(path)
+    sink.send(100, 1, 0, "show_paragraph")
+    sink.send(200, 2, 0, "show_paragraph")
+
+    records = reader.read_new()
+    assert [(r.seq, r.perf_counter_ns, r.marker_code, r.iteration, r.stage) for r in records] == [
+        (1, 100, 1, 0, "show_paragraph"), (2, 200, 2, 0, "show_paragraph")]
+    assert reader.read_new() == []
+    reader.close()
+    sink.close()
+
+
+def test_lapped_reader_skips_overwritten_records(tmp_path):
+    path = str(tmp_path / "markers.ring")
+    sink = MmapRingSink(path, capacity=4)
+    reader = RingReader(path)
+    for n in range(10):
+        sink.send(n, n, 0, "")
+
+    assert [r.marker_code for r in reader.read_new()] == [6, 7, 8, 9]
+    assert reader.lost == 6
+    reader.close()
+    sink.close()
+
+
+def test_reopened_ring_keeps_its_write_count(tmp_path):
+    path = str(tmp_path / "markers.ring")
+    sink = MmapRingSink(path, capacity=4)
+    sink.send(1, 1, 0, "")
+    sink.close()
+
+    sink = MmapRingSink(path, capacity=4)
+    sink.send(2, 2, 0, "")
+    reader = RingReader(path, from_start=True)
+    assert [r.seq for r in reader.read_new()] == [1, 2]
+    reader.close()
+    sink.close()
+
+
+def test_dispatcher_sends_one_timestamp_to_every_sink_despite_failures():
+    first, second = ListSink(), ListSink()
+    dispatcher = MarkerDispatcher([first, FailingSink(), second])
+
+    errors = dispatcher.dispatch(4, iteration=3, stage="ask_question")
+
+    assert [name for name, _ in errors] == ["failing"]
+    assert first.sent == second.sent
+    assert first.sent[0][1:] == (4, 3, "ask_question")
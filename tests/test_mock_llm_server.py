@@ -0,0 +1,87 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+
+from mock_llm_server import MockBehaviour, parse_distribution, serve
+
+CLASSIFICATION_PROMPT = 'Respond with {"bloom_level": ...}\nQuestion: 광합성은 왜 일어나는가?'
+SUGGESTION_PROMPT = 'Respond with {"suggested_question": ...}\nQuestion: 광합성은 왜 일어나는가?'
+
+
+@contextmanager
+def running(behaviour):
+    server = serve(port=0, behaviour=behaviour)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def chat(base_url, prompt):
+    """(status, headers, message content or error payload) of one completion request"""
+    body = json.dumps({"model": "gpt-4-0613", "messages": [{"role": "user", "content": prompt}]}).encode("utf-8")
+    request = urllib.request.Request(f"{base_url}/v1/chat/completions", data=body,
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            payload = json.loads(response.read())
+            return response.status, response.headers, payload["choices"][0]["message"]["content"]
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, json.loads(e.read())
+
+
+def stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/stats", timeout=10) as response:
+        return json.loads(response.read())
+
+
+def faulty(seed):
+    return MockBehaviour(parse_distribution("fixed:0"), seed=seed, error_rate=0.3, malformed_rate=0.3)
+
+
+def test_replies_are_schema_valid_for_both_parsers():
+    with running(MockBehaviour(parse_distribution("fixed:0"))) as base_url:
+        status, _, classification = chat(base_url, CLASSIFICATION_PROMPT)
+        assert status == 200
+        assert set(json.loads(classification)) == {"bloom_level"}
+        _, _, suggestion = chat(base_url, SUGGESTION_PROMPT)
+        assert json.loads(suggestion)["suggested_question"].endswith("?")
+
+
+def test_same_seed_gives_the_same_replies_and_faults():
+    prompts = [f"{CLASSIFICATION_PROMPT} {i}" for i in range(10)] * 2
+
+    runs = []
+    for _ in range(2):
+        with running(faulty(seed=7)) as base_url:
+            runs.append([(status, str(content)) for status, _, content in (chat(base_url, p) for p in prompts)])
+            runs[-1].append(stats(base_url))
+
+    assert runs[0] == runs[1]
+    assert runs[0][-1]["rate_limited"] > 0
+    assert runs[0][-1]["malformed"] > 0
+
+
+def test_rate_limit_and_malformed_replies_are_injected():
+    behaviour = MockBehaviour(parse_distribution("fixed:0"), error_rate=1.0, retry_after=0.25)
+    with running(behaviour) as base_url:
+        status, headers, payload = chat(base_url, CLASSIFICATION_PROMPT)
+        assert status == 429
+        assert headers["Retry-After"] == "0.25"
+        assert payload["error"]["code"] == "rate_limit_exceeded"
+        assert stats(base_url)["rate_limited"] == 1
+
+    with running(MockBehaviour(parse_distribution("fixed:0"), malformed_rate=1.0)) as base_url:
+        status, _, content = chat(base_url, CLASSIFICATION_PROMPT)
+        assert status == 200
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError:
+            parsed = None
+        assert not (isinstance(parsed, dict) and "bloom_level" in parsed)
+        assert stats(base_url)["malformed"] == 1
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from bloom_study.engine import ExperimentEngine
+from bloom_study.feedback import StaticFeedbackBackend
+from replay_session import replay
+
+
+class ManualClock:
+    """Time moves only on sleep() and advance(), so every action has one timestamp"""
+
+    def __init__(self, start=1_700_000_000.0):
+        self.current = start
+
+    def advance(self, seconds):
+        self.current += seconds
+
+    def time(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.current += seconds
+
+    def now(self):
+        return datetime.fromtimestamp(self.current)
+
+
+class SlowFeedback(StaticFeedbackBackend):
+    """Static feedback that takes two seconds on the test clock, like an LLM call"""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def __call__(self, question, paragraph_content, feedback_type):
+        self.clock.sleep(2.0)
+        return super().__call__(question, paragraph_content, feedback_type)
+
+
+def run_trial(engine, clock):
+    for call, args in ((engine.paragraph_viewed, ()),
+                       (engine.record_textarea_focus, ("question_input",)),
+                       (engine.submit_question, (f"질문 {engine.state.iteration}은 무엇인가?",)),
+                       (engine.feedback_viewed, ()),
+                       (engine.submit_survey, ("3", "4", "예")),
+                       (engine.submit_edited_question, (f"수정된 질문 {engine.state.iteration}은 무엇인가?",))):
+        clock.advance(1.5)
+        call(*args)
+
+
+def test_engine_replay_of_a_generated_log_has_no_differences(tmp_path, capsys):
+    clock = ManualClock()
+    engine = ExperimentEngine(clock=clock, feedback_backend=SlowFeedback(clock))
+    engine.start_experiment("replay1")
+    engine.complete_pretest({"age": "25"})
+    engine.prepare_baseline()
+    engine.start_baseline()
+    engine.run_baseline_screen()
+    engine.show_bloom_explanation()
+    engine.finish_bloom_explanation()
+    engine.start_practice()
+    while engine.state.stage == "show_paragraph":
+        run_trial(engine, clock)
+    engine.start_main_experiment()
+    while engine.state.stage == "show_paragraph":
+        run_trial(engine, clock)
+    event_log_path, _ = engine.save_logs(str(tmp_path))
+    capsys.readouterr()
+
+    report = replay(event_log_path, target="engine", speed=None)
+
+    assert report["final_stage"] == "completed"
+    assert report["trials"]["replayed"] == report["trials"]["logged"] > 0
+    assert report["compared_with"] is not None
+    assert report["divergences"] == []
+    assert report["differences"] == []
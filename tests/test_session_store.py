@@ -0,0 +1,86 @@
+import csv
+import json
+
+import pytest
+
+import session_store
+from bloom_study.engine import MARKERS
+from session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"), marker_codes=MARKERS)
+    yield store
+    store.close()
+
+
+def write_session_files(logs_dir, participant_id="p1", timestamp="20250101_100000"):
+    events = [
+        {"timestamp": "2025-01-01 10:00:00.000000", "iteration": 0, "stage": "pretest_survey",
+         "event": "Experiment started", "context": "main", "data": {"participant_id": participant_id}},
+        {"timestamp": "2025-01-01 10:01:00.000000", "iteration": 0, "stage": "show_paragraph",
+         "event": "MARKER: paragraph_start", "context": "main"},
+        {"timestamp": "2025-01-01 10:01:30.000000", "iteration": 0, "stage": "show_paragraph",
+         "event": "MARKER: paragraph_end", "context": "main"},
+    ]
+    event_log_path = logs_dir / f"participant_{participant_id}_{timestamp}.json"
+    event_log_path.write_text(json.dumps(events), encoding="utf-8")
+    with open(logs_dir / f"responses_{participant_id}_{timestamp}.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, ["iteration", "paragraph_index", "feedback_type", "curiosity"])
+        writer.writeheader()
+        writer.writerow({"iteration": 0, "paragraph_index": 17, "feedback_type": "unrelated", "curiosity": "5"})
+    return event_log_path
+
+
+def test_recorded_trials_and_markers_can_be_queried(store):
+    store.start_session("s1", "p1")
+    store.record_trial("s1", "p1", "main", {"iteration": 0, "paragraph_index": 17, "feedback_type": "related",
+                                            "curiosity": "4", "original_question": "왜?"})
+    store.record_events("s1", "p1", [
+        {"timestamp": "t", "iteration": 0, "stage": "ask_question", "event": "MARKER: question_input_start"},
+        {"timestamp": "t", "iteration": 0, "stage": "ask_question", "event": "Question submitted"},
+    ])
+
+    [trial] = store.query_trials(paragraph_index=17, feedback_type="related")
+    assert (trial["participant_id"], trial["curiosity"], trial["original_question"]) == ("p1", 4, "왜?")
+    assert store.query_trials(feedback_type="unrelated") == []
+    [marker] = store.query_markers(session_id="s1")
+    assert (marker["marker"], marker["code"]) == ("question_input_start", MARKERS["question_input_start"])
+
+
+def test_import_logs_directory_backfills_each_session_once(store, tmp_path):
+    write_session_files(tmp_path)
+
+    assert store.import_logs_directory(str(tmp_path)) == ["p1_20250101_100000"]
+    assert store.import_logs_directory(str(tmp_path)) == []
+    [trial] = store.query_trials(participant_id="p1")
+    assert (trial["context"], trial["paragraph_index"], trial["curiosity"]) == ("main", 17, 5)
+    assert [m["code"] for m in store.query_markers()] == [MARKERS["paragraph_start"], MARKERS["paragraph_end"]]
+
+
+def test_import_command_stores_marker_codes(tmp_path):
+    write_session_files(tmp_path)
+    db_path = str(tmp_path / "cli.db")
+
+    assert session_store.main(["--db", db_path, "import", str(tmp_path)]) == 0
+
+    store = SessionStore(db_path)
+    assert [m["code"] for m in store.query_markers()] == [MARKERS["paragraph_start"], MARKERS["paragraph_end"]]
+    store.close()
+
+
+def test_latest_checkpoint_is_the_newest_of_unfinished_sessions(store):
+    for session_id, saved_at in (("s1", 100.0), ("s2", 200.0), ("s3", 300.0)):
+        store.start_session(session_id, "p1")
+        store.save_checkpoint(session_id, "p1", saved_at, "survey", 2, "main", "{}")
+    store.save_checkpoint("s1", "p1", 150.0, "edit_question", 2, "main", '{"n": 1}')
+    store.complete_session("s3")
+
+    latest = store.latest_checkpoint("p1")
+    assert (latest["session_id"], latest["saved_at"]) == ("s2", 200.0)
+    assert store.latest_checkpoint("p1", saved_after=250.0) is None
+    assert store.latest_checkpoint("p2") is None
+    store.complete_session("s2")
+    assert (store.latest_checkpoint("p1")["stage"], store.latest_checkpoint("p1")["state"]) == (
+        "edit_question", '{"n": 1}')
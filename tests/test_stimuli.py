@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from bloom_study import stimuli
+from bloom_study.stimuli import load_stimulus_set
+
+
+def paragraph(index, role="experiment", genre="공학", text="기계 학습은 데이터에서 규칙을 찾는다."):
+    return {"index": index, "genre": genre, "role": role, "text": text}
+
+
+def write_stimuli(path, paragraphs):
+    path.write_text(json.dumps({"paragraphs": paragraphs}, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_repository_stimulus_file_loads():
+    stimulus_set = load_stimulus_set()
+    assert stimulus_set.experiment_indices and stimulus_set.practice_indices
+    assert [s.index for s in stimulus_set.stimuli] == list(range(len(stimulus_set.stimuli)))
+
+
+def test_roles_genres_and_content_hash(tmp_path):
+    path = write_stimuli(tmp_path / "stimuli.json", [
+        paragraph(0, role="practice"), paragraph(1), paragraph(2, genre="인문학"), paragraph(3, role="excluded")])
+    stimulus_set = load_stimulus_set(path)
+
+    assert stimulus_set.practice_indices == (0,)
+    assert stimulus_set.experiment_indices == (1, 2)
+    assert stimulus_set.excluded_indices == (3,)
+    assert stimulus_set.genre_ranges == {"공학": [0, 1, 3], "인문학": [2]}
+    assert load_stimulus_set(path).content_hash == stimulus_set.content_hash
+
+    write_stimuli(tmp_path / "stimuli.json", [paragraph(0, role="practice"), paragraph(1)])
+    assert load_stimulus_set(path).content_hash != stimulus_set.content_hash
+
+
+@pytest.mark.parametrize("paragraphs, message", [
+    ([paragraph(0), paragraph(2)], "indices"),
+    ([paragraph(1), paragraph(0)], "indices"),
+    ([paragraph(0, role="filler")], "role"),
+    ([paragraph(0, genre="")], "genre and text"),
+    ([paragraph(0, text="   ")], "genre and text"),
+])
+def test_invalid_files_are_rejected(tmp_path, paragraphs, message):
+    path = write_stimuli(tmp_path / "stimuli.json", paragraphs)
+    with pytest.raises(ValueError, match=message):
+        load_stimulus_set(path)
+
+
+def test_empty_file_is_rejected(tmp_path):
+    path = tmp_path / "stimuli.json"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="empty"):
+        load_stimulus_set(str(path))
+
+
+def test_reload_keeps_the_current_set_when_the_file_breaks(tmp_path, monkeypatch):
+    path = tmp_path / "stimuli.json"
+    monkeypatch.setattr(stimuli, "STIMULUS_FILE", write_stimuli(path, [paragraph(0), paragraph(1)]))
+    monkeypatch.setattr(stimuli, "_current", None)
+    monkeypatch.setattr(stimuli, "_file_stamp", None)
+
+    first = stimuli.reload_stimuli()
+    write_stimuli(path, [paragraph(0, role="filler")])
+    assert stimuli.reload_stimuli(force=True) is first
+
+    write_stimuli(path, [paragraph(0), paragraph(1), paragraph(2)])
+    assert stimuli.reload_stimuli(force=True).experiment_indices == (0, 1, 2)
@@ -0,0 +1,167 @@
+import dataclasses
+import json
+
+import pytest
+
+from bloom_study.clock import VirtualClock
+from bloom_study.engine import ExperimentEngine
+from bloom_study.feedback import StaticFeedbackBackend
+from bloom_study.trials import SpillLog, TrialLog, TrialRecord
+from session_store import SessionStore
+
+
+def record(iteration, **fields):
+    return TrialRecord(iteration=iteration, paragraph_index=10 + iteration, paragraph_genre="공학", **fields)
+
+
+def test_row_puts_the_paragraph_text_after_the_iteration_and_stage_durations_last():
+    row = record(0, feedback_type="related", stage_durations={"survey_time_seconds": 2.5}).as_row("본문")
+
+    columns = list(row)
+    assert columns[:3] == ["iteration", "paragraph", "paragraph_index"]
+    assert columns[3:-1] == [f.name for f in dataclasses.fields(TrialRecord)][2:-1]
+    assert columns[-1] == "survey_time_seconds"
+    assert (row["paragraph"], row["feedback_type"], row["survey_time_seconds"]) == ("본문", "related", 2.5)
+
+
+def test_log_without_a_spill_file_stays_in_memory():
+    log = SpillLog()
+    log.extend([{"n": 0}, {"n": 1}])
+    log.spill()
+
+    assert (log.spilled, len(log), list(log)) == (0, 2, [{"n": 0}, {"n": 1}])
+
+
+def test_spilled_entries_are_read_back_in_order(tmp_path):
+    log = SpillLog(str(tmp_path / "spill" / "events.jsonl"))
+    log.extend([{"n": 0}, {"n": 1}])
+    log.spill()
+    log.append({"n": 2})
+
+    assert (log.spilled, len(log)) == (2, 3)
+    assert [entry["n"] for entry in log] == [0, 1, 2]
+    assert log[2:] == [{"n": 2}]
+    assert log[1:] == [{"n": 1}, {"n": 2}]
+
+
+def test_trial_log_round_trips_records(tmp_path):
+    log = TrialLog(str(tmp_path / "trials.jsonl"))
+    log.append(record(0, curiosity="3", stage_durations={"show_paragraph_time_seconds": 1.0}))
+    log.spill()
+    log.append(record(1))
+
+    assert list(log) == [record(0, curiosity="3", stage_durations={"show_paragraph_time_seconds": 1.0}), record(1)]
+    assert [row["paragraph"] for row in log.rows({10: "첫 문단", 11: "둘째 문단"})] == ["첫 문단", "둘째 문단"]
+
+
+def test_failed_spill_keeps_the_log_in_memory(tmp_path):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    log = SpillLog(str(blocker / "events.jsonl"))
+    log.append({"n": 0})
+    log.spill()
+    log.append({"n": 1})
+
+    assert log.path is None
+    assert list(log) == [{"n": 0}, {"n": 1}]
+
+
+def test_unspill_reads_the_entries_back_and_deletes_the_file(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = SpillLog(str(path))
+    log.extend([{"n": 0}, {"n": 1}])
+    log.spill()
+    log.append({"n": 2})
+    log.unspill()
+
+    assert not path.exists()
+    assert (log.path, log.spilled, list(log)) == (None, 0, [{"n": 0}, {"n": 1}, {"n": 2}])
+    log.spill()
+    assert len(log._tail) == 3
+
+
+def test_snapshot_restores_the_log_and_cuts_off_later_entries(tmp_path):
+    log = SpillLog(str(tmp_path / "events.jsonl"))
+    log.extend([{"n": 0}, {"n": 1}])
+    log.spill()
+    log.append({"n": 2})
+    snapshot = json.loads(json.dumps(log.snapshot()))
+    # Written by the session after its checkpoint
+    log.append({"n": 3})
+    log.spill()
+
+    restored = SpillLog.from_snapshot(snapshot)
+    assert [entry["n"] for entry in restored] == [0, 1, 2]
+    restored.spill()
+    restored.append({"n": 4})
+    assert [entry["n"] for entry in restored] == [0, 1, 2, 4]
+
+
+def test_snapshot_of_a_truncated_spill_file_is_rejected(tmp_path):
+    log = SpillLog(str(tmp_path / "events.jsonl"))
+    log.extend([{"n": 0}, {"n": 1}])
+    log.spill()
+    snapshot = log.snapshot()
+    (tmp_path / "events.jsonl").write_text('{"n": 0}\n')
+
+    with pytest.raises(ValueError):
+        SpillLog.from_snapshot(snapshot)
+
+
+def run_session(spill_dir, trials=3, session_store=None):
+    clock = VirtualClock(start=1_700_000_000.0)
+    engine = ExperimentEngine(clock=clock, feedback_backend=StaticFeedbackBackend(clock=clock), spill_dir=spill_dir,
+                              session_store=session_store)
+    engine.start_experiment("spill")
+    engine.complete_pretest({"age": "25"})
+    engine.prepare_baseline()
+    engine.start_baseline()
+    engine.run_baseline_screen(duration=30)
+    engine.show_bloom_explanation()
+    engine.finish_bloom_explanation()
+    engine.start_main_experiment()
+    in_memory = []
+    for _ in range(trials):
+        clock.advance(5)
+        engine.paragraph_viewed()
+        engine.submit_question("이 문단의 요지는 무엇인가?")
+        engine.feedback_viewed()
+        engine.submit_survey("3", "4", "예")
+        engine.submit_edited_question("이 문단의 핵심 주장은 무엇인가?")
+        in_memory.append(len(engine.state.responses._tail))
+    return engine, in_memory
+
+
+def test_spilled_session_keeps_one_trial_in_memory_and_the_same_rows(tmp_path):
+    spilled, in_memory = run_session(str(tmp_path / "spill"))
+    unspilled, _ = run_session(None)
+
+    assert in_memory == [0, 0, 0]
+    assert spilled.state.responses.spilled == 3
+    assert spilled.response_rows() == unspilled.response_rows()
+    # Spilled events come back as they are saved: JSON, with string keys
+    assert list(spilled.state.event_log) == json.loads(json.dumps(list(unspilled.state.event_log)))
+
+
+def test_spill_files_are_removed_once_the_completed_session_is_stored(tmp_path):
+    spill_dir = tmp_path / "spill"
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    engine, _ = run_session(str(spill_dir), trials=2, session_store=store)
+    engine.save_logs(str(tmp_path / "logs"))
+    # Saved before the end: the session still needs its spill files (events and main trials)
+    assert len(list(spill_dir.iterdir())) == 2
+
+    while engine.state.stage == "show_paragraph":
+        engine.paragraph_viewed()
+        engine.submit_question("이 문단의 요지는 무엇인가?")
+        engine.feedback_viewed()
+        engine.submit_survey("3", "4", "예")
+        engine.submit_edited_question("이 문단의 핵심 주장은 무엇인가?")
+    assert engine.state.stage == "completed"
+    rows = engine.response_rows()
+    engine.save_logs(str(tmp_path / "logs"))
+
+    assert list(spill_dir.iterdir()) == []
+    assert engine.response_rows() == rows
+    assert len(store.query_trials(context="main")) == len(rows)
+    store.close()